@@ -4,11 +4,11 @@ from pydantic import BaseModel
 from app.utils.database import get_db
 from app.services.sentiment_service import save_sentiment_result
 from app.services.rag_service import save_rag_summary
-from app.services.gap_calculator import update_all_gap_scores
+from app.services.gap_calculator import update_all_gap_scores, update_dirty_gap_scores
 from app.utils.models import RegionData
+from app.utils.fast_json import write_json_output, json_envelope, raw_json_response
 from datetime import datetime
 import random
-import json
 import os
 
 router = APIRouter(prefix="/api/analysis", tags=["Analysis"])
@@ -26,7 +26,7 @@ def run_analysis(request: AnalysisRequest, db: Session = Depends(get_db)):
     특정 지역(region_name)에 대해 AI 분석 파이프라인 실행
     1. 감정분석 점수 저장
     2. 정책 요약(RAG) 저장
-    3. Gap Score 재계산
+    3. Gap Score 재계산 (점수가 바뀐 지역만)
     """
     try:
         # 감정 분석 점수 계산 (테스트용 랜덤값)
@@ -37,7 +37,8 @@ def run_analysis(request: AnalysisRequest, db: Session = Depends(get_db)):
             region_name=request.region_name,
             text=request.summary,
             score=sentiment_score,
-            model="kobert"
+            model="kobert",
+            topic=request.topic,
         )
 
         # RAG 요약 저장
@@ -48,8 +49,8 @@ def run_analysis(request: AnalysisRequest, db: Session = Depends(get_db)):
             summary=request.summary
         )
 
-        # Gap Score 전체 업데이트
-        update_all_gap_scores(db)
+        # Gap Score 증분 업데이트 (gap_dirty 지역만)
+        update_dirty_gap_scores(db)
 
         print(f"[analysis_router] {request.region_name} 지역의 분석 완료")
         return {
@@ -92,8 +93,8 @@ def run_map_pipeline(db: Session = Depends(get_db)):
             for s in sample_data:
                 region = RegionData(
                     region_name=s["region_name"],
-                    policy_score=s["policy_score"],
-                    sentiment_score=s["sentiment_score"],
+                    policy_avg_score=s["policy_score"],
+                    sentiment_avg_score=s["sentiment_score"],
                     gap_score=abs(s["policy_score"] - s["sentiment_score"]),
                     updated_at=datetime.utcnow(),
                 )
@@ -109,32 +110,30 @@ def run_map_pipeline(db: Session = Depends(get_db)):
         result = [
             {
                 "region_name": r.region_name,
-                "policy_score": r.policy_score,
-                "sentiment_score": r.sentiment_score,
+                "policy_score": r.policy_avg_score,
+                "sentiment_score": r.sentiment_avg_score,
                 "gap_score": r.gap_score,
-                "infra_sentiment": getattr(r, "infra_sentiment", None),
-                "housing_sentiment": getattr(r, "housing_sentiment", None),
-                "health_sentiment": getattr(r, "health_sentiment", None),
-                "economy_sentiment": getattr(r, "economy_sentiment", None),
-                "policy_efficiency": getattr(r, "policy_efficiency", None),
+                "infra_sentiment": r.sentiment_transport_infra_score,
+                "housing_sentiment": r.sentiment_housing_environment_score,
+                "health_sentiment": r.sentiment_healthcare_score,
+                "economy_sentiment": r.sentiment_labor_economy_score,
+                "policy_efficiency": r.sentiment_policy_efficiency_score,
                 "updated_at": r.updated_at.isoformat() if r.updated_at else None
             }
             for r in updated_regions
         ]
 
-        # 4️⃣ 결과 파일로 저장
-        os.makedirs("output", exist_ok=True)
+        # 4️⃣ 결과 파일로 저장 (파일·응답 본문을 한 번의 직렬화로 생성)
         output_path = os.path.join("output", "map_pipeline_result.json")
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=4)
+        data_body = write_json_output(output_path, result)
 
         print(f"[run-map] 지도 파이프라인 완료 → 결과 저장: {output_path}")
-        return {
-            "status": "success",
-            "count": len(result),
-            "updated_at": datetime.utcnow(),
-            "data": result
-        }
+        return raw_json_response(json_envelope(
+            data_body,
+            status="success",
+            count=len(result),
+            updated_at=datetime.utcnow(),
+        ))
 
     except Exception as e:
         db.rollback()
@@ -1,29 +1,63 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from app.utils.database import get_db
+from app.utils.database import get_db, get_async_read_db
 from app.utils.models import RegionData
-from app.services.gap_calculator import update_all_gap_scores
+from app.utils.schemas import SimulationRequest
+from app.utils.response_cache import cached_json_response
+from app.utils.fast_json import dumps, raw_json_response
+from app.services.gap_calculator import update_all_gap_scores, update_dirty_gap_scores
+from app.services.sentiment_aggregate_service import (
+    sync_region_sentiment,
+    rebuild_sentiment_aggregates,
+    compact_sentiment_partitions,
+    SENTIMENT_RETENTION_MONTHS,
+)
+from app.services.reference_data import reload_reference_snapshot, get_reference_status
+from app.services.gap_engine import get_db_gap_engine
+from app.services.simulation_service import simulate_scenarios
+from app.services.concurrency import run_cpu
+from app.services.gap_history_service import (
+    GAP_TREND_DEFAULT_BUCKETS,
+    GAP_TREND_MAX_BUCKETS,
+    parse_topics,
+    resolve_range,
+    range_payload,
+    query_gap_trend,
+)
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
 @router.get("/region-summary/")
-def get_region_summary(db: Session = Depends(get_db)):
-    try:
-        regions = db.query(RegionData).all()
+async def get_region_summary(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    """지역 요약 통계 (데이터 버전 기준 캐시 + ETag/Last-Modified)"""
+    async def build():
+        # 요약에 필요한 컬럼만 조회
+        rows = (await db.execute(select(
+            RegionData.region_name,
+            RegionData.policy_avg_score,
+            RegionData.sentiment_avg_score,
+            RegionData.gap_score,
+            RegionData.updated_at,
+        ))).all()
         result = [
             {
-                "region_name": region.region_name,
-                "policy_score": region.policy_avg_score,
-                "sentiment_score": region.sentiment_avg_score,
-                "gap_score": region.gap_score,
-                "updated_at": region.updated_at,
+                "region_name": row.region_name,
+                "policy_score": row.policy_avg_score,
+                "sentiment_score": row.sentiment_avg_score,
+                "gap_score": row.gap_score,
+                "updated_at": row.updated_at,
             }
-            for region in regions
+            for row in rows
         ]
         print("[analytics_router] 지역 요약 데이터 반환 완료")
-        return {"count": len(result), "data": result}
+        return dumps({"count": len(result), "data": result}), {}
+
+    try:
+        return await cached_json_response(request, build)
 
     except Exception as e:
         print(f"[analytics_router] 오류 발생: {e}")
@@ -31,15 +65,175 @@ def get_region_summary(db: Session = Depends(get_db)):
 
 
 @router.post("/update-gap/")
-def update_gap_scores(db: Session = Depends(get_db)):
+def update_gap_scores(incremental: bool = False, db: Session = Depends(get_db)):
     """
     Gap Score를 자동 계산하여 DB에 업데이트하는 엔드포인트
+    - incremental=true: 점수가 변경된(gap_dirty) 지역만 재계산
     """
     try:
-        update_all_gap_scores(db)
+        result = update_dirty_gap_scores(db) if incremental else update_all_gap_scores(db)
         print("[analytics_router] Gap Score 자동 업데이트 완료")
-        return {"status": "success"}
+        return {"status": "success", "updated_regions": result.get("updated_regions", 0)}
 
     except Exception as e:
         print(f"[analytics_router] Gap Score 업데이트 중 오류: {e}")
         return {"status": "error", "message": str(e)}
+
+
+@router.post("/sync-sentiment/")
+def sync_live_sentiment(rolling: bool = False, rebuild: bool = False, db: Session = Depends(get_db)):
+    """
+    sentiment_aggregate 의 실시간 여론 점수를 지역 여론 점수에 반영하고 해당 지역 gap 재계산
+    - rolling=true: 누적 평균 대신 지수이동평균(rolling_score) 사용
+    - rebuild=true: 반영 전에 집계 테이블을 로그 전체로부터 재구축
+    """
+    try:
+        if rebuild:
+            rebuild_sentiment_aggregates()
+        synced = sync_region_sentiment(db, use_rolling=rolling)
+        if synced["status"] != "success":
+            return synced
+        gap = update_dirty_gap_scores(db)
+        print("[analytics_router] 실시간 여론 점수 반영 완료")
+        return {
+            "status": "success",
+            "synced_regions": synced["updated_regions"],
+            "gap_updated_regions": gap.get("updated_regions", 0),
+        }
+
+    except Exception as e:
+        print(f"[analytics_router] 실시간 여론 반영 중 오류: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+@router.post("/compact-sentiment/")
+def compact_sentiment(retention_months: int = SENTIMENT_RETENTION_MONTHS):
+    """
+    보존 기간(현재 월 포함 retention_months 개월)보다 오래된 여론 로그 월 파티션을
+    sentiment_partition_summary 로 압축하고 원본을 삭제
+    """
+    try:
+        return compact_sentiment_partitions(retention_months=retention_months)
+    except Exception as e:
+        print(f"[analytics_router] 여론 파티션 정리 중 오류: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+@router.post("/reload-reference/")
+async def reload_reference_data():
+    """
+    참조 데이터(gap_score.csv, Welling_Master_dataset.csv, 벡터 파일) 다시 로드
+    - 새 스냅샷을 백그라운드 스레드에서 만든 뒤 한 번에 교체, 실패하면 기존 스냅샷 유지
+    """
+    try:
+        await reload_reference_snapshot()
+    except Exception as e:
+        print(f"[analytics_router] 참조 데이터 재로드 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"참조 데이터 재로드 실패 (기존 데이터 유지): {e}")
+    return {"status": "success", **get_reference_status()}
+
+
+@router.get("/gap-trend/{topic}/")
+async def get_topic_gap_trend(
+    topic: str,
+    request: Request,
+    regions: str | None = Query(None, description="쉼표로 구분한 지역명, 비우면 전체 지역"),
+    start: datetime | None = Query(None, description="시작 시각 (ISO 8601)"),
+    end: datetime | None = Query(None, description="종료 시각 (ISO 8601, 기본: 현재)"),
+    buckets: int = Query(GAP_TREND_DEFAULT_BUCKETS, ge=1, le=GAP_TREND_MAX_BUCKETS),
+    interval: int | None = Query(None, ge=1, description="버킷 크기(초)"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    한 주제의 지역별 gap 추이 (topic: overall 또는 TOPIC_COLUMNS 키, 버킷별 min/max/mean)
+    """
+    try:
+        if "," in topic:
+            raise ValueError("주제는 하나만 지정할 수 있습니다.")
+        topic = parse_topics(topic)[0]
+        start_ts, end_ts, bucket_seconds = resolve_range(start, end, buckets, interval)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def build():
+        stmt = select(RegionData.id, RegionData.region_name).order_by(RegionData.id)
+        if regions:
+            stmt = stmt.where(RegionData.region_name.in_([r.strip() for r in regions.split(",") if r.strip()]))
+        region_rows = (await db.execute(stmt)).all()
+
+        series = await query_gap_trend(db, [row.id for row in region_rows], [topic], start_ts, end_ts, bucket_seconds)
+        return dumps({
+            "topic": topic,
+            **range_payload(start_ts, end_ts, bucket_seconds),
+            "series": {row.region_name: series[(row.id, topic)] for row in region_rows},
+        }), {}
+
+    return await cached_json_response(request, build)
+
+
+@router.post("/simulate-gap/")
+async def simulate_gap(req: SimulationRequest):
+    """
+    가정 점수 변화(what-if) 시나리오별 gap·지역 순위·상위 주제 계산 (DB 변경 없음)
+    예: {"scenarios": [{"name": "부산 의료 +10", "deltas": [{"region": "부산", "topic": "healthcare", "policy": 10}]}]}
+    """
+    gap_engine = await get_db_gap_engine()
+    scenarios = [scenario.model_dump() for scenario in req.scenarios]
+    try:
+        results = await run_cpu(simulate_scenarios, gap_engine, scenarios, req.top_k, req.changed_only)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 시나리오가 많으면 응답이 커지므로 jsonable_encoder 를 거치지 않고 바로 직렬화
+    return raw_json_response(dumps({"data_version": gap_engine.version, "count": len(results), "scenarios": results}))
+
+
+def _leaderboard_payload(board, entries) -> dict:
+    return {
+        "topic": board.topic,
+        "label": board.label,
+        "stats": board.stats,
+        "entries": [entry._asdict() for entry in entries],
+    }
+
+
+@router.get("/leaderboard/")
+async def get_leaderboards(request: Request, limit: int = Query(10, ge=1, le=100)):
+    """전체(overall) 및 주제별 gap 상위 지역 순위표 (gap_engine 스냅샷, 데이터 버전당 한 번 계산)"""
+    async def build():
+        gap_engine = await get_db_gap_engine()
+        return dumps({
+            "data_version": gap_engine.version,
+            "leaderboards": [_leaderboard_payload(board, board.entries[:limit]) for board in gap_engine.leaderboards.values()],
+        }), {}
+
+    return await cached_json_response(request, build)
+
+
+@router.get("/leaderboard/{topic}/")
+async def get_topic_leaderboard(
+    topic: str,
+    request: Request,
+    limit: int = Query(20, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="desc: gap 큰 순, asc: gap 작은 순"),
+):
+    """
+    한 주제(또는 overall)의 지역 순위표 + 백분위·z-score·요약 통계
+    topic: overall 또는 TOPIC_COLUMNS 키 (transport_infra, healthcare, ...)
+    """
+    async def build():
+        gap_engine = await get_db_gap_engine()
+        try:
+            board = gap_engine.leaderboard(topic)
+        except LookupError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+        entries = board.entries if order == "desc" else board.entries[::-1]
+        return dumps({
+            "data_version": gap_engine.version,
+            "total": len(board.entries),
+            **_leaderboard_payload(board, entries[offset:offset + limit]),
+        }), {}
+
+    return await cached_json_response(request, build)
@@ -0,0 +1,60 @@
+# app/routers/events_router.py
+from fastapi import APIRouter, Header, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.utils.fast_json import dumps
+from app.services.event_bus import subscribe
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+"""
+events_router.py
+지역 점수 변경 푸시 API (대시보드 폴링 대체)
+- GET /api/events/regions/     : Server-Sent Events (EventSource, 재연결 시 Last-Event-ID 로 놓친 이벤트 재전송)
+- WS  /api/events/regions/ws   : 같은 이벤트를 JSON 텍스트 프레임으로 전송
+이벤트 type: ready(연결 직후 현재 version) / region_update(바뀐 지역 행) / rag_summary / resync(전체 재조회 필요)
+"""
+
+SSE_RETRY_MS = 3000
+
+
+def _sse_frame(event: dict | None) -> bytes:
+    if event is None:
+        return b": ping\n\n"
+    lines = [f"event: {event['type']}".encode()]
+    if event.get("id"):
+        lines.insert(0, f"id: {event['id']}".encode())
+    lines.append(b"data: " + dumps(event))
+    return b"\n".join(lines) + b"\n\n"
+
+
+@router.get("/regions/")
+async def stream_region_events(
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    since: str | None = Query(None, description="마지막으로 받은 이벤트 id (Last-Event-ID 헤더 대신 사용 가능)"),
+):
+    """지역 변경 이벤트 SSE 스트림"""
+    async def _frames():
+        yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+        async for event in subscribe(last_event_id or since):
+            yield _sse_frame(event)
+
+    return StreamingResponse(
+        _frames(),
+        media_type="text/event-stream",
+        # 프록시(nginx) 버퍼링 해제
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/regions/ws")
+async def websocket_region_events(websocket: WebSocket, since: str | None = None):
+    """지역 변경 이벤트 WebSocket (heartbeat 는 {"type": "ping"})"""
+    await websocket.accept()
+    events = subscribe(since)
+    try:
+        async for event in events:
+            await websocket.send_text(dumps(event or {"type": "ping"}).decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await events.aclose()
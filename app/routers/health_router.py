@@ -1,6 +1,11 @@
 from fastapi import APIRouter
 from datetime import datetime
-from app.utils.database import engine
+from app.utils.database import engine, DB_PROFILE
+from app.utils.response_cache import get_cache_stats
+from app.services.concurrency import get_concurrency_stats
+from app.services.event_bus import get_event_bus_stats
+from app.services.reference_data import get_reference_status
+from app.services.scheduler import get_scheduler_stats
 
 router = APIRouter()
 
@@ -11,9 +16,15 @@ health_router.py
 """
 
 @router.get("/health/")
-def health_check():
+async def health_check():
     return {
         "db": str(engine.url),
+        "db_profile": DB_PROFILE,
+        "response_cache": get_cache_stats(),
+        "concurrency": get_concurrency_stats(),
+        "events": get_event_bus_stats(),
+        "reference_data": get_reference_status(),
+        "scheduler": get_scheduler_stats(),
         "status": "ok",
         "timestamp": datetime.utcnow().isoformat()
     }
@@ -0,0 +1,38 @@
+# app/routers/map_router.py
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from app.services.map_layer_service import (
+    DEFAULT_MAP_LEVEL,
+    MAP_MEDIA_TYPE,
+    MAP_SIMPLIFY_LEVELS,
+    get_map_layer,
+)
+from app.utils.compression import negotiate_encoding
+from app.utils.response_cache import is_not_modified, validator_headers
+
+router = APIRouter()
+
+
+@router.get("/map/layer/")
+async def get_map_layer_geojson(
+    request: Request,
+    level: str = Query(DEFAULT_MAP_LEVEL, description=f"단순화 레벨 ({', '.join(MAP_SIMPLIFY_LEVELS)})"),
+):
+    """지도 첫 화면용 GeoJSON (지역 형상 + gap·주제 점수, 사전 생성·사전 압축본 응답)"""
+    try:
+        layer = await get_map_layer(level)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"[map_router] ❌ 지도 레이어 생성 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"지도 레이어 생성 실패: {e}")
+
+    headers = {**validator_headers(layer), "Vary": "Accept-Encoding"}
+    if is_not_modified(request, layer):
+        return Response(status_code=304, headers=headers)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding in layer.bodies:
+        # 압축본은 바이트가 다르므로 약한 ETag (압축 미들웨어는 Content-Encoding 이 있으면 그대로 통과)
+        headers.update({"Content-Encoding": encoding, "ETag": f"W/{layer.etag}"})
+        return Response(content=layer.bodies[encoding], media_type=MAP_MEDIA_TYPE, headers=headers)
+    return Response(content=layer.bodies["identity"], media_type=MAP_MEDIA_TYPE, headers=headers)
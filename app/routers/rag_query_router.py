@@ -5,20 +5,16 @@ from pydantic import BaseModel
 from typing import Optional, List
 from sqlalchemy.orm import Session
 from datetime import datetime
-import os
 
 from app.utils.database import get_db
 from app.utils.models import RagSummary
 from app.services.vector_store_service import reindex_all_embeddings, search_relevant_policies
 
-# OpenAI (chat) 호출
-from openai import OpenAI
+# LLM (chat) 호출
+from app.services.llm_backend import get_llm_backend
 
 router = APIRouter(prefix="/rag", tags=["RAG-Query"])
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-_openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
-
 class ReindexRequest(BaseModel):
     limit: Optional[int] = None
     force: bool = False
@@ -50,7 +46,8 @@ def rag_query(req: QueryRequest, db: Session = Depends(get_db)):
     """
     KoELECTRA로 질의 임베딩 → DB에서 유사 요약 상위 K개 검색 → ChatGPT로 최종 답변 생성
     """
-    if not _openai_client:
+    llm = get_llm_backend()
+    if not llm.is_configured():
         return {"status": "error", "message": "OPENAI_API_KEY가 설정되지 않았습니다."}
 
     # 검색
@@ -86,16 +83,13 @@ def rag_query(req: QueryRequest, db: Session = Depends(get_db)):
         "가능하면 컨텍스트에서 근거 문장을 간단히 인용해 주세요."
     )
 
-    resp = _openai_client.chat.completions.create(
-        model="gpt-4o-mini",
+    answer = llm.complete(
         messages=[
             {"role": "system", "content": "당신은 신뢰할 수 있는 정책 분석가입니다."},
             {"role": "user", "content": prompt},
         ],
         temperature=0.5,
     )
-
-    answer = resp.choices[0].message.content.strip()
     return {
         "status": "success",
         "answer": answer,
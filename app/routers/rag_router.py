@@ -4,9 +4,8 @@ from pydantic import BaseModel
 from app.utils.database import get_db
 from app.utils.models import RegionData, RagSummary
 from datetime import datetime
-import openai
-import os
 from app.services.rag_service import recommend_policies, generate_rag_insight
+from app.services.llm_backend import get_llm_backend, TASK_SUMMARY
 
 
 """
@@ -20,9 +19,6 @@ DB에 저장하는 라우터입니다.
 # ------------------------------------------------------
 router = APIRouter(prefix="/rag", tags=["RAG"])
 
-# OpenAI API Key 로드
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
 class RagRequest(BaseModel):
     region_name: str
     topic: str
@@ -56,17 +52,15 @@ def generate_rag_summary_from_gpt(region_name: str, topic: str, text: str):
         2. Proposals: (쉼표로 구분된 정책 제안 리스트)
         """
 
-        response = openai.chat.completions.create(
-            model="gpt-4o-mini",
+        gpt_output = get_llm_backend().complete(
             messages=[
                 {"role": "system", "content": "당신은 복지정책 분석 전문가입니다."},
                 {"role": "user", "content": prompt},
             ],
+            task=TASK_SUMMARY,
             temperature=0.7,
         )
 
-        gpt_output = response.choices[0].message.content.strip()
-
         # 결과 파싱
         summary_text = ""
         proposals = ""
@@ -1,99 +1,144 @@
 # app/routers/region_router.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.utils.database import get_db
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.database import get_async_read_db
 from app.utils.models import RegionData, RagSummary
-from app.utils.schemas import RegionResponse, RegionDetailResponse
+from app.utils.schemas import (
+    RegionResponse,
+    RagSummaryResponse,
+    RegionPartialResponse,
+    RegionDetailPartialResponse,
+)
+from app.utils.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    MAX_PAGE_LIMIT,
+    NEXT_CURSOR_HEADER,
+    select_columns,
+    fetch_keyset_page,
+)
+from app.utils.response_cache import cached_json_response
+from app.utils.fast_json import dumps
+from app.services.gap_engine import get_db_gap_engine
+from app.services.gap_history_service import (
+    GAP_TREND_DEFAULT_BUCKETS,
+    GAP_TREND_MAX_BUCKETS,
+    parse_topics,
+    resolve_range,
+    range_payload,
+    query_gap_trend,
+)
 
 router = APIRouter()
 
-@router.get("/regions/", response_model=list[RegionResponse])
-def get_all_regions(db: Session = Depends(get_db)):
-    return db.query(RegionData).all()
+# 캐시 저장용 직렬화 (response_model 과 같은 스키마로 검증 후 bytes 로 변환)
+_region_list_adapter = TypeAdapter(list[RegionPartialResponse])
+_region_detail_adapter = TypeAdapter(RegionDetailPartialResponse)
 
-@router.get("/regions/{region_name}/", response_model=RegionDetailResponse)
-def get_region_detail(region_name: str, db: Session = Depends(get_db)):
-    region = db.query(RegionData).filter(RegionData.region_name == region_name).first()
-    if not region:
-        raise HTTPException(status_code=404, detail="해당 지역을 찾을 수 없습니다.")
-    summaries = db.query(RagSummary).filter(RagSummary.region_id == region.id).all()
 
-    return {
-        "id": region.id,
-        "region_name": region.region_name,
-
-        "policy_avg_score": region.policy_avg_score,
-        "transport_infra_policy_score": region.transport_infra_policy_score,
-        "labor_economy_policy_score": region.labor_economy_policy_score,
-        "healthcare_policy_score": region.healthcare_policy_score,
-        "policy_efficiency_score": region.policy_efficiency_score,
-        "housing_environment_policy_score": region.housing_environment_policy_score,
-
-        "sentiment_avg_score": region.sentiment_avg_score,
-        "sentiment_transport_infra_score": region.sentiment_transport_infra_score,
-        "sentiment_labor_economy_score": region.sentiment_labor_economy_score,
-        "sentiment_healthcare_score": region.sentiment_healthcare_score,
-        "sentiment_policy_efficiency_score": region.sentiment_policy_efficiency_score,
-        "sentiment_housing_environment_score": region.sentiment_housing_environment_score,
-
-        "gap_score": region.gap_score,
-        "updated_at": region.updated_at,
-        "summaries": summaries,
-    }
+def _dump(adapter: TypeAdapter, payload) -> bytes:
+    return adapter.dump_json(adapter.validate_python(payload), exclude_unset=True)
+
+
+@router.get("/regions/", response_model=list[RegionPartialResponse], response_model_exclude_unset=True)
+async def get_all_regions(
+    request: Request,
+    fields: str | None = Query(None, description="쉼표로 구분한 반환 컬럼 (예: region_name,gap_score)"),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """지역 목록 (id 기준 keyset 페이지, 다음 페이지 커서는 X-Next-Cursor 헤더, 데이터 버전 기준 캐시)"""
+    async def build():
+        columns = select_columns(RegionData, fields, RegionResponse.model_fields)
+        rows, next_cursor = await fetch_keyset_page(db, RegionData, columns, cursor=cursor, limit=limit)
+        return _dump(_region_list_adapter, rows), {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+
+    return await cached_json_response(request, build)
+
+@router.get(
+    "/regions/{region_name}/",
+    response_model=RegionDetailPartialResponse,
+    response_model_exclude_unset=True,
+)
+async def get_region_detail(
+    region_name: str,
+    request: Request,
+    fields: str | None = Query(None, description="쉼표로 구분한 지역 컬럼"),
+    summary_fields: str | None = Query(None, description="쉼표로 구분한 요약 컬럼"),
+    summary_cursor: str | None = Query(None, description="이전 응답의 X-Next-Summary-Cursor 헤더 값"),
+    summary_limit: int = Query(DEFAULT_PAGE_LIMIT, ge=0, le=MAX_PAGE_LIMIT),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """지역 상세 + 요약 목록 (요약은 keyset 페이지, 다음 커서는 X-Next-Summary-Cursor 헤더, 데이터 버전 기준 캐시)"""
+    async def build():
+        columns = select_columns(RegionData, fields, RegionResponse.model_fields)
+        region = (await db.execute(
+            select(*columns).where(RegionData.region_name == region_name)
+        )).mappings().first()
+        if not region:
+            raise HTTPException(status_code=404, detail="해당 지역을 찾을 수 없습니다.")
+
+        summary_columns = select_columns(RagSummary, summary_fields, RagSummaryResponse.model_fields)
+        summaries, next_cursor = await fetch_keyset_page(
+            db, RagSummary, summary_columns, RagSummary.region_id == region["id"],
+            cursor=summary_cursor, limit=summary_limit,
+        )
+        headers = {"X-Next-Summary-Cursor": next_cursor} if next_cursor else {}
+        return _dump(_region_detail_adapter, {**region, "summaries": summaries}), headers
+
+    return await cached_json_response(request, build)
 
 
 @router.get("/regions/{region_name}/top-gaps/")
-def get_top_gap_topics(region_name: str, db: Session = Depends(get_db)):
+async def get_top_gap_topics(region_name: str):
     """
-    특정 지역의 주제별 gap을 계산하여 상위 3개 주제 반환
+    특정 지역의 주제별 gap을 계산하여 상위 3개 주제 반환 (gap_engine 스냅샷, 데이터 변경 시에만 재계산)
     """
-    region = db.query(RegionData).filter(RegionData.region_name == region_name).first()
-    if not region:
+    gap_engine = await get_db_gap_engine()
+    if region_name not in gap_engine:
         raise HTTPException(status_code=404, detail="해당 지역을 찾을 수 없습니다.")
 
-    # 주제별 gap 계산
-    topics = [
-        {
-            "topic": "교통인프라",
-            "topic_en": "transport_infra",
-            "policy_score": region.transport_infra_policy_score,
-            "sentiment_score": region.sentiment_transport_infra_score,
-            "gap": abs(region.transport_infra_policy_score - region.sentiment_transport_infra_score)
-        },
-        {
-            "topic": "노동경제",
-            "topic_en": "labor_economy",
-            "policy_score": region.labor_economy_policy_score,
-            "sentiment_score": region.sentiment_labor_economy_score,
-            "gap": abs(region.labor_economy_policy_score - region.sentiment_labor_economy_score)
-        },
-        {
-            "topic": "의료",
-            "topic_en": "healthcare",
-            "policy_score": region.healthcare_policy_score,
-            "sentiment_score": region.sentiment_healthcare_score,
-            "gap": abs(region.healthcare_policy_score - region.sentiment_healthcare_score)
-        },
-        {
-            "topic": "정책효율성",
-            "topic_en": "policy_efficiency",
-            "policy_score": region.policy_efficiency_score,
-            "sentiment_score": region.sentiment_policy_efficiency_score,
-            "gap": abs(region.policy_efficiency_score - region.sentiment_policy_efficiency_score)
-        },
-        {
-            "topic": "주거환경",
-            "topic_en": "housing_environment",
-            "policy_score": region.housing_environment_policy_score,
-            "sentiment_score": region.sentiment_housing_environment_score,
-            "gap": abs(region.housing_environment_policy_score - region.sentiment_housing_environment_score)
-        }
-    ]
-
-    # gap 기준 내림차순 정렬 후 상위 3개 선택
-    top_topics = sorted(topics, key=lambda x: x["gap"], reverse=True)[:3]
-
     return {
-        "region_name": region.region_name,
-        "top_gap_topics": top_topics
+        "region_name": region_name,
+        "top_gap_topics": gap_engine.top_topics(region_name, top_k=3),
     }
+
+
+@router.get("/regions/{region_name}/gap-trend/")
+async def get_region_gap_trend(
+    region_name: str,
+    request: Request,
+    topics: str | None = Query(None, description="쉼표로 구분한 주제 (overall,transport_infra,...), 비우면 전체"),
+    start: datetime | None = Query(None, description="시작 시각 (ISO 8601, 기본: end 기준 GAP_TREND_DEFAULT_DAYS 일 전)"),
+    end: datetime | None = Query(None, description="종료 시각 (ISO 8601, 기본: 현재)"),
+    buckets: int = Query(GAP_TREND_DEFAULT_BUCKETS, ge=1, le=GAP_TREND_MAX_BUCKETS),
+    interval: int | None = Query(None, ge=1, description="버킷 크기(초), 지정 시 buckets 대신 사용"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    지역의 주제별 gap 추이 (gap_snapshot 이력을 버킷별 min/max/mean 으로 다운샘플링)
+    """
+    try:
+        topic_list = parse_topics(topics)
+        start_ts, end_ts, bucket_seconds = resolve_range(start, end, buckets, interval)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def build():
+        region_id = (await db.execute(
+            select(RegionData.id).where(RegionData.region_name == region_name)
+        )).scalar_one_or_none()
+        if region_id is None:
+            raise HTTPException(status_code=404, detail="해당 지역을 찾을 수 없습니다.")
+
+        series = await query_gap_trend(db, [region_id], topic_list, start_ts, end_ts, bucket_seconds)
+        return dumps({
+            "region_name": region_name,
+            **range_payload(start_ts, end_ts, bucket_seconds),
+            "series": {topic: series[(region_id, topic)] for topic in topic_list},
+        }), {}
+
+    return await cached_json_response(request, build)
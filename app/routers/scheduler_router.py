@@ -0,0 +1,41 @@
+# app/routers/scheduler_router.py
+from fastapi import APIRouter, HTTPException
+from app.services.concurrency import run_cpu
+from app.services.scheduler import JOBS, get_job_states, is_job_running, run_job_async, start_job
+
+router = APIRouter(prefix="/scheduler")
+
+"""
+scheduler_router.py
+주기 작업 스케줄러 상태 조회 및 수동 실행 API
+- /api/scheduler/jobs/
+- /api/scheduler/jobs/{name}/run
+"""
+
+
+@router.get("/jobs/")
+async def list_jobs():
+    """등록된 작업의 cron 식, 다음 실행 예정, 마지막 실행 결과·소요 시간"""
+    return {"jobs": await run_cpu(get_job_states)}
+
+
+@router.post("/jobs/{name}/run")
+async def trigger_job(name: str, wait: bool = False):
+    """
+    작업 즉시 실행 (스케줄과 같은 겹침 방지 적용, 이미 실행 중이면 409)
+    - wait=false: 백그라운드로 시작만 하고 바로 응답 (결과는 /jobs/ 에서 확인)
+    - wait=true: 완료까지 대기 후 결과 반환
+    """
+    if name not in JOBS:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 작업입니다: {name} (가능: {', '.join(JOBS)})")
+    if is_job_running(name):
+        raise HTTPException(status_code=409, detail=f"{name} 작업이 이미 실행 중입니다.")
+
+    if not wait:
+        start_job(name, "manual")
+        return {"job": name, "status": "started"}
+
+    outcome = await run_job_async(name, "manual")
+    if outcome["status"] == "skipped":
+        raise HTTPException(status_code=409, detail=f"{name} 작업이 다른 프로세스에서 실행 중입니다.")
+    return outcome
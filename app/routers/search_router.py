@@ -0,0 +1,36 @@
+# app/routers/search_router.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.database import get_async_read_db
+from app.services.search_service import search, SEARCH_TARGETS
+
+"""
+search_router.py
+여론 댓글 / 정책 요약 전문 검색 API (SQLite FTS5)
+- /api/search/?q=...&target=sentiment|summary
+"""
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("/")
+async def search_text(
+    q: str = Query(..., min_length=1, description="검색어 (공백으로 구분된 단어는 모두 포함)"),
+    target: str = Query("sentiment", description=f"검색 대상: {' | '.join(SEARCH_TARGETS)}"),
+    region: str | None = Query(None, description="지역 필터"),
+    topic: str | None = Query(None, description="주제 필터"),
+    label: int | None = Query(None, description="감정 라벨 필터 (sentiment 대상만)"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """bm25 순위 + snippet 하이라이트 검색"""
+    try:
+        result = await search(db, q, target=target, region=region, topic=topic, label=label, limit=limit, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    print(f"[search_router] '{q}' ({target}) 검색 결과 {result['count']}건")
+    return {"query": q, "target": target, **result}
+
+
+print("[search_router.py] 검색 라우터가 성공적으로 로드되었습니다.")
@@ -0,0 +1,60 @@
+# app/routers/sentiment_router.py
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.database import get_async_read_db
+from app.utils.models import SentimentAnalysisLog
+from app.utils.regions import normalize_region_key
+from app.services.sentiment_aggregate_service import recent_partition_filter
+from app.utils.schemas import SentimentLogResponse, SentimentLogPartialResponse
+from app.utils.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    MAX_PAGE_LIMIT,
+    select_columns,
+    fetch_keyset_page,
+    set_cursor_header,
+)
+
+"""
+sentiment_router.py
+시민 여론 로그(sentiment_analysis_log) 조회 API
+- /api/sentiment-logs/ : 지역/주제/라벨 필터 + keyset 페이지 + fields projection
+"""
+
+router = APIRouter(prefix="/sentiment-logs", tags=["Sentiment"])
+
+
+@router.get("/", response_model=list[SentimentLogPartialResponse], response_model_exclude_unset=True)
+async def list_sentiment_logs(
+    response: Response,
+    region: str | None = Query(None, description="지역명 (서울특별시 → 서울 처럼 정규화)"),
+    topic: str | None = Query(None, description="주제 (예: 주거환경)"),
+    label: int | None = Query(None, description="+1: 긍정, 0: 중립, -1: 부정"),
+    partition: str | None = Query(None, pattern=r"^\d{4}-\d{2}$", description="월 파티션 (YYYY-MM)"),
+    recent_months: int | None = Query(None, ge=1, le=120, description="현재 월 포함 최근 N개월 파티션만 조회"),
+    fields: str | None = Query(None, description="쉼표로 구분한 반환 컬럼 (예: topic,label)"),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """여론 로그 목록 (region/topic 은 (region_key, topic), 기간은 (region_key, partition_key) 인덱스 사용)"""
+    filters = []
+    if region:
+        filters.append(SentimentAnalysisLog.region_key == normalize_region_key(region))
+    if topic:
+        filters.append(SentimentAnalysisLog.topic == topic)
+    if label is not None:
+        filters.append(SentimentAnalysisLog.label == label)
+    if partition:
+        filters.append(SentimentAnalysisLog.partition_key == partition)
+    if recent_months:
+        filters.append(recent_partition_filter(recent_months))
+
+    columns = select_columns(SentimentAnalysisLog, fields, SentimentLogResponse.model_fields)
+    rows, next_cursor = await fetch_keyset_page(
+        db, SentimentAnalysisLog, columns, *filters, cursor=cursor, limit=limit
+    )
+    set_cursor_header(response, next_cursor)
+    return rows
+
+
+print("[sentiment_router.py] 여론 로그 라우터가 성공적으로 로드되었습니다.")
@@ -0,0 +1,158 @@
+# app/services/concurrency.py
+
+import os
+import asyncio
+import weakref
+import functools
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+"""
+concurrency.py
+LLM 호출·CPU 연산의 동시 실행 한도를 관리하는 모듈입니다.
+- llm_slot(): 이벤트 루프별 세마포어로 동시 LLM 호출 수를 LLM_MAX_CONCURRENCY 로 제한
+              LLM_QUEUE_TIMEOUT 초 안에 자리를 얻지 못하면 LLMBusyError (→ 503)
+- run_cpu(): 벡터 유사도 계산·파일 로드 같은 CPU 작업을 전용 스레드풀(CPU_WORKERS)에서 실행
+             (FastAPI 기본 스레드풀을 점유하지 않아 동기 엔드포인트·헬스체크 지연에 영향 없음)
+- THREADPOOL_SIZE: 동기(def) 엔드포인트용 anyio 스레드 수 (0이면 기본값 40 유지)
+- iter_completed(): 배치 API 용, 작업을 BATCH_CONCURRENCY 개씩 동시에 실행하고 끝나는 순서대로 결과 반환
+"""
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "30"))
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "0"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))  # 배치 요청 하나가 동시에 쓰는 LLM 자리 수
+BATCH_MAX_REGIONS = int(os.getenv("BATCH_MAX_REGIONS", "50"))
+
+
+class LLMBusyError(RuntimeError):
+    """동시 LLM 호출 한도 초과로 대기 시간이 지난 경우"""
+
+
+_llm_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+_llm_stats = {"in_flight": 0, "waiting": 0, "rejected": 0}
+_cpu_executor: ThreadPoolExecutor | None = None
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    # asyncio.Semaphore 는 생성된 루프에 묶이므로 루프마다 따로 생성
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _llm_semaphores[loop] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return semaphore
+
+
+@asynccontextmanager
+async def llm_slot():
+    """동시 LLM 호출 자리 하나를 확보 (한도 초과 시 대기, 시간 초과 시 LLMBusyError)"""
+    semaphore = _get_llm_semaphore()
+    _llm_stats["waiting"] += 1
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=LLM_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        _llm_stats["rejected"] += 1
+        raise LLMBusyError(f"LLM 동시 요청 한도({LLM_MAX_CONCURRENCY})를 초과했습니다. 잠시 후 다시 시도하세요.")
+    finally:
+        _llm_stats["waiting"] -= 1
+
+    _llm_stats["in_flight"] += 1
+    try:
+        yield
+    finally:
+        _llm_stats["in_flight"] -= 1
+        semaphore.release()
+
+
+def error_status(error: Exception) -> int:
+    """서비스 예외 → HTTP 상태 코드 (배치 결과 줄에 사용)"""
+    if isinstance(error, LookupError):
+        return 404
+    if isinstance(error, LLMBusyError):
+        return 503
+    return 500
+
+
+def normalize_batch_regions(regions: list) -> list:
+    """배치 요청 지역 목록 정리 (공백 제거·중복 제거, BATCH_MAX_REGIONS 초과 시 ValueError)"""
+    cleaned = list(dict.fromkeys(r.strip() for r in regions if r and r.strip()))
+    if len(cleaned) > BATCH_MAX_REGIONS:
+        raise ValueError(f"한 번에 요청할 수 있는 지역은 최대 {BATCH_MAX_REGIONS}개입니다. (요청 {len(cleaned)}개)")
+    return cleaned
+
+
+async def batch_result_lines(results):
+    """(지역명, 결과, 예외) 스트림 → NDJSON 한 줄 단위 dict"""
+    async for region, result, error in results:
+        if error is None:
+            yield {"region": region, "status": "success", "data": result}
+        else:
+            print(f"[concurrency] ⚠️ 배치 항목 실패 ({region}): {error}")
+            yield {"region": region, "status": "error", "code": error_status(error), "message": str(error)}
+
+
+async def iter_completed(jobs: dict, limit: int = BATCH_CONCURRENCY):
+    """
+    {key: coroutine} 를 최대 limit 개씩 동시에 실행하고 끝나는 순서대로 (key, result, error) yield
+    - 소비자가 중간에 멈추면(클라이언트 연결 종료 등) 남은 작업은 취소
+    """
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def _run(key, coro):
+        try:
+            async with semaphore:
+                return key, await coro, None
+        except asyncio.CancelledError:
+            coro.close()  # 시작 전에 취소된 코루틴 정리 (never awaited 경고 방지)
+            raise
+        except Exception as e:
+            return key, None, e
+
+    tasks = [asyncio.ensure_future(_run(key, coro)) for key, coro in jobs.items()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def get_cpu_executor() -> ThreadPoolExecutor:
+    global _cpu_executor
+    if _cpu_executor is None:
+        _cpu_executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="cpu")
+    return _cpu_executor
+
+
+async def run_cpu(func, *args, **kwargs):
+    """func(*args, **kwargs) 를 CPU 전용 스레드풀에서 실행하고 결과 반환"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_executor(), functools.partial(func, *args, **kwargs))
+
+
+def configure_threadpool():
+    """동기 엔드포인트용 anyio 기본 스레드 수 설정 (이벤트 루프 안에서 호출)"""
+    if THREADPOOL_SIZE > 0:
+        import anyio.to_thread
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+        print(f"[concurrency] 동기 엔드포인트 스레드풀 크기: {THREADPOOL_SIZE}")
+
+
+def shutdown_executors():
+    global _cpu_executor
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=False, cancel_futures=True)
+        _cpu_executor = None
+
+
+def get_concurrency_stats() -> dict:
+    return {
+        "llm_max_concurrency": LLM_MAX_CONCURRENCY,
+        "llm_in_flight": _llm_stats["in_flight"],
+        "llm_waiting": _llm_stats["waiting"],
+        "llm_rejected": _llm_stats["rejected"],
+        "cpu_workers": CPU_WORKERS,
+    }
@@ -0,0 +1,218 @@
+# app/services/diagnosis_service.py
+
+import json
+from datetime import datetime
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.models import SentimentAnalysisLog, SentimentAggregate, RegionData
+from app.utils.regions import normalize_region_key
+from app.services.sentiment_aggregate_service import get_region_record_count, recent_partition_filter
+from app.services.reference_data import get_reference_gap_engine
+from app.services.llm_backend import complete_async, TASK_DIAGNOSIS
+from app.services.concurrency import run_cpu, iter_completed
+
+"""
+diagnosis_service.py
+지역 여론 + gap 기반 문제진단 로직입니다. (analysis_diagnosis_router 에서 분리)
+- DB 조회: AsyncSession (이벤트 루프 비차단)
+- gap_score.csv 기반 주제 추출: reference_data 스냅샷의 gap_engine
+- LLM 호출: complete_async (동시 호출 한도 적용)
+- 배치: 여러 지역의 건수·여론을 쿼리 두세 번으로 조회, gap 상위 주제는 reference_data 스냅샷에서 조회
+"""
+
+DIAGNOSIS_TEXT_LIMIT = 30
+DEFAULT_TOPIC_STR = "교통, 주거, 의료 등 생활 전반"
+
+
+def scarcity_level_for(record_count: int) -> str:
+    """여론 희소성 판단"""
+    if record_count > 50:
+        return "여론이 매우 활발함"
+    if record_count > 20:
+        return "일정 수준의 여론 활동이 존재함"
+    return "여론 데이터가 부족하거나 정보 접근성이 낮은 지역임"
+
+
+def top_topic_label(region_name: str, top_k: int = 3, gap_engine=None) -> str:
+    """gap_score.csv 기반 갭이 큰 주제 문자열 (실패 시 기본 문구)"""
+    try:
+        if gap_engine is None:
+            gap_engine = get_reference_gap_engine()
+        top_topics = gap_engine.top_topics(region_name, top_k=top_k)
+        return ", ".join([t["topic"] for t in top_topics])
+    except Exception as e:
+        print(f"[diagnosis_service] ⚠️ 주제 추출 실패: {e}")
+        return DEFAULT_TOPIC_STR
+
+
+async def load_region_opinions(db: AsyncSession, region_name: str) -> tuple[int, list]:
+    """
+    (전체 여론 건수, 최근 여론 text 목록) 반환, 여론이 없으면 LookupError
+    - 건수는 sentiment_aggregate 집계에서 조회
+    - text 는 최근 월 파티션에서 최신순 DIAGNOSIS_TEXT_LIMIT 개까지 (없으면 전체 기간)
+    """
+    region_key = normalize_region_key(region_name)
+    record_count = await db.run_sync(get_region_record_count, region_key)
+    if not record_count:
+        raise LookupError(f"{region_name} 지역의 여론 데이터가 없습니다.")
+
+    text_query = (
+        select(SentimentAnalysisLog.text)
+        .where(SentimentAnalysisLog.region_key == region_key, SentimentAnalysisLog.text != "")
+        .order_by(SentimentAnalysisLog.id.desc())
+        .limit(DIAGNOSIS_TEXT_LIMIT)
+    )
+    texts = (await db.scalars(text_query.where(recent_partition_filter()))).all()
+    if not texts:
+        texts = (await db.scalars(text_query)).all()
+    return record_count, texts
+
+
+def build_diagnosis_prompt(region_name: str, top_topic_str: str, combined_text: str) -> str:
+    return f"""
+    === 역할 정의 ===
+    너는 'Welling' 프로젝트의 AI 정책 분석 엔진이다.
+    너의 임무는 제공된 [지역 여론]을 정밀 분석하여, 해당 지역의 정책 문제와 여론 특성을 깊이 있게 진단하는 것이다.
+
+    === 입력 데이터 ===
+    [지역: {region_name}]
+    [주제: {top_topic_str}]
+    [여론 내용]
+    {combined_text}
+
+    === 작성 지침 ===
+    1. **"problem_summary"** 항목에서는 단순 요약이 아니라 다음 요소를 포함하라:
+       - 주민들의 불만과 요구를 구체적으로 기술하되, 표면적 진술에 그치지 말고 **원인·맥락·파급효과**를 함께 서술하라.
+       - 6~8줄 분량으로 작성하되, 정책·사회적 배경을 연결하여 **심층 분석형 문단**으로 표현하라.
+       - “무엇이 문제인가 → 왜 발생했는가 → 어떤 사회적 영향이 있는가”의 구조로 작성하라.
+       - 예시: “부산 지역은 △△의 구조적 문제로 인해 청년층의 이탈이 심화되고 있으며, 이는 △△정책의 한계와 연결된다.”
+
+    2. **"scarcity_insight"** 항목에서는 여론의 질적 특성과 감정 흐름을 분석하라:
+       - 단순히 활발함을 진술하지 말고, **감정의 방향(분노·피로·실망·희망)** 과 **세대별 차이, 논조 변화, 참여 계층** 등을 분석하라.
+       - 주민들의 심리 상태가 정책 개선 요구와 어떤 관계를 가지는지까지 확장하여 설명하라.
+       - 4~6줄 이상으로 작성하라.
+       - 수치나 댓글 개수는 언급하지 말고, 오직 정성적 판단으로 기술하라.
+
+    === 출력 형식 (JSON으로만 반환) ===
+    {{
+      "problem_summary": "(심층 분석 요약문)",
+      "scarcity_insight": "(정성적 여론 분석 결과)"
+    }}
+    """
+
+
+async def request_diagnosis(region_name: str, top_topic_str: str, texts: list, record_count: int) -> dict:
+    """LLM 진단 요청 후 응답 dict 구성"""
+    content = await complete_async(
+        [
+            {"role": "system", "content": "너는 사회정책 및 여론 분석 전문가이다."},
+            {"role": "user", "content": build_diagnosis_prompt(region_name, top_topic_str, "\n".join(texts))},
+        ],
+        task=TASK_DIAGNOSIS,
+        temperature=0.6,
+        json_mode=True,
+    )
+    result = json.loads(content)
+    print(f"[diagnosis_service] ✅ '{region_name}' 문제진단 완료")
+
+    return {
+        "region": region_name,
+        "top_topics": top_topic_str,
+        "record_count": record_count,
+        "scarcity_level": scarcity_level_for(record_count),
+        "diagnosed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "result": result,
+    }
+
+
+async def diagnose_region(db: AsyncSession, region_name: str) -> dict:
+    """지역 여론 조회 → 갭 상위 주제 추출 → LLM 진단"""
+    record_count, texts = await load_region_opinions(db, region_name)
+    # LLM 응답을 기다리는 동안 커넥션을 점유하지 않도록 읽기 트랜잭션 종료
+    await db.rollback()
+    top_topic_str = await run_cpu(top_topic_label, region_name)
+    return await request_diagnosis(region_name, top_topic_str, texts, record_count)
+
+
+# =========================================================
+# 배치 진단
+# =========================================================
+async def list_region_names(db: AsyncSession) -> list:
+    return (await db.scalars(select(RegionData.region_name).order_by(RegionData.id))).all()
+
+
+async def _latest_texts(db: AsyncSession, region_keys: set, *filters) -> dict:
+    """지역 키별 최신 text 최대 DIAGNOSIS_TEXT_LIMIT 개 (ROW_NUMBER 윈도우로 한 번에 조회)"""
+    if not region_keys:
+        return {}
+    ranked = (
+        select(
+            SentimentAnalysisLog.region_key,
+            SentimentAnalysisLog.text,
+            func.row_number().over(
+                partition_by=SentimentAnalysisLog.region_key,
+                order_by=SentimentAnalysisLog.id.desc(),
+            ).label("rn"),
+        )
+        .where(SentimentAnalysisLog.region_key.in_(region_keys), SentimentAnalysisLog.text != "", *filters)
+        .subquery()
+    )
+    rows = await db.execute(
+        select(ranked.c.region_key, ranked.c.text)
+        .where(ranked.c.rn <= DIAGNOSIS_TEXT_LIMIT)
+        .order_by(ranked.c.region_key, ranked.c.rn)
+    )
+    texts = {}
+    for region_key, text in rows:
+        texts.setdefault(region_key, []).append(text)
+    return texts
+
+
+async def load_regions_opinions(db: AsyncSession, region_names: list) -> dict:
+    """
+    {지역명: (전체 여론 건수, 최근 여론 text 목록) 또는 LookupError}
+    - load_region_opinions() 의 배치 버전 (건수 1회 + text 1~2회 쿼리)
+    """
+    region_keys = {region: normalize_region_key(region) for region in region_names}
+    counts = dict((await db.execute(
+        select(SentimentAggregate.region_key, func.sum(SentimentAggregate.total_count))
+        .where(SentimentAggregate.region_key.in_(set(region_keys.values())))
+        .group_by(SentimentAggregate.region_key)
+    )).all())
+
+    active_keys = {key for key in region_keys.values() if counts.get(key)}
+    texts = await _latest_texts(db, active_keys, recent_partition_filter())
+    # 최근 파티션에 여론이 없는 지역은 전체 기간에서 조회
+    texts.update(await _latest_texts(db, active_keys - set(texts)))
+
+    opinions = {}
+    for region, key in region_keys.items():
+        if key in active_keys:
+            opinions[region] = (counts[key], texts.get(key, []))
+        else:
+            opinions[region] = LookupError(f"{region} 지역의 여론 데이터가 없습니다.")
+    return opinions
+
+
+async def iter_diagnoses(opinions: dict):
+    """
+    load_regions_opinions() 결과로 LLM 진단을 동시에 실행하고 끝나는 순서대로 (지역명, 결과, 예외) yield
+    - DB 세션을 쓰지 않으므로 응답 스트리밍 중에도 커넥션을 점유하지 않음
+    """
+    try:
+        gap_engine = await run_cpu(get_reference_gap_engine)
+    except Exception as e:
+        print(f"[diagnosis_service] ⚠️ gap_score.csv 로드 실패: {e}")
+        gap_engine = None
+
+    jobs = {}
+    for region, opinion in opinions.items():
+        if isinstance(opinion, Exception):
+            yield region, None, opinion
+            continue
+        record_count, texts = opinion
+        topic_str = top_topic_label(region, gap_engine=gap_engine) if gap_engine is not None else DEFAULT_TOPIC_STR
+        jobs[region] = request_diagnosis(region, topic_str, texts, record_count)
+
+    async for item in iter_completed(jobs):
+        yield item
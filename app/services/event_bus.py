@@ -0,0 +1,215 @@
+# app/services/event_bus.py
+
+import os
+import uuid
+import asyncio
+import threading
+import itertools
+from collections import deque
+from sqlalchemy import select
+from app.utils.database import read_engine
+from app.utils.models import RegionData
+from app.utils.schemas import RegionResponse
+from app.utils.data_version import add_version_listener, current_data_version, get_data_version, DATA_VERSION_CHECK_INTERVAL
+
+"""
+event_bus.py
+지역 점수 변경을 구독자(SSE / WebSocket)에게 바로 전달하는 프로세스 내 이벤트 버스입니다.
+- 쓰기 경로(gap_calculator, sentiment_service, rag_service)가 커밋 후 publish_* 호출
+  → 바뀐 지역 행만 조회해 {"type", "version", "regions": [...]} 이벤트로 팬아웃
+- 구독자가 없으면 행 조회 없이 바로 반환 (쓰기 경로 부담 없음)
+- 구독자별 큐(EVENT_QUEUE_SIZE)가 가득 차면 쌓인 이벤트를 버리고 "resync" 한 건으로 대체
+- 최근 EVENT_HISTORY_SIZE 개 이벤트를 보관해 재연결 시 Last-Event-ID 이후 이벤트를 다시 전송
+- 다른 프로세스/스크립트의 쓰기는 data_version 변경으로 감지해 "resync" 이벤트 발행
+  (구독자가 있는 동안만 EVENT_VERSION_POLL_SECONDS 마다 버전 확인)
+"""
+
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+EVENT_HISTORY_SIZE = int(os.getenv("EVENT_HISTORY_SIZE", "200"))
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+EVENT_VERSION_POLL_SECONDS = float(os.getenv("EVENT_VERSION_POLL_SECONDS", str(DATA_VERSION_CHECK_INTERVAL)))
+
+EVENT_REGION_UPDATE = "region_update"
+EVENT_RAG_SUMMARY = "rag_summary"
+EVENT_RESYNC = "resync"
+
+# 이벤트 id: 프로세스 시작 id + 순번 (재시작 후의 Last-Event-ID 는 history 에 없으므로 resync)
+_BOOT_ID = uuid.uuid4().hex[:8]
+_sequence = itertools.count(1)
+
+_lock = threading.Lock()
+_subscribers: set = set()
+_history: deque = deque(maxlen=EVENT_HISTORY_SIZE)
+_watchers: dict = {}
+_stats = {"published": 0, "overflows": 0}
+
+
+class _Subscriber:
+    __slots__ = ("loop", "queue")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+
+def has_subscribers() -> bool:
+    with _lock:
+        return bool(_subscribers)
+
+
+# =========================================================
+# 1. 발행 (어느 스레드에서든 호출 가능)
+# =========================================================
+def _deliver(subscriber: _Subscriber, event: dict):
+    """구독자 이벤트 루프에서 실행, 큐가 가득 차면 밀린 이벤트 대신 resync 한 건만 남김"""
+    try:
+        subscriber.queue.put_nowait(event)
+    except asyncio.QueueFull:
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait({**event, "type": EVENT_RESYNC, "regions": []})
+        _stats["overflows"] += 1
+
+
+def publish(event_type: str, regions: list, reason: str = "", version: str | None = None) -> dict | None:
+    """이벤트 생성 → history 저장 → 모든 구독자 큐로 전달 (구독자가 없으면 None)"""
+    if not has_subscribers():
+        return None
+
+    event = {
+        "id": f"{_BOOT_ID}-{next(_sequence)}",
+        "type": event_type,
+        "version": version or current_data_version().token,
+        "reason": reason,
+        "regions": regions,
+    }
+    with _lock:
+        _history.append(event)
+        subscribers = list(_subscribers)
+        _stats["published"] += 1
+
+    for subscriber in subscribers:
+        try:
+            subscriber.loop.call_soon_threadsafe(_deliver, subscriber, event)
+        except RuntimeError:  # 루프가 이미 종료된 구독자
+            with _lock:
+                _subscribers.discard(subscriber)
+    return event
+
+
+def _region_event_columns() -> list:
+    # /api/regions/ 응답과 같은 컬럼 (gap_dirty 등 내부 컬럼 제외)
+    return [getattr(RegionData, name) for name in RegionResponse.model_fields if hasattr(RegionData, name)]
+
+
+def load_region_rows(region_names=None) -> list:
+    """지역 행 조회 (region_names=None 이면 전체)"""
+    stmt = select(*_region_event_columns()).order_by(RegionData.id)
+    if region_names is not None:
+        stmt = stmt.where(RegionData.region_name.in_(set(region_names)))
+    with read_engine.connect() as conn:
+        return [dict(row) for row in conn.execute(stmt).mappings()]
+
+
+def publish_region_update(region_names=None, reason: str = ""):
+    """커밋 이후 호출, 바뀐 지역 행만 담아 region_update 발행 (region_names=None: 전체 지역)"""
+    if not has_subscribers() or (region_names is not None and not region_names):
+        return None
+    try:
+        return publish(EVENT_REGION_UPDATE, load_region_rows(region_names), reason)
+    except Exception as e:
+        print(f"[event_bus] ⚠️ 지역 변경 이벤트 발행 실패: {e}")
+        return None
+
+
+def publish_rag_summary(summaries: list, reason: str = "rag_summary"):
+    """커밋 이후 호출, summaries: [{"region_name", "topic", "summary"}, ...]"""
+    if not has_subscribers() or not summaries:
+        return None
+    return publish(EVENT_RAG_SUMMARY, summaries, reason)
+
+
+def _on_version_change(info, reason: str, external: bool):
+    # 이 프로세스의 쓰기는 쓰기 경로가 상세 이벤트를 발행하므로 외부 변경만 처리
+    if external:
+        publish(EVENT_RESYNC, [], reason, version=info.token)
+
+
+add_version_listener(_on_version_change)
+
+
+# =========================================================
+# 2. 구독
+# =========================================================
+async def _watch_version(loop: asyncio.AbstractEventLoop):
+    """구독자가 있는 동안 주기적으로 data_version 확인 (외부 쓰기 감지 → _on_version_change)"""
+    try:
+        while True:
+            await asyncio.sleep(EVENT_VERSION_POLL_SECONDS)
+            with _lock:
+                if not any(s.loop is loop for s in _subscribers):
+                    break
+            try:
+                await get_data_version()
+            except Exception as e:
+                print(f"[event_bus] ⚠️ 데이터 버전 확인 실패: {e}")
+    finally:
+        with _lock:
+            _watchers.pop(loop, None)
+
+
+def _replay_after(history: list, last_event_id: str | None) -> list | None:
+    """last_event_id 이후 history 이벤트 (history 에 없으면 None → resync 필요)"""
+    if not last_event_id:
+        return []
+    for index, event in enumerate(history):
+        if event["id"] == last_event_id:
+            return history[index + 1:]
+    return None
+
+
+async def subscribe(last_event_id: str | None = None):
+    """
+    이벤트 async generator
+    - 첫 이벤트는 {"type": "ready", "version"} (재연결이면 놓친 이벤트 재전송 또는 resync)
+    - EVENT_HEARTBEAT_SECONDS 동안 이벤트가 없으면 None (연결 유지용 heartbeat)
+    """
+    loop = asyncio.get_running_loop()
+    subscriber = _Subscriber(loop)
+    with _lock:
+        _subscribers.add(subscriber)
+        # 등록과 같은 잠금 안에서 복사해야 재전송분과 큐 이벤트가 겹치지 않음
+        history = list(_history)
+        if loop not in _watchers:
+            _watchers[loop] = loop.create_task(_watch_version(loop))
+
+    try:
+        info = await get_data_version()
+        yield {"id": None, "type": "ready", "version": info.token, "reason": "", "regions": []}
+
+        replay = _replay_after(history, last_event_id)
+        if replay is None:
+            yield {"id": None, "type": EVENT_RESYNC, "version": info.token, "reason": "stale_event_id", "regions": []}
+        else:
+            for event in replay:
+                yield event
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=EVENT_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                event = None
+            yield event
+    finally:
+        with _lock:
+            _subscribers.discard(subscriber)
+
+
+def get_event_bus_stats() -> dict:
+    with _lock:
+        return {
+            "subscribers": len(_subscribers),
+            "published": _stats["published"],
+            "overflows": _stats["overflows"],
+            "history": len(_history),
+        }
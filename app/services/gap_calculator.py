@@ -1,47 +1,89 @@
 # app/services/gap_calculator.py
 
+from sqlalchemy import update, func
 from sqlalchemy.orm import Session
-from app.utils.models import RegionData
-from datetime import datetime
+from app.utils.models import RegionData, TOPIC_COLUMNS
+from app.services.event_bus import publish_region_update
+from app.services.gap_engine import gap_values
+from app.services.gap_history_service import record_gap_snapshot
+from datetime import datetime, timezone
 
 """
 gap_calculator.py
 정책 점수(policy_score)와 심리 점수(sentiment_score)의 차이를 기반으로
 불균형 점수(gap_score)를 계산하고 DB에 반영하는 서비스 로직입니다.
+- 전체/주제별 gap 은 ORM 객체 로드 없이 UPDATE 한 번으로 set 단위 재계산
+- 증분 모드는 점수가 바뀐(gap_dirty) 지역만 재계산
+- 갱신된 지역의 점수를 같은 트랜잭션에서 gap_snapshot 이력으로 기록 (gap_history_service)
+- 커밋 후 갱신된 지역 행을 이벤트 버스로 발행 (SSE/WebSocket 구독자)
 """
 
 
 def calculate_gap(policy_score: float, sentiment_score: float) -> float:
-    """단일 지역의 gap_score 계산"""
+    """단일 지역의 gap_score 계산 (gap_engine.gap_values 와 같은 규칙)"""
     try:
-        if policy_score is None or sentiment_score is None:
-            return 0.0
-        return round(abs(policy_score - sentiment_score), 2)
+        return float(gap_values(policy_score, sentiment_score))
     except Exception as e:
         print(f"[gap_calculator] gap 계산 중 오류: {e}")
         return 0.0
 
 
-def update_all_gap_scores(db: Session):
-    """DB 내 모든 지역의 gap_score를 일괄 계산 및 업데이트"""
+def _gap_expr(policy_col: str, sentiment_col: str):
+    """calculate_gap 과 같은 규칙의 SQL 식: ROUND(ABS(p - s), 2), NULL 이면 0.0"""
+    diff = func.abs(getattr(RegionData, policy_col) - getattr(RegionData, sentiment_col))
+    return func.coalesce(func.round(diff, 2), 0.0)
+
+
+def build_gap_update(only_dirty: bool = False, include_topics: bool = True):
+    """gap_score (+ 주제별 gap) 재계산 UPDATE 문 생성"""
+    values = {"gap_score": _gap_expr("policy_avg_score", "sentiment_avg_score")}
+    if include_topics:
+        for cols in TOPIC_COLUMNS.values():
+            values[cols["gap"]] = _gap_expr(cols["policy"], cols["sentiment"])
+    values["gap_dirty"] = False
+    values["updated_at"] = datetime.now(timezone.utc)
+
+    stmt = update(RegionData).values(**values)
+    if only_dirty:
+        stmt = stmt.where(RegionData.gap_dirty.is_(True))
+    # 갱신된 지역명을 RETURNING 으로 받아 변경 이벤트에 사용
+    return stmt.returning(RegionData.region_name).execution_options(synchronize_session=False)
+
+
+def update_all_gap_scores(db: Session, include_topics: bool = True):
+    """DB 내 모든 지역의 gap_score(및 주제별 gap)를 UPDATE 한 번으로 갱신"""
     try:
-        regions = db.query(RegionData).all()
-        if not regions:
+        updated = len(db.execute(build_gap_update(include_topics=include_topics)).scalars().all())
+        if updated:
+            record_gap_snapshot(db)
+        db.commit()
+        if not updated:
             print("[gap_calculator] 업데이트할 지역 데이터가 없습니다.")
             return {"status": "empty"}
 
-        for region in regions:
-            region.gap_score = calculate_gap(region.policy_avg_score, region.sentiment_avg_score)
-            region.updated_at = datetime.now()
-            db.add(region)
+        print(f"[gap_calculator] 모든 지역의 gap_score가 업데이트되었습니다. (총 {updated}개)")
+        publish_region_update(reason="gap_update")
+        return {"status": "success", "updated_regions": updated}
+
+    except Exception as e:
+        db.rollback()
+        print(f"[gap_calculator] DB 업데이트 중 오류 발생: {e}")
+        return {"status": "error", "message": str(e)}
 
+
+def update_dirty_gap_scores(db: Session, include_topics: bool = True):
+    """점수가 변경되어 gap_dirty 로 표시된 지역만 gap 재계산"""
+    try:
+        region_names = db.execute(build_gap_update(only_dirty=True, include_topics=include_topics)).scalars().all()
+        record_gap_snapshot(db, region_names)
         db.commit()
-        print(f"[gap_calculator] 모든 지역의 gap_score가 업데이트되었습니다. (총 {len(regions)}개)")
-        return {"status": "success", "updated_regions": len(regions)}
+        print(f"[gap_calculator] 변경된 지역 gap_score 증분 업데이트 완료 ({len(region_names)}개)")
+        publish_region_update(region_names, reason="gap_update_incremental")
+        return {"status": "success", "updated_regions": len(region_names)}
 
     except Exception as e:
         db.rollback()
-        print(f"[gap_calculator] DB 업데이트 중 오류 발생: {e}")
+        print(f"[gap_calculator] 증분 업데이트 중 오류 발생: {e}")
         return {"status": "error", "message": str(e)}
 
 
@@ -0,0 +1,245 @@
+# app/services/gap_engine.py
+
+import threading
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from app.utils.database import read_engine
+from app.utils.models import RegionData, TOPIC_COLUMNS
+from app.utils.data_version import get_data_version
+from app.services.concurrency import run_cpu
+from app.services.vector_service import topic_map
+
+"""
+gap_engine.py
+지역 × 주제 정책/여론 점수 행렬로 gap·순위·상위 K 주제를 한 번에 계산하는 엔진입니다.
+- GapEngine: 생성 시 모든 gap(round(|정책 - 여론|, 2)), 지역별 주제 순서, 주제별 지역 순위를 벡터 연산으로 계산
+             이후 top_topics() 는 미리 만든 목록을 자르기만 함 (요청당 O(1))
+- 스냅샷은 변경하지 않고 새로 만들어 교체 (읽는 쪽은 잠금 없이 사용)
+- leaderboard(): 주제별·전체 gap 지역 순위표 (순위·백분위·z-score, 엔진 생성 시 = 데이터 버전당 한 번 계산)
+- simulate(): 가상 점수 변화(시나리오 × 지역 × 주제 델타)를 행렬 복사본에 적용해 gap·순위를 일괄 재계산
+- DB 엔진(get_db_gap_engine): region_data 기준, data_version 토큰이 바뀔 때만 재생성
+- 참조 엔진(build_reference_gap_engine): gap_score.csv (+ Welling_Master_dataset.csv 점수)
+  reference_data 스냅샷의 일부로 생성·교체됨 (get_reference_gap_engine)
+"""
+
+TOPIC_KEYS = tuple(TOPIC_COLUMNS)
+GAP_DECIMALS = 2
+
+OVERALL_TOPIC = "overall"
+OVERALL_LABEL = "전체"
+
+# 순위표 1행 / 순위표 요약 통계
+LeaderboardEntry = namedtuple("LeaderboardEntry", ["rank", "region_name", "gap", "percentile", "z_score"])
+Leaderboard = namedtuple("Leaderboard", ["topic", "label", "entries", "stats"])
+
+# 시나리오별 결과 (모두 시나리오 × 지역 × 주제 배열)
+SimulatedGaps = namedtuple("SimulatedGaps", ["policy", "sentiment", "gap", "order", "region_rank"])
+
+def gap_values(policy, sentiment) -> np.ndarray:
+    """calculate_gap 의 벡터 버전: round(|정책 - 여론|, 2), 값이 없으면(None/NaN) 0.0"""
+    gap = np.round(np.abs(np.asarray(policy, dtype=float) - np.asarray(sentiment, dtype=float)), GAP_DECIMALS)
+    return np.where(np.isnan(gap), 0.0, gap)
+
+
+def _optional_scores(matrix: np.ndarray) -> list:
+    return [None if np.isnan(v) else float(v) for v in matrix]
+
+
+def build_leaderboard(topic: str, label: str, regions: tuple, gap: np.ndarray) -> Leaderboard:
+    """
+    gap 내림차순 순위표 (동점이면 지역 순서 유지)
+    - percentile: gap 이 이 지역 이하인 지역 비율 (0~100, 1위 = 100)
+    - z_score: (gap - 평균) / 표준편차 (표준편차 0 이면 0)
+    """
+    order = np.argsort(-gap, kind="stable")
+    sorted_asc = np.sort(gap)
+    percentile = np.round(100.0 * np.searchsorted(sorted_asc, gap, side="right") / max(len(gap), 1), 2)
+    mean = float(gap.mean()) if len(gap) else 0.0
+    std = float(gap.std()) if len(gap) else 0.0
+    z_score = np.round((gap - mean) / std, 4) if std > 0 else np.zeros_like(gap)
+
+    entries = tuple(
+        LeaderboardEntry(rank, regions[i], float(gap[i]), float(percentile[i]), float(z_score[i]))
+        for rank, i in enumerate(order.tolist(), start=1)
+    )
+    stats = {
+        "count": len(gap),
+        "mean": round(mean, 4),
+        "std": round(std, 4),
+        "min": float(sorted_asc[0]) if len(gap) else None,
+        "median": float(np.median(gap)) if len(gap) else None,
+        "max": float(sorted_asc[-1]) if len(gap) else None,
+    }
+    return Leaderboard(topic, label, entries, stats)
+
+
+class GapEngine:
+    """지역 × 주제 gap 스냅샷 (생성 후 변경하지 않음)"""
+
+    def __init__(self, regions, topics, labels, policy, sentiment, gap=None, overall=None, version=None):
+        self.regions = tuple(regions)
+        self.topics = tuple(topics)
+        self.labels = tuple(labels)
+        self.index = {region: i for i, region in enumerate(self.regions)}
+        self.version = version
+
+        shape = (len(self.regions), len(self.topics))
+        self.policy = np.asarray(policy, dtype=float).reshape(shape)
+        self.sentiment = np.asarray(sentiment, dtype=float).reshape(shape)
+        # gap 이 따로 주어지면(gap_score.csv) 그대로 사용, 아니면 정책/여론 점수로 계산
+        self.gap = gap_values(self.policy, self.sentiment) if gap is None else np.round(
+            np.nan_to_num(np.asarray(gap, dtype=float).reshape(shape)), GAP_DECIMALS
+        )
+        self.overall = None if overall is None else np.asarray(overall, dtype=float)
+
+        # 지역별 주제 순서 (gap 내림차순, 동점이면 주제 순서 유지)
+        self.order = np.argsort(-self.gap, axis=1, kind="stable")
+        # 주제별 지역 순위 (1 = gap 최대)
+        region_order = np.argsort(-self.gap, axis=0, kind="stable")
+        self.region_rank = np.empty(shape, dtype=int)
+        self.region_rank[region_order, np.arange(shape[1])] = np.arange(1, shape[0] + 1)[:, None]
+
+        self._ranked = [self._topic_entries(i) for i in range(shape[0])]
+        self.leaderboards = {
+            topic: build_leaderboard(topic, self.labels[t], self.regions, self.gap[:, t])
+            for t, topic in enumerate(self.topics)
+        }
+        if self.overall is not None:
+            self.leaderboards = {
+                OVERALL_TOPIC: build_leaderboard(OVERALL_TOPIC, OVERALL_LABEL, self.regions, self.overall),
+                **self.leaderboards,
+            }
+        for matrix in (self.policy, self.sentiment, self.gap, self.order, self.region_rank):
+            matrix.setflags(write=False)
+
+    def _topic_entries(self, row: int) -> list:
+        policy = _optional_scores(self.policy[row])
+        sentiment = _optional_scores(self.sentiment[row])
+        gap = self.gap[row].tolist()
+        return [
+            {
+                "topic": self.labels[t],
+                "topic_en": self.topics[t],
+                "gap": gap[t],
+                "policy_score": policy[t],
+                "sentiment_score": sentiment[t],
+            }
+            for t in self.order[row].tolist()
+        ]
+
+    def __contains__(self, region_name: str) -> bool:
+        return region_name in self.index
+
+    def top_topics(self, region_name: str, top_k: int = 3) -> list:
+        """gap 상위 K개 주제 ({"topic", "topic_en", "gap", "policy_score", "sentiment_score"}), 없는 지역은 LookupError"""
+        row = self.index.get(region_name)
+        if row is None:
+            raise LookupError(f"{region_name} 지역의 gap 데이터가 없습니다.")
+        return [dict(entry) for entry in self._ranked[row][:top_k]]
+
+    def leaderboard(self, topic: str) -> Leaderboard:
+        """주제(또는 overall) 순위표, 없는 주제는 LookupError"""
+        board = self.leaderboards.get(topic)
+        if board is None:
+            raise LookupError(f"알 수 없는 주제: {topic} (가능: {', '.join(self.leaderboards)})")
+        return board
+
+    def simulate(self, policy_delta, sentiment_delta, score_range=None) -> SimulatedGaps:
+        """
+        (시나리오, 지역, 주제) 델타를 더한 점수로 gap·주제 순서·지역 순위 재계산 (엔진 행렬은 변경하지 않음)
+        - score_range: (최소, 최대) 가 주어지면 적용 후 점수를 그 범위로 자름
+        """
+        policy = self.policy + np.asarray(policy_delta, dtype=float)
+        sentiment = self.sentiment + np.asarray(sentiment_delta, dtype=float)
+        if score_range is not None:
+            policy = np.clip(policy, *score_range)
+            sentiment = np.clip(sentiment, *score_range)
+
+        gap = gap_values(policy, sentiment)
+        order = np.argsort(-gap, axis=2, kind="stable")
+        region_order = np.argsort(-gap, axis=1, kind="stable")
+        region_rank = np.empty(gap.shape, dtype=int)
+        ranks = np.broadcast_to(np.arange(1, gap.shape[1] + 1)[None, :, None], gap.shape)
+        np.put_along_axis(region_rank, region_order, ranks, axis=1)
+        return SimulatedGaps(policy, sentiment, gap, order, region_rank)
+
+
+# =========================================================
+# 1. DB(region_data) 기반 엔진
+# =========================================================
+_engines = {"db": None}
+_build_lock = threading.Lock()
+
+
+def build_db_gap_engine(version: str | None = None) -> GapEngine:
+    columns = [RegionData.region_name, RegionData.policy_avg_score, RegionData.sentiment_avg_score]
+    for cols in TOPIC_COLUMNS.values():
+        columns += [getattr(RegionData, cols["policy"]), getattr(RegionData, cols["sentiment"])]
+    with read_engine.connect() as conn:
+        rows = conn.execute(select(*columns).order_by(RegionData.id)).all()
+
+    values = np.array([row[1:] for row in rows], dtype=float).reshape(len(rows), 2 + 2 * len(TOPIC_KEYS))
+    return GapEngine(
+        regions=[row[0] for row in rows],
+        topics=TOPIC_KEYS,
+        labels=[cols["label"] for cols in TOPIC_COLUMNS.values()],
+        policy=values[:, 2::2],
+        sentiment=values[:, 3::2],
+        overall=gap_values(values[:, 0], values[:, 1]),
+        version=version,
+    )
+
+
+def _refresh_db_engine(token: str) -> GapEngine:
+    with _build_lock:
+        engine = _engines["db"]
+        if engine is None or engine.version != token:
+            engine = _engines["db"] = build_db_gap_engine(token)
+            print(f"[gap_engine] DB gap 엔진 갱신 ({len(engine.regions)}개 지역, version={token})")
+        return engine
+
+
+async def get_db_gap_engine() -> GapEngine:
+    """region_data 기준 엔진 (데이터 버전이 바뀐 경우에만 CPU 스레드풀에서 재생성)"""
+    token = (await get_data_version()).token
+    engine = _engines["db"]
+    if engine is not None and engine.version == token:
+        return engine
+    return await run_cpu(_refresh_db_engine, token)
+
+
+# =========================================================
+# 2. 참조 데이터(gap_score.csv) 기반 엔진
+# =========================================================
+def build_reference_gap_engine(gap_table: pd.DataFrame, master: pd.DataFrame | None = None, version=None) -> GapEngine:
+    """
+    gap_score.csv 의 gap + (있으면) Welling_Master_dataset.csv 의 주제별 정책/여론 점수
+    - gap_table / master: region 인덱스 DataFrame (reference_data 스냅샷 생성 시 한 번만 읽음)
+    """
+    csv_columns = [col for col in topic_map if col in gap_table.columns]
+    for col in topic_map.keys() - set(csv_columns):
+        print(f"⚠️ CSV에 {col} 컬럼이 없습니다. 건너뜀.")
+    topics = [topic_map[col][1] for col in csv_columns]
+
+    shape = (len(gap_table), len(topics))
+    policy = np.full(shape, np.nan)
+    sentiment = np.full(shape, np.nan)
+    if master is not None:
+        master = master.reindex(gap_table.index)
+        for t, topic in enumerate(topics):
+            cols = TOPIC_COLUMNS[topic]
+            if cols["policy"] in master.columns and cols["sentiment"] in master.columns:
+                policy[:, t] = master[cols["policy"]].to_numpy(dtype=float)
+                sentiment[:, t] = master[cols["sentiment"]].to_numpy(dtype=float)
+
+    return GapEngine(
+        regions=gap_table.index.astype(str),
+        topics=topics,
+        labels=[topic_map[col][0] for col in csv_columns],
+        policy=policy,
+        sentiment=sentiment,
+        gap=gap_table[csv_columns].to_numpy(dtype=float),
+        version=version,
+    )
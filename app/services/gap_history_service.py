@@ -0,0 +1,158 @@
+# app/services/gap_history_service.py
+
+import os
+import math
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, insert, func, literal, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.models import RegionData, GapSnapshot, TOPIC_COLUMNS, GAP_SNAPSHOT_TOPICS
+
+"""
+gap_history_service.py
+gap 재계산 시점마다 지역·주제별 정책/여론/gap 점수를 gap_snapshot 테이블에 누적 저장하고,
+기간별 추이를 버킷 단위(min/max/mean)로 다운샘플링해 조회하는 로직입니다.
+- 기록: region_data 갱신과 같은 트랜잭션에서 INSERT ... SELECT 한 번 (ORM 객체 로드 없음)
+- 저장: (region_id, topic 코드, epoch 초) PK 의 WITHOUT ROWID 테이블 → 행당 정수 3개 + 실수 3개
+- 조회: SQL GROUP BY 로 버킷 집계 후 버킷 수만큼만 반환 (원본 행을 응답으로 보내지 않음)
+"""
+
+GAP_SNAPSHOT_ENABLED = os.getenv("GAP_SNAPSHOT_ENABLED", "true").lower() == "true"
+GAP_TREND_DEFAULT_DAYS = int(os.getenv("GAP_TREND_DEFAULT_DAYS", "30"))
+GAP_TREND_DEFAULT_BUCKETS = int(os.getenv("GAP_TREND_DEFAULT_BUCKETS", "200"))
+GAP_TREND_MAX_BUCKETS = int(os.getenv("GAP_TREND_MAX_BUCKETS", "2000"))
+
+TOPIC_CODES = {topic: code for code, topic in enumerate(GAP_SNAPSHOT_TOPICS)}
+
+# topic 코드별 (정책, 여론, gap) 컬럼 — 0 = 전체 평균 점수
+_SNAPSHOT_COLUMNS = [("policy_avg_score", "sentiment_avg_score", "gap_score")] + [
+    (cols["policy"], cols["sentiment"], cols["gap"]) for cols in TOPIC_COLUMNS.values()
+]
+
+
+def to_epoch(dt: datetime) -> int:
+    """datetime → UTC epoch 초 (timezone 없는 값은 UTC 로 간주)"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def parse_topics(value: str | None) -> list[str]:
+    """쉼표 구분 주제 목록 검증 (비우면 전체 주제), 알 수 없는 주제는 ValueError"""
+    if not value:
+        return list(GAP_SNAPSHOT_TOPICS)
+    topics = [t.strip() for t in value.split(",") if t.strip()]
+    unknown = [t for t in topics if t not in TOPIC_CODES]
+    if unknown:
+        raise ValueError(f"알 수 없는 주제: {', '.join(unknown)} (가능: {', '.join(GAP_SNAPSHOT_TOPICS)})")
+    return list(dict.fromkeys(topics))
+
+
+# =========================================================
+# 1. 스냅샷 기록 (gap 재계산 트랜잭션 내부)
+# =========================================================
+def build_snapshot_insert(region_names=None, ts: int | None = None):
+    """
+    region_data 현재 점수를 gap_snapshot 에 복사하는 INSERT ... SELECT 문
+    - region_names: None 이면 전체 지역
+    - 같은 초에 다시 기록하면 덮어씀 (OR REPLACE)
+    """
+    ts = to_epoch(datetime.now(timezone.utc)) if ts is None else int(ts)
+    selects = []
+    for code, (policy_col, sentiment_col, gap_col) in enumerate(_SNAPSHOT_COLUMNS):
+        stmt = select(
+            RegionData.id,
+            literal(code),
+            literal(ts),
+            func.coalesce(getattr(RegionData, policy_col), 0.0),
+            func.coalesce(getattr(RegionData, sentiment_col), 0.0),
+            func.coalesce(getattr(RegionData, gap_col), 0.0),
+        )
+        if region_names is not None:
+            stmt = stmt.where(RegionData.region_name.in_(list(region_names)))
+        selects.append(stmt)
+
+    columns = ["region_id", "topic", "ts", "policy_score", "sentiment_score", "gap_score"]
+    return insert(GapSnapshot).prefix_with("OR REPLACE").from_select(columns, union_all(*selects))
+
+
+def record_gap_snapshot(db, region_names=None, ts: int | None = None) -> int:
+    """
+    db: Session 또는 Connection (호출 측 트랜잭션 안에서 실행, 커밋하지 않음)
+    반환: 기록한 행 수 (지역 수 × 주제 수)
+    """
+    if not GAP_SNAPSHOT_ENABLED:
+        return 0
+    if region_names is not None and not region_names:
+        return 0
+    return db.execute(build_snapshot_insert(region_names, ts)).rowcount or 0
+
+
+# =========================================================
+# 2. 추이 조회 (버킷 다운샘플링)
+# =========================================================
+def resolve_range(start: datetime | None, end: datetime | None, buckets: int, interval: int | None):
+    """조회 구간과 버킷 크기(초) 결정 → (start_ts, end_ts, bucket_seconds), 잘못된 구간은 ValueError"""
+    end_ts = to_epoch(end) if end else to_epoch(datetime.now(timezone.utc))
+    start_ts = to_epoch(start) if start else end_ts - int(timedelta(days=GAP_TREND_DEFAULT_DAYS).total_seconds())
+    if start_ts >= end_ts:
+        raise ValueError("start 는 end 보다 이전이어야 합니다.")
+
+    span = end_ts - start_ts
+    bucket_seconds = interval or max(1, math.ceil(span / buckets))
+    # interval 을 직접 준 경우에도 버킷 수 상한 유지
+    bucket_seconds = max(bucket_seconds, math.ceil(span / GAP_TREND_MAX_BUCKETS))
+    return start_ts, end_ts, bucket_seconds
+
+
+async def query_gap_trend(
+    db: AsyncSession,
+    region_ids: list[int],
+    topics: list[str],
+    start_ts: int,
+    end_ts: int,
+    bucket_seconds: int,
+) -> dict:
+    """
+    (지역, 주제, 버킷)별 gap 최소/최대/평균/개수
+    반환: {(region_id, topic): [{"t", "min", "max", "mean", "count"}, ...]} (버킷 시작 시각 오름차순)
+    """
+    # 버킷 경계는 epoch 기준 bucket_seconds 배수 (요청 시각과 무관하게 같은 경계 유지)
+    bucket = (GapSnapshot.ts // bucket_seconds).label("bucket")
+    rows = (await db.execute(
+        select(
+            GapSnapshot.region_id,
+            GapSnapshot.topic,
+            bucket,
+            func.min(GapSnapshot.gap_score),
+            func.max(GapSnapshot.gap_score),
+            func.avg(GapSnapshot.gap_score),
+            func.count(),
+        )
+        .where(
+            GapSnapshot.region_id.in_(region_ids),
+            GapSnapshot.topic.in_([TOPIC_CODES[t] for t in topics]),
+            GapSnapshot.ts >= start_ts,
+            GapSnapshot.ts <= end_ts,
+        )
+        .group_by(GapSnapshot.region_id, GapSnapshot.topic, bucket)
+        .order_by(GapSnapshot.region_id, GapSnapshot.topic, bucket)
+    )).all()
+
+    series = {(region_id, topic): [] for region_id in region_ids for topic in topics}
+    for region_id, code, index, low, high, mean, count in rows:
+        series[(region_id, GAP_SNAPSHOT_TOPICS[code])].append({
+            "t": datetime.fromtimestamp(int(index) * bucket_seconds, timezone.utc).isoformat(),
+            "min": low,
+            "max": high,
+            "mean": round(mean, 4),
+            "count": count,
+        })
+    return series
+
+
+def range_payload(start_ts: int, end_ts: int, bucket_seconds: int) -> dict:
+    return {
+        "start": datetime.fromtimestamp(start_ts, timezone.utc).isoformat(),
+        "end": datetime.fromtimestamp(end_ts, timezone.utc).isoformat(),
+        "bucket_seconds": bucket_seconds,
+    }
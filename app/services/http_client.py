@@ -0,0 +1,74 @@
+# app/services/http_client.py
+
+import os
+import asyncio
+import weakref
+import httpx
+
+"""
+http_client.py
+외부 AI 서버 호출용 HTTP 클라이언트를 커넥션 풀(keep-alive)로 공유하는 모듈입니다.
+요청마다 새 TCP 연결을 맺지 않도록 sync 클라이언트는 프로세스 단위, async 클라이언트는 이벤트 루프 단위로 재사용합니다.
+"""
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+
+_sync_client: httpx.Client | None = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+
+
+def get_http_client() -> httpx.Client:
+    """공유 sync 클라이언트 반환 (최초 호출 시 생성)"""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(limits=_limits(), timeout=_timeout())
+    return _sync_client
+
+
+def new_async_http_client() -> httpx.AsyncClient:
+    """
+    동일한 풀 설정의 async 클라이언트를 새로 생성
+    - asyncio.run() 처럼 일회성 이벤트 루프에서 사용할 때 (호출자가 닫아야 함)
+    """
+    return httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프에서 공유하는 async 클라이언트 반환"""
+    # async 커넥션은 생성된 루프에 묶이므로 루프마다 따로 생성 (다른 루프에서 재사용 시 "Event loop is closed")
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _async_clients[loop] = new_async_http_client()
+    return client
+
+
+async def close_http_clients():
+    """서버 종료 시 풀 정리 (현재 루프의 async 클라이언트는 닫고, 이미 끝난 루프의 클라이언트는 참조만 해제)"""
+    global _sync_client
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+    _async_clients.clear()
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+    print("[http_client] HTTP 커넥션 풀이 종료되었습니다.")
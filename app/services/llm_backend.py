@@ -0,0 +1,201 @@
+# app/services/llm_backend.py
+
+import os
+import asyncio
+import weakref
+from openai import OpenAI, AsyncOpenAI
+from app.services.http_client import get_http_client, get_async_http_client
+from app.services.concurrency import llm_slot
+
+"""
+llm_backend.py
+분석 경로(진단, 정책 액션, RAG)에서 사용하는 LLM 호출을 백엔드 구현과 분리하는 모듈입니다.
+환경변수 LLM_BACKEND 로 백엔드를 선택합니다.
+- openai (기본값): OpenAI Chat Completions API
+- local: mock_ai_server.py 의 /api/chat 엔드포인트 (오프라인 부하 테스트·벤치마크용)
+async 엔드포인트에서는 complete_async() 를 사용합니다 (스레드 점유 없음, LLM_MAX_CONCURRENCY 로 동시 호출 제한).
+"""
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai").strip().lower()
+LOCAL_LLM_URL = os.getenv("LOCAL_LLM_URL", "http://127.0.0.1:5000/api/chat")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+DEFAULT_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+
+# ✅ 응답 스키마 구분용 task 이름 (mock 서버가 task별로 JSON 형식을 맞춰 응답)
+TASK_TEXT = "text"              # 자유 형식 텍스트 (RAG 요약·답변)
+TASK_SUMMARY = "summary"        # "1. Summary / 2. Proposals" 형식
+TASK_DIAGNOSIS = "diagnosis"    # {"problem_summary", "scarcity_insight"}
+TASK_ACTION = "action"          # {"rag_action_card", "reference_regions", "reference_policies"}
+TASK_PROPOSAL = "proposal"      # {"problem_summary", "policy_suggestion"}
+
+
+# =========================================================
+# 1. 공통 인터페이스
+# =========================================================
+class LLMBackend:
+    """LLM 백엔드 공통 인터페이스"""
+
+    name = "base"
+
+    def is_configured(self) -> bool:
+        return True
+
+    def complete(
+        self,
+        messages: list,
+        task: str = TASK_TEXT,
+        model: str = DEFAULT_MODEL,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        json_mode: bool = False,
+    ) -> str:
+        """messages(ChatML 형식)를 보내고 응답 본문 문자열을 반환"""
+        raise NotImplementedError
+
+    async def acomplete(
+        self,
+        messages: list,
+        task: str = TASK_TEXT,
+        model: str = DEFAULT_MODEL,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        json_mode: bool = False,
+    ) -> str:
+        """complete() 의 async 버전"""
+        raise NotImplementedError
+
+    async def aclose(self):
+        """현재 이벤트 루프에 묶인 async 클라이언트 정리 (서버 종료 시)"""
+
+
+# =========================================================
+# 2. OpenAI 백엔드
+# =========================================================
+class OpenAIBackend(LLMBackend):
+    name = "openai"
+
+    def __init__(self, api_key: str | None = None):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self._client = None
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    @property
+    def client(self) -> OpenAI:
+        # API Key가 없어도 모듈 import가 실패하지 않도록 최초 호출 시 생성
+        if self._client is None:
+            self._client = OpenAI(api_key=self.api_key, timeout=LLM_TIMEOUT)
+        return self._client
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        # async 클라이언트의 커넥션 풀은 생성된 이벤트 루프에 묶이므로 루프마다 따로 생성
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = AsyncOpenAI(api_key=self.api_key, timeout=LLM_TIMEOUT)
+        return client
+
+    async def aclose(self):
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+        self._async_clients.clear()
+
+    def is_configured(self) -> bool:
+        return bool(self.api_key)
+
+    @staticmethod
+    def _request_kwargs(messages, model, temperature, max_tokens, json_mode) -> dict:
+        kwargs = {"model": model, "messages": messages}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+
+    def complete(self, messages, task=TASK_TEXT, model=DEFAULT_MODEL,
+                 temperature=None, max_tokens=None, json_mode=False) -> str:
+        kwargs = self._request_kwargs(messages, model, temperature, max_tokens, json_mode)
+        response = self.client.chat.completions.create(**kwargs)
+        return response.choices[0].message.content.strip()
+
+    async def acomplete(self, messages, task=TASK_TEXT, model=DEFAULT_MODEL,
+                        temperature=None, max_tokens=None, json_mode=False) -> str:
+        kwargs = self._request_kwargs(messages, model, temperature, max_tokens, json_mode)
+        response = await self.async_client.chat.completions.create(**kwargs)
+        return response.choices[0].message.content.strip()
+
+
+# =========================================================
+# 3. 로컬(mock) 백엔드
+# =========================================================
+class LocalBackend(LLMBackend):
+    name = "local"
+
+    def __init__(self, url: str = LOCAL_LLM_URL, timeout: float = LLM_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    @staticmethod
+    def _payload(messages, task, model, max_tokens, json_mode) -> dict:
+        return {
+            "task": task,
+            "model": model,
+            "messages": messages,
+            "json_mode": json_mode,
+            "max_tokens": max_tokens,
+        }
+
+    def complete(self, messages, task=TASK_TEXT, model=DEFAULT_MODEL,
+                 temperature=None, max_tokens=None, json_mode=False) -> str:
+        payload = self._payload(messages, task, model, max_tokens, json_mode)
+        # 공유 커넥션 풀(keep-alive) 사용
+        response = get_http_client().post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["content"].strip()
+
+    async def acomplete(self, messages, task=TASK_TEXT, model=DEFAULT_MODEL,
+                        temperature=None, max_tokens=None, json_mode=False) -> str:
+        payload = self._payload(messages, task, model, max_tokens, json_mode)
+        response = await get_async_http_client().post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["content"].strip()
+
+
+_BACKENDS = {
+    OpenAIBackend.name: OpenAIBackend,
+    LocalBackend.name: LocalBackend,
+}
+_backend: LLMBackend | None = None
+
+
+def get_llm_backend() -> LLMBackend:
+    """설정(LLM_BACKEND)에 맞는 백엔드 싱글턴 반환"""
+    global _backend
+    if _backend is None:
+        if LLM_BACKEND not in _BACKENDS:
+            raise ValueError(
+                f"지원하지 않는 LLM_BACKEND 값입니다: {LLM_BACKEND} (가능: {', '.join(_BACKENDS)})"
+            )
+        _backend = _BACKENDS[LLM_BACKEND]()
+        print(f"[llm_backend] ✅ LLM 백엔드 선택: {_backend.name}")
+    return _backend
+
+
+async def close_llm_backend():
+    """서버 종료 시 백엔드의 async 클라이언트 정리 (백엔드를 만든 적 없으면 생략)"""
+    if _backend is not None:
+        await _backend.aclose()
+
+
+async def complete_async(messages: list, **kwargs) -> str:
+    """동시 호출 한도(llm_slot) 안에서 현재 백엔드의 acomplete() 실행"""
+    async with llm_slot():
+        return await get_llm_backend().acomplete(messages, **kwargs)
+
+
+# 실행 확인용
+if __name__ == "__main__":
+    print("[llm_backend.py] 모듈이 정상적으로 로드되었습니다.")
@@ -0,0 +1,372 @@
+# app/services/map_layer_service.py
+
+import os
+import gzip
+import json
+import zlib
+import threading
+from collections import namedtuple
+import numpy as np
+from sqlalchemy import select
+from app.utils.database import read_engine
+from app.utils.models import RegionData, TOPIC_COLUMNS
+from app.utils.regions import normalize_region_key
+from app.utils.data_version import get_data_version, current_data_version
+from app.utils.fast_json import dumps
+from app.services.concurrency import run_cpu
+from app.services.vector_service import BASE_PATH
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip 사전 압축본만 생성
+    brotli = None
+
+"""
+map_layer_service.py
+지도 첫 화면용 GeoJSON 레이어를 미리 만들어 두는 서비스입니다.
+- 지역별 gap·주제 점수를 feature properties 에 포함 (프론트엔드 클라이언트 조인 불필요)
+- 형상: MAP_GEOMETRY_PATH(GeoJSON, 시도 경계) 가 있으면 폴리곤, 없으면 REGION_CENTROIDS 대표 좌표(Point)
+- 단순화 레벨: MAP_SIMPLIFY_LEVELS (Douglas-Peucker 허용 오차, 도 단위) + 좌표 소수점 MAP_COORD_PRECISION 자리 양자화
+- 레이어 토큰은 지역 점수 행 해시 + 형상 파일 mtime → 점수·형상이 바뀔 때만 재생성
+  (data_version 은 행을 다시 확인할 시점만 알려줌, rag_summary 변경 등으로 버전이 올라도 행이 같으면 유지)
+- 레벨별 원본/gzip/br 바이트를 메모리와 MAP_OUTPUT_DIR 에 저장 (재시작 시 토큰이 같으면 파일 재사용)
+  결과가 같은 레벨(폴리곤 없이 대표 좌표만 쓰는 경우 전 레벨)은 한 벌만 저장해 공유
+"""
+
+MAP_GEOMETRY_PATH = os.getenv("MAP_GEOMETRY_PATH", os.path.join(BASE_PATH, "regions.geojson"))
+MAP_OUTPUT_DIR = os.getenv("MAP_OUTPUT_DIR", os.path.join("output", "map_layer"))
+MAP_COORD_PRECISION = int(os.getenv("MAP_COORD_PRECISION", "4"))  # 소수점 4자리 ≈ 11m
+
+
+def _parse_levels(value: str) -> dict:
+    levels = {}
+    for part in value.split(","):
+        name, _, tolerance = part.partition(":")
+        if name.strip():
+            levels[name.strip()] = float(tolerance or 0)
+    return levels
+
+
+# 레벨명: Douglas-Peucker 허용 오차(도), 0 이면 단순화 없음
+MAP_SIMPLIFY_LEVELS = _parse_levels(os.getenv("MAP_SIMPLIFY_LEVELS", "full:0,medium:0.005,low:0.02"))
+DEFAULT_MAP_LEVEL = os.getenv("MAP_DEFAULT_LEVEL", "medium")
+
+# 형상 파일이 없을 때 사용하는 시도 대표 좌표 (경도, 위도)
+REGION_CENTROIDS = {
+    "서울": (126.978, 37.5665),
+    "부산": (129.075, 35.1796),
+    "대구": (128.6014, 35.8714),
+    "인천": (126.7052, 37.4563),
+    "광주": (126.8526, 35.1595),
+    "대전": (127.3845, 36.3504),
+    "울산": (129.3114, 35.5384),
+    "세종": (127.289, 36.48),
+    "경기": (127.2, 37.4),
+    "강원": (128.3, 37.75),
+    "충북": (127.7, 36.8),
+    "충남": (126.8, 36.5),
+    "전북": (127.15, 35.72),
+    "전남": (126.9, 34.85),
+    "경북": (128.75, 36.35),
+    "경남": (128.25, 35.35),
+    "제주": (126.55, 33.38),
+}
+
+# 형상 파일 feature 에서 지역명을 찾을 속성 후보 (통계청·행안부 시도 경계 파일 포함)
+GEOMETRY_NAME_PROPERTIES = ("region_name", "region", "name", "CTP_KOR_NM", "CTPRVN_NM", "sidonm", "NAME_1")
+
+MAP_MEDIA_TYPE = "application/geo+json"
+
+MapLayer = namedtuple("MapLayer", ["token", "level", "etag", "last_modified", "bodies"])
+
+_layers: dict = {}
+_layer_state = {"version": None}  # 마지막으로 점수 행을 확인한 data_version (같으면 DB 조회 생략)
+_build_lock = threading.Lock()
+_geometry_cache = {"mtime": None, "features": {}}
+
+
+# =========================================================
+# 1. 형상 로드 / 단순화
+# =========================================================
+def _geometry_mtime() -> float | None:
+    return os.path.getmtime(MAP_GEOMETRY_PATH) if os.path.exists(MAP_GEOMETRY_PATH) else None
+
+
+def load_region_geometries() -> dict:
+    """{지역 키: GeoJSON geometry} (형상 파일이 없으면 빈 dict, 파일 mtime 기준 캐시)"""
+    mtime = _geometry_mtime()
+    if mtime is None:
+        return {}
+    if _geometry_cache["mtime"] == mtime:
+        return _geometry_cache["features"]
+
+    with open(MAP_GEOMETRY_PATH, "r", encoding="utf-8") as f:
+        collection = json.load(f)
+
+    features = {}
+    for feature in collection.get("features", []):
+        props = feature.get("properties") or {}
+        name = next((props[p] for p in GEOMETRY_NAME_PROPERTIES if props.get(p)), None)
+        if name and feature.get("geometry"):
+            features[normalize_region_key(str(name))] = feature["geometry"]
+    print(f"[map_layer] 지역 형상 {len(features)}개 로드: {MAP_GEOMETRY_PATH}")
+
+    _geometry_cache.update(mtime=mtime, features=features)
+    return features
+
+
+def simplify_line(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Douglas-Peucker 단순화 (재귀 대신 스택, 구간별 거리 계산은 벡터화)"""
+    if tolerance <= 0 or len(points) <= 2:
+        return points
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end <= start + 1:
+            continue
+        a, b = points[start], points[end]
+        segment = points[start + 1:end]
+        ab = b - a
+        length = np.hypot(ab[0], ab[1])
+        if length == 0:
+            distances = np.hypot(segment[:, 0] - a[0], segment[:, 1] - a[1])
+        else:
+            distances = np.abs(ab[0] * (segment[:, 1] - a[1]) - ab[1] * (segment[:, 0] - a[0])) / length
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
+
+
+def _simplify_ring(ring, tolerance: float, precision: int, closed: bool):
+    points = np.asarray(ring, dtype=float)[:, :2]
+    simplified = simplify_line(points, tolerance)
+    # 폴리곤 링은 최소 4점(닫힌 삼각형) 유지, 너무 줄면 원본 사용
+    if closed and len(simplified) < 4:
+        simplified = points
+    return np.round(simplified, precision).tolist()
+
+
+def simplify_geometry(geometry: dict, tolerance: float, precision: int = MAP_COORD_PRECISION) -> dict:
+    """GeoJSON geometry 단순화 + 좌표 양자화 (Point/LineString/Polygon/Multi* 지원)"""
+    kind, coords = geometry.get("type"), geometry.get("coordinates")
+    if kind == "Point":
+        return {"type": kind, "coordinates": np.round(np.asarray(coords, dtype=float)[:2], precision).tolist()}
+    if kind == "MultiPoint":
+        return {"type": kind, "coordinates": np.round(np.asarray(coords, dtype=float)[:, :2], precision).tolist()}
+    if kind == "LineString":
+        return {"type": kind, "coordinates": _simplify_ring(coords, tolerance, precision, closed=False)}
+    if kind == "MultiLineString":
+        return {"type": kind, "coordinates": [_simplify_ring(line, tolerance, precision, closed=False) for line in coords]}
+    if kind == "Polygon":
+        return {"type": kind, "coordinates": [_simplify_ring(ring, tolerance, precision, closed=True) for ring in coords]}
+    if kind == "MultiPolygon":
+        return {
+            "type": kind,
+            "coordinates": [
+                [_simplify_ring(ring, tolerance, precision, closed=True) for ring in polygon]
+                for polygon in coords
+            ],
+        }
+    if kind == "GeometryCollection":
+        return {
+            "type": kind,
+            "geometries": [simplify_geometry(g, tolerance, precision) for g in geometry.get("geometries", [])],
+        }
+    return geometry
+
+
+# =========================================================
+# 2. 레이어 생성
+# =========================================================
+def _load_region_rows() -> list:
+    columns = [RegionData.region_name, RegionData.policy_avg_score, RegionData.sentiment_avg_score,
+               RegionData.gap_score]
+    for cols in TOPIC_COLUMNS.values():
+        columns += [getattr(RegionData, cols["policy"]), getattr(RegionData, cols["sentiment"]),
+                    getattr(RegionData, cols["gap"])]
+    with read_engine.connect() as conn:
+        return [dict(row) for row in conn.execute(select(*columns).order_by(RegionData.id)).mappings()]
+
+
+def region_properties(row: dict) -> dict:
+    """지도 스타일링용 평탄한 properties (주제별 {topic}_policy / _sentiment / _gap)"""
+    props = {
+        "region_name": row["region_name"],
+        "policy_score": row["policy_avg_score"],
+        "sentiment_score": row["sentiment_avg_score"],
+        "gap_score": row["gap_score"],
+    }
+    top_topic, top_gap = None, None
+    for topic, cols in TOPIC_COLUMNS.items():
+        gap = row[cols["gap"]]
+        props[f"{topic}_policy"] = row[cols["policy"]]
+        props[f"{topic}_sentiment"] = row[cols["sentiment"]]
+        props[f"{topic}_gap"] = gap
+        if gap is not None and (top_gap is None or gap > top_gap):
+            top_topic, top_gap = topic, gap
+    props["top_gap_topic"] = top_topic
+    props["top_gap_topic_label"] = TOPIC_COLUMNS[top_topic]["label"] if top_topic else None
+    return props
+
+
+def build_feature_collection(rows: list, geometries: dict, tolerance: float) -> dict:
+    features = []
+    for row in rows:
+        key = normalize_region_key(row["region_name"])
+        if key in geometries:
+            geometry, source = simplify_geometry(geometries[key], tolerance), "polygon"
+        elif key in REGION_CENTROIDS:
+            geometry, source = simplify_geometry({"type": "Point", "coordinates": REGION_CENTROIDS[key]}, 0), "centroid"
+        else:
+            geometry, source = None, None
+        properties = region_properties(row)
+        properties["geometry_source"] = source
+        features.append({"type": "Feature", "id": key, "geometry": geometry, "properties": properties})
+    return {"type": "FeatureCollection", "features": features}
+
+
+def _compress(body: bytes) -> dict:
+    """사전 압축본 (요청마다 압축하지 않도록 최고 압축률로 한 번만 생성)"""
+    bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        bodies["br"] = brotli.compress(body, quality=11)
+    return bodies
+
+
+_FILE_SUFFIX = {"identity": "", "gzip": ".gz", "br": ".br"}
+
+
+def _layer_path(level: str, encoding: str) -> str:
+    return os.path.join(MAP_OUTPUT_DIR, f"{level}.geojson{_FILE_SUFFIX[encoding]}")
+
+
+def _manifest_path() -> str:
+    return os.path.join(MAP_OUTPUT_DIR, "manifest.json")
+
+
+def layer_content_token(rows: list) -> str:
+    """지도에 들어가는 지역 점수 행 + 형상 파일 mtime 기준 토큰 (rag_summary 처럼 지도와 무관한 변경에는 그대로)"""
+    return f"{zlib.crc32(dumps(rows)):08x}.{int(_geometry_mtime() or 0)}"
+
+
+def _level_groups(rows: list, geometries: dict) -> dict:
+    """
+    {대표 레벨: [같은 바이트가 나오는 레벨들]}
+    - 폴리곤 형상을 쓰는 지역이 없으면(대표 좌표 Point 만) 단순화 결과가 모두 같으므로 한 벌만 생성
+    - 허용 오차가 같은 레벨도 한 벌로 공유
+    """
+    uses_polygons = any(normalize_region_key(row["region_name"]) in geometries for row in rows)
+    representatives, groups = {}, {}
+    for level, tolerance in MAP_SIMPLIFY_LEVELS.items():
+        first = representatives.setdefault(tolerance if uses_polygons else 0, level)
+        groups.setdefault(first, []).append(level)
+    return groups
+
+
+def _write_layers(token: str, layers: dict):
+    os.makedirs(MAP_OUTPUT_DIR, exist_ok=True)
+    # 바이트를 공유하는 레벨은 첫 레벨 이름의 파일 한 벌만 저장
+    sources = {}
+    for level, layer in layers.items():
+        sources.setdefault(id(layer.bodies), level)
+    manifest_levels = {level: sources[id(layer.bodies)] for level, layer in layers.items()}
+
+    for level, source in manifest_levels.items():
+        for encoding in _FILE_SUFFIX:
+            path = _layer_path(level, encoding)
+            body = layers[level].bodies.get(encoding)
+            if level == source and body is not None:
+                with open(path + ".tmp", "wb") as f:
+                    f.write(body)
+                os.replace(path + ".tmp", path)
+            elif os.path.exists(path):
+                os.remove(path)  # 공유 레벨로 바뀌었거나 더 이상 만들지 않는 인코딩의 이전 파일 정리
+    with open(_manifest_path(), "w", encoding="utf-8") as f:
+        json.dump({"token": token, "levels": manifest_levels}, f)
+
+
+def _read_layers(token: str, info) -> dict | None:
+    """MAP_OUTPUT_DIR 의 사전 생성본이 현재 토큰과 같으면 재사용 (서버 재시작 시)"""
+    try:
+        with open(_manifest_path(), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        levels = manifest.get("levels")
+        if manifest.get("token") != token or not isinstance(levels, dict) or set(levels) != set(MAP_SIMPLIFY_LEVELS):
+            return None
+        stored, layers = {}, {}
+        for level, source in levels.items():
+            if source not in stored:
+                bodies = {}
+                for encoding in _FILE_SUFFIX:
+                    if os.path.exists(_layer_path(source, encoding)):
+                        with open(_layer_path(source, encoding), "rb") as f:
+                            bodies[encoding] = f.read()
+                if "identity" not in bodies:
+                    return None
+                stored[source] = bodies
+            layers[level] = MapLayer(token, level, f'"map-{token}-{source}"', info.last_modified, stored[source])
+        return layers
+    except (OSError, ValueError):
+        return None
+
+
+def _version_key(info) -> str:
+    return f"{info.token}.{int(_geometry_mtime() or 0)}"
+
+
+def rebuild_map_layers(info) -> dict:
+    """
+    점수 행이 바뀐 경우에만 모든 레벨을 생성·압축·저장 (CPU 작업, 동시에 호출되면 한 번만 생성)
+    - data_version 이 바뀌어도 지도에 들어가는 행이 같으면 기존 레이어(ETag 포함) 유지
+    """
+    version = _version_key(info)
+    with _build_lock:
+        if _layer_state["version"] == version and set(_layers) == set(MAP_SIMPLIFY_LEVELS):
+            return dict(_layers)
+
+        rows = _load_region_rows()
+        token = layer_content_token(rows)
+        if set(_layers) != set(MAP_SIMPLIFY_LEVELS) or any(layer.token != token for layer in _layers.values()):
+            layers = _read_layers(token, info)
+            if layers is None:
+                geometries = load_region_geometries()
+                layers, sizes = {}, []
+                for source, levels in _level_groups(rows, geometries).items():
+                    body = dumps(build_feature_collection(rows, geometries, MAP_SIMPLIFY_LEVELS[source]))
+                    bodies = _compress(body)
+                    for level in levels:
+                        layers[level] = MapLayer(token, level, f'"map-{token}-{source}"', info.last_modified, bodies)
+                    sizes.append(f"{'/'.join(levels)}={len(body)}B/gz {len(bodies['gzip'])}B")
+                _write_layers(token, layers)
+                print(f"[map_layer] 지도 레이어 재생성 ({len(rows)}개 지역, {', '.join(sizes)})")
+            _layers.clear()
+            _layers.update(layers)
+
+        _layer_state["version"] = version
+        return dict(_layers)
+
+
+def refresh_map_layers() -> dict:
+    """현재 데이터 버전 기준으로 모든 레벨을 미리 생성 (스케줄러 등 동기 코드용)"""
+    return rebuild_map_layers(current_data_version())
+
+
+async def get_map_layer(level: str = DEFAULT_MAP_LEVEL) -> MapLayer:
+    """현재 데이터의 레이어 반환 (데이터 버전이 바뀌면 점수 행을 확인해 달라진 경우에만 재생성)"""
+    if level not in MAP_SIMPLIFY_LEVELS:
+        raise ValueError(f"지원하지 않는 level 입니다: {level} (가능: {', '.join(MAP_SIMPLIFY_LEVELS)})")
+
+    info = await get_data_version()
+    layer = _layers.get(level)
+    if layer is not None and _layer_state["version"] == _version_key(info):
+        return layer
+
+    layers = await run_cpu(rebuild_map_layers, info)
+    return layers[level]
@@ -1,9 +1,11 @@
 # app/services/model_connector.py
 
-import requests
+import os
+import asyncio
 from datetime import datetime
 from sqlalchemy.orm import Session
-from app.services.rag_service import save_rag_summary
+from app.services.rag_service import save_rag_summary, save_rag_summaries
+from app.services.http_client import get_http_client, get_async_http_client, new_async_http_client
 
 """
 model_connector.py
@@ -12,7 +14,14 @@ model_connector.py
 """
 
 # 예시용 AI 서버 엔드포인트 (실제 API URL로 교체 필요)
-AI_API_URL = "http://127.0.0.1:5000/api/generate_summary"
+AI_API_URL = os.getenv("AI_API_URL", "http://127.0.0.1:5000/api/generate_summary")
+AI_BATCH_API_URL = os.getenv("AI_BATCH_API_URL", "http://127.0.0.1:5000/api/generate_summary_batch")
+
+# 배치 요청 설정: 한 번에 보낼 항목 수 / 동시에 보낼 배치 수
+MODEL_BATCH_SIZE = int(os.getenv("MODEL_BATCH_SIZE", "32"))
+MODEL_MAX_CONCURRENCY = int(os.getenv("MODEL_MAX_CONCURRENCY", "8"))
+
+FAILED_SUMMARY = "요약 생성 실패"
 
 
 def request_summary_from_model(region_name: str, topic: str, text: str) -> str:
@@ -29,7 +38,7 @@ def request_summary_from_model(region_name: str, topic: str, text: str) -> str:
             "text": text
         }
 
-        response = requests.post(AI_API_URL, json=payload, timeout=30)
+        response = get_http_client().post(AI_API_URL, json=payload)
         response.raise_for_status()
 
         data = response.json()
@@ -39,7 +48,7 @@ def request_summary_from_model(region_name: str, topic: str, text: str) -> str:
 
     except Exception as e:
         print(f"[model_connector] 모델 요청 중 오류 발생: {e}")
-        return "요약 생성 실패"
+        return FAILED_SUMMARY
 
 
 def generate_and_save_summary(db: Session, region_name: str, topic: str, text: str):
@@ -47,10 +56,88 @@ def generate_and_save_summary(db: Session, region_name: str, topic: str, text: s
     외부 AI 모델에서 요약을 생성하고 RAG Summary 테이블에 저장
     """
     summary = request_summary_from_model(region_name, topic, text)
+    if summary == FAILED_SUMMARY:
+        # 실패 문구로 기존 요약을 덮어쓰지 않음
+        print(f"[model_connector] {region_name} 지역의 '{topic}' 요약 생성 실패 → 저장 건너뜀")
+        return
     save_rag_summary(db, region_name, topic, summary)
     print(f"[model_connector] {region_name} 지역의 '{topic}' 요약이 DB에 저장되었습니다.")
 
 
+# =========================================================
+# 배치 요약 (async, 커넥션 풀 재사용)
+# =========================================================
+async def _request_batch(client, batch: list, semaphore: asyncio.Semaphore) -> list:
+    """배치 하나를 /api/generate_summary_batch 로 전송, 실패 시 항목별 실패 문구 반환"""
+    async with semaphore:
+        try:
+            response = await client.post(AI_BATCH_API_URL, json={"items": batch})
+            response.raise_for_status()
+            summaries = response.json().get("summaries", [])
+            if len(summaries) != len(batch):
+                raise ValueError(f"응답 개수 불일치 (요청 {len(batch)}, 응답 {len(summaries)})")
+            return [s.get("summary", "") for s in summaries]
+        except Exception as e:
+            print(f"[model_connector] 배치 요청 중 오류 발생 ({len(batch)}건): {e}")
+            return [FAILED_SUMMARY] * len(batch)
+
+
+async def request_summaries_from_model_async(items: list, client=None) -> list:
+    """
+    (region_name, topic, text) 목록을 배치로 나눠 동시에 요약 요청
+    - 반환: items 와 같은 순서의 요약 문자열 리스트
+    """
+    client = client or get_async_http_client()
+    payload = [
+        {"region_name": region_name, "topic": topic, "text": text}
+        for region_name, topic, text in items
+    ]
+    batches = [payload[i:i + MODEL_BATCH_SIZE] for i in range(0, len(payload), MODEL_BATCH_SIZE)]
+    semaphore = asyncio.Semaphore(MODEL_MAX_CONCURRENCY)
+
+    results = await asyncio.gather(*[_request_batch(client, b, semaphore) for b in batches])
+    return [summary for batch_result in results for summary in batch_result]
+
+
+async def generate_and_save_summaries_async(db: Session, items: list) -> dict:
+    """이벤트 루프 안(FastAPI 등)에서 사용하는 bulk 요약 생성 + 단일 트랜잭션 저장"""
+    summaries = await request_summaries_from_model_async(items)
+    return _save_summaries(db, items, summaries)
+
+
+def generate_and_save_summaries(db: Session, items: list) -> dict:
+    """
+    여러 (region_name, topic, text) 항목을 동시에 요약하고 한 번의 트랜잭션으로 저장
+    - 스크립트 등 이벤트 루프 밖에서 호출하는 동기 버전
+    """
+    async def _run():
+        async with new_async_http_client() as client:
+            return await request_summaries_from_model_async(items, client=client)
+
+    started = datetime.now()
+    summaries = asyncio.run(_run())
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"[model_connector] {len(items)}건 요약 수신 완료 ({elapsed:.2f}s)")
+    return _save_summaries(db, items, summaries)
+
+
+def _save_summaries(db: Session, items: list, summaries: list) -> dict:
+    """
+    수신한 요약을 저장하고 실패 항목은 따로 반환
+    - 실패 문구로 기존 정상 요약을 덮어쓰지 않도록 FAILED_SUMMARY 항목은 저장에서 제외
+    """
+    rows, failed_items = [], []
+    for (region_name, topic, _), summary in zip(items, summaries):
+        if summary == FAILED_SUMMARY:
+            failed_items.append({"region_name": region_name, "topic": topic})
+        else:
+            rows.append({"region_name": region_name, "topic": topic, "summary": summary})
+
+    result = save_rag_summaries(db, rows)
+    print(f"[model_connector] {len(rows)}건 요약 저장 완료 (실패 {len(failed_items)}건은 저장 제외)")
+    return {**result, "failed": len(failed_items), "failed_items": failed_items}
+
+
 # 실행 확인용
 if __name__ == "__main__":
     print("[model_connector.py] 모듈이 정상적으로 로드되었습니다.")
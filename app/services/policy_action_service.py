@@ -0,0 +1,318 @@
+# app/services/policy_action_service.py
+
+import os
+import json
+from collections import namedtuple
+import numpy as np
+from app.services.vector_service import (
+    BASE_PATH,
+    load_policy_vectors,
+    aggregate_topic_vectors,
+)
+from app.services.reference_data import get_reference_snapshot
+from app.services.llm_backend import complete_async, TASK_ACTION
+from app.services.concurrency import run_cpu, iter_completed
+
+"""
+policy_action_service.py
+LLM + RAG 기반 정책 개선 제안 로직입니다. (rag_action_router 에서 분리)
+- 벡터 파일 로드·유사도 계산은 CPU 전용 스레드풀(run_cpu)에서 실행
+- LLM 호출은 complete_async (동시 호출 한도 적용)
+- 지역 벡터를 찾지 못하면 LookupError (→ 404)
+- 벡터 파일·gap CSV 는 reference_data 스냅샷에 한 번만 로드(load_action_dataset)해 요청 간 공유
+- 여러 지역의 지역 간·정책 유사도는 행렬곱 한 번으로 계산 (build_action_contexts)
+"""
+
+REGION_VECTOR_SUFFIX = "_vectors_e5.json"
+
+
+def safe_load_region_vectors(region_name: str):
+    """다양한 파일명 패턴으로 지역 벡터 JSON 로드"""
+    candidates = [
+        os.path.join(BASE_PATH, f"{region_name}{REGION_VECTOR_SUFFIX}"),
+        os.path.join(BASE_PATH, f"{region_name}_vectors.json"),
+        os.path.join(BASE_PATH, f"{region_name}.json"),
+        os.path.join(BASE_PATH, f"{region_name.lower()}{REGION_VECTOR_SUFFIX}"),
+        os.path.join(BASE_PATH, f"{region_name.capitalize()}{REGION_VECTOR_SUFFIX}"),
+    ]
+    for path in candidates:
+        if os.path.exists(path):
+            print(f"[policy_action] ✅ 지역 벡터 로드 완료: {path}")
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+    raise FileNotFoundError(f"⚠️ {region_name} 지역 벡터 파일을 찾을 수 없습니다.")
+
+
+def load_topic_vectors(region_name: str) -> dict:
+    """지역 벡터 로드 후 주제별 dict 로 정리"""
+    raw = safe_load_region_vectors(region_name)
+    return aggregate_topic_vectors(raw) if isinstance(raw, list) else raw
+
+
+def topic_key_candidates(topic_info: dict) -> list:
+    """유연한 키 매칭용 후보 (띄어쓰기, 대소문자, 한글/영문 모두 대응)"""
+    return [
+        topic_info.get("topic_en").replace(" ", "").lower(),
+        topic_info.get("topic").replace(" ", "").lower(),
+    ]
+
+
+def match_topic_key(topic_vectors: dict, candidates: list) -> str | None:
+    normalized_keys = {k.replace(" ", "").lower(): k for k in topic_vectors.keys()}
+    for cand in candidates:
+        if cand in normalized_keys:
+            return normalized_keys[cand]
+    return None
+
+
+def list_vector_regions() -> list:
+    return sorted(
+        file[: -len(REGION_VECTOR_SUFFIX)]
+        for file in os.listdir(BASE_PATH)
+        if file.endswith(REGION_VECTOR_SUFFIX)
+    )
+
+
+# 주제 벡터가 있는 전체 지역, 단위 벡터로 정규화한 정책 행렬, gap 테이블
+ActionDataset = namedtuple("ActionDataset", ["topic_vectors", "policy_names", "policy_matrix", "gap_engine"])
+
+
+def _unit_rows(vectors) -> np.ndarray:
+    """행 단위 L2 정규화 (영벡터는 0 유지 → 유사도 0)"""
+    matrix = np.asarray(vectors, dtype=float)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _policy_entries(policy_vectors_raw) -> list:
+    """정책 벡터 JSON(list 또는 dict) → (정책명, 벡터) 목록"""
+    if isinstance(policy_vectors_raw, list):
+        return [
+            (entry.get("policy_name") or entry.get("title") or "Unknown Policy", entry.get("vector"))
+            for entry in policy_vectors_raw
+            if entry.get("vector")
+        ]
+    if isinstance(policy_vectors_raw, dict):
+        return list(policy_vectors_raw.items())
+    return []
+
+
+def load_action_dataset(gap_engine) -> ActionDataset:
+    """정책 액션 계산에 필요한 공유 데이터 로드 (reference_data 스냅샷 생성 시 한 번)"""
+    topic_vectors = {}
+    for region in list_vector_regions():
+        try:
+            topic_vectors[region] = load_topic_vectors(region)
+        except Exception as e:
+            print(f"[policy_action] ⚠️ {region} 지역 벡터 로드 실패: {e}")
+
+    entries = _policy_entries(load_policy_vectors())
+    policy_matrix = _unit_rows([vec for _, vec in entries]) if entries else np.empty((0, 0))
+    return ActionDataset(topic_vectors, [name for name, _ in entries], policy_matrix, gap_engine)
+
+
+def _select_topic(dataset: ActionDataset, region_name: str) -> tuple:
+    """gap 이 가장 큰 주제의 (벡터 키, 매칭 후보) 반환"""
+    if region_name not in dataset.topic_vectors:
+        raise FileNotFoundError(f"⚠️ {region_name} 지역 벡터 파일을 찾을 수 없습니다.")
+    region_vectors = dataset.topic_vectors[region_name]
+    top_topic_info = dataset.gap_engine.top_topics(region_name, top_k=1)[0]
+    candidates = topic_key_candidates(top_topic_info)
+    top_topic = match_topic_key(region_vectors, candidates)
+    if not top_topic:
+        raise KeyError(
+            f"'{top_topic_info.get('topic_en')}' 또는 '{top_topic_info.get('topic')}' "
+            f"주제를 region_vectors에서 찾을 수 없습니다."
+        )
+    return top_topic, candidates
+
+
+def _top_k(names: list, scores: np.ndarray, top_k: int) -> list:
+    order = np.argsort(-scores, kind="stable")[:top_k]
+    return [(names[i], float(scores[i])) for i in order]
+
+
+def build_action_contexts(region_names: list, dataset: ActionDataset, top_k: int = 3) -> dict:
+    """
+    여러 지역의 프롬프트 컨텍스트를 한 번에 계산 (CPU 작업, run_cpu 로 실행)
+    - 반환: {지역명: context dict 또는 예외}
+    - 지역 간 유사도: 같은 주제 후보끼리 묶어 (질의 지역 × 전체 지역) 행렬곱 한 번
+    - 정책 유사도: (질의 지역 × 정책) 행렬곱 한 번
+    """
+    results, selected = {}, {}
+
+    # 1️⃣ 지역별 핵심 주제 선택
+    for region in region_names:
+        try:
+            selected[region] = _select_topic(dataset, region)
+        except Exception as e:
+            results[region] = LookupError(f"{region} 지역 벡터를 불러오지 못했습니다: {e}")
+    if not selected:
+        return results
+
+    queries = list(selected)
+    query_matrix = _unit_rows([
+        dataset.topic_vectors[region][selected[region][0]]["vector"] for region in queries
+    ])
+    related = {}
+
+    # 2️⃣ Cross-Region 비교 (주제 후보가 같은 지역끼리 묶어서 계산)
+    try:
+        groups = {}
+        for row, region in enumerate(queries):
+            groups.setdefault(tuple(selected[region][1]), []).append(row)
+
+        for candidates, rows in groups.items():
+            others, other_vectors = [], []
+            for other_region, vectors in dataset.topic_vectors.items():
+                matched_key = match_topic_key(vectors, list(candidates))
+                if matched_key:
+                    others.append(other_region)
+                    other_vectors.append(vectors[matched_key]["vector"])
+            scores = query_matrix[rows] @ _unit_rows(other_vectors).T if others else np.empty((len(rows), 0))
+
+            for score_row, row in zip(scores, rows):
+                region = queries[row]
+                mask = np.array([other != region for other in others], dtype=bool)
+                related[region] = _top_k([o for o, keep in zip(others, mask) if keep], score_row[mask], top_k)
+    except Exception as e:
+        error = RuntimeError(f"다른 지역 정책 비교 중 오류 발생: {e}")
+        return {**results, **{region: error for region in queries}}
+
+    # 3️⃣ 정책 벡터 유사도 계산
+    try:
+        if dataset.policy_names:
+            policy_scores = query_matrix @ dataset.policy_matrix.T
+        else:
+            policy_scores = np.empty((len(queries), 0))
+    except Exception as e:
+        error = RuntimeError(f"정책 벡터 비교 중 오류 발생: {e}")
+        return {**results, **{region: error for region in queries}}
+
+    for row, region in enumerate(queries):
+        results[region] = {
+            "region": region,
+            "main_topic": selected[region][0],
+            "related_regions": related[region],
+            "similar_policies": _top_k(dataset.policy_names, policy_scores[row], top_k),
+        }
+    return results
+
+
+def get_action_dataset() -> ActionDataset:
+    """현재 참조 스냅샷의 정책 액션 데이터 (벡터 로드에 실패한 스냅샷이면 LookupError)"""
+    dataset = get_reference_snapshot().action_dataset
+    if dataset is None:
+        raise LookupError("정책·지역 벡터 데이터가 로드되지 않았습니다. 벡터 파일 확인 후 참조 데이터를 다시 로드하세요.")
+    return dataset
+
+
+def build_action_context(region_name: str) -> dict:
+    """단일 지역 컨텍스트 (CPU 작업, run_cpu 로 실행)"""
+    dataset = get_action_dataset()
+    context = build_action_contexts([region_name], dataset)[region_name]
+    if isinstance(context, Exception):
+        raise context
+    return context
+
+
+def build_action_prompt(context: dict) -> str:
+    region_name = context["region"]
+    region_refs = "\n".join(
+        [f"- {r} 지역 (유사도 {round(s,3)})" for r, s in context["related_regions"]]
+    )
+    policy_refs = "\n".join(
+        [f"[참고 정책 {i+1}] {name}" for i, (name, _) in enumerate(context["similar_policies"])]
+    )
+
+    return f"""
+=== 역할 정의 ===
+너는 'Welling' 프로젝트의 AI 정책 분석 엔진이다.
+너의 임무는 제공된 [지역 정보], [다른 지역의 유사 정책], [참고 정책 문서]를 바탕으로
+'{region_name}' 지역의 실행 가능한 정책 개선 액션을 생성하는 것이다.
+
+=== 입력 1: 지역 정보 ===
+[지역명: {region_name}]
+[핵심 주제: {context["main_topic"]}]
+
+=== 입력 2: 다른 지역의 동일 주제 유사도 상위 3개 ===
+{region_refs}
+
+=== 입력 3: 참고 정책 문서 (RAG 검색 결과) ===
+{policy_refs}
+
+=== 지시 사항 ===
+1. 다른 지역의 정책 성공 요인을 분석하고, {region_name} 지역에 맞는 개선 방안을 제안하라.
+2. [다른 지역]과 [정책 문서]를 근거로 한 실행 가능한 "rag_action_card"를 1~2줄로 작성하라.
+3. 반드시 아래 JSON 형식으로만 반환하라.
+
+=== 출력 형식 (JSON만 반환) ===
+{{
+  "rag_action_card": "(AI가 생성한 정책 제언)",
+  "reference_regions": ["지역명1", "지역명2", "지역명3"],
+  "reference_policies": ["정책명1", "정책명2", "정책명3"]
+}}
+"""
+
+
+async def request_policy_action(context: dict) -> dict:
+    """LLM 정책 액션 요청 후 응답 dict 구성"""
+    content = await complete_async(
+        [
+            {"role": "system", "content": "너는 지역정책 분석 및 기획 전문가이다."},
+            {"role": "user", "content": build_action_prompt(context)},
+        ],
+        task=TASK_ACTION,
+        temperature=0.7,
+        json_mode=True,
+    )
+    result_json = json.loads(content)
+    print(f"[policy_action] ✅ '{context['region']}' 지역 '{context['main_topic']}' 정책 액션 제안 완료")
+
+    return {
+        "region": context["region"],
+        "main_topic": context["main_topic"],
+        "related_regions": [
+            {"region_name": r, "similarity": round(s, 3)} for r, s in context["related_regions"]
+        ],
+        "similar_policies": [
+            {"policy_name": p[0], "similarity": round(p[1], 3)} for p in context["similar_policies"]
+        ],
+        "result": result_json,
+    }
+
+
+async def recommend_policy_action(region_name: str) -> dict:
+    """벡터 검색(CPU 스레드풀) → LLM 정책 액션 제안"""
+    context = await run_cpu(build_action_context, region_name)
+    return await request_policy_action(context)
+
+
+def _prepare_batch(region_names: list) -> dict:
+    dataset = get_action_dataset()
+    return build_action_contexts(region_names or list(dataset.topic_vectors), dataset)
+
+
+async def iter_policy_actions(region_names: list):
+    """
+    여러 지역의 정책 액션을 동시에 생성하고 끝나는 순서대로 (지역명, 결과, 예외) yield
+    - region_names 가 비어 있으면 벡터 파일이 있는 전체 지역
+    """
+    try:
+        contexts = await run_cpu(_prepare_batch, region_names)
+    except Exception as e:
+        # 공유 데이터(정책 벡터·gap CSV) 로드 실패 → 모든 지역 실패
+        for region in region_names or ["*"]:
+            yield region, None, RuntimeError(f"정책 액션 데이터 로드 실패: {e}")
+        return
+
+    jobs = {}
+    for region, context in contexts.items():
+        if isinstance(context, Exception):
+            yield region, None, context
+        else:
+            jobs[region] = request_policy_action(context)
+
+    async for item in iter_completed(jobs):
+        yield item
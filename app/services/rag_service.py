@@ -3,24 +3,27 @@
 import json
 import numpy as np
 from datetime import datetime
-from openai import OpenAI
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from app.utils.models import RegionData, RagSummary
+from app.services.llm_backend import get_llm_backend
+from app.services.event_bus import publish_rag_summary
+from app.utils.regions import normalize_region_key
 
 """
 rag_service.py
 AI 모델로부터 받은 정책 요약(RAG 결과) 저장, 추천, 인사이트 분석을 통합 관리하는 서비스 로직입니다.
 """
 
-client = OpenAI()  # OPENAI_API_KEY 필요 (.env에 설정)
-
-
 # =========================================================
 # 1. 기본 RAG 요약 저장 로직
 # =========================================================
 def save_rag_summary(db: Session, region_name: str, topic: str, summary: str):
     """RAG 요약 결과를 저장하며 지역 정보를 자동 연동"""
     try:
+        # 여론 저장(save_sentiment_result)과 같은 지역 행을 쓰도록 정규화 ("부산광역시" → "부산")
+        region_name = normalize_region_key(region_name)
+
         # 지역 정보 조회 또는 신규 생성
         region = db.query(RegionData).filter(RegionData.region_name == region_name).first()
         if not region:
@@ -54,6 +57,7 @@ def save_rag_summary(db: Session, region_name: str, topic: str, summary: str):
         db.commit()
 
         print(f"[rag_service] '{region_name}' 지역의 '{topic}' 요약 저장 완료")
+        publish_rag_summary([{"region_name": region_name, "topic": topic, "summary": summary}])
         return {"status": "success", "region": region_name, "topic": topic}
 
     except Exception as e:
@@ -62,6 +66,68 @@ def save_rag_summary(db: Session, region_name: str, topic: str, summary: str):
         return {"status": "error", "message": str(e)}
 
 
+def save_rag_summaries(db: Session, rows: list):
+    """
+    여러 RAG 요약을 한 번의 트랜잭션으로 저장 (save_rag_summary 의 bulk 버전)
+    - rows: [{"region_name", "topic", "summary"}, ...]
+    - 지역 조회/생성, 기존 (region_id, topic) 삭제, 신규 삽입을 모두 set 단위로 처리
+    - 지역명은 save_rag_summary 와 같이 정규화된 키로 저장
+    """
+    if not rows:
+        return {"status": "empty", "saved": 0}
+
+    try:
+        now = datetime.utcnow()
+        rows = [{**r, "region_name": normalize_region_key(r["region_name"])} for r in rows]
+        names = {r["region_name"] for r in rows}
+        regions = {
+            r.region_name: r
+            for r in db.query(RegionData).filter(RegionData.region_name.in_(names)).all()
+        }
+
+        missing = names - regions.keys()
+        for name in missing:
+            print(f"[rag_service] {name} 지역이 존재하지 않아 새로 생성합니다.")
+            regions[name] = RegionData(
+                region_name=name,
+                policy_avg_score=0.0,
+                sentiment_avg_score=0.0,
+                gap_score=0.0,
+                updated_at=now,
+            )
+            db.add(regions[name])
+        if missing:
+            db.flush()  # 신규 지역 id 확보
+
+        # 동일 (지역, 주제) 요약은 마지막 항목만 유지
+        latest = {(regions[r["region_name"]].id, r["topic"]): r["summary"] for r in rows}
+
+        db.query(RagSummary).filter(
+            tuple_(RagSummary.region_id, RagSummary.topic).in_(list(latest.keys()))
+        ).delete(synchronize_session=False)
+
+        db.add_all([
+            RagSummary(region_id=region_id, topic=topic, summary=summary, created_at=now)
+            for (region_id, topic), summary in latest.items()
+        ])
+        for region in regions.values():
+            region.updated_at = now
+        db.commit()
+
+        print(f"[rag_service] {len(latest)}건 요약 일괄 저장 완료 ({len(regions)}개 지역)")
+        region_names = {region.id: name for name, region in regions.items()}
+        publish_rag_summary([
+            {"region_name": region_names[region_id], "topic": topic, "summary": summary}
+            for (region_id, topic), summary in latest.items()
+        ])
+        return {"status": "success", "saved": len(latest), "regions": len(regions)}
+
+    except Exception as e:
+        db.rollback()
+        print(f"[rag_service] 일괄 저장 중 오류 발생: {e}")
+        return {"status": "error", "message": str(e)}
+
+
 # =========================================================
 # 2. 벡터 로드 및 유사도 계산 유틸
 # =========================================================
@@ -133,15 +199,13 @@ def recommend_policies(region_name: str, topic: str, db: Session, top_k: int = 5
     )
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        recommendation = get_llm_backend().complete(
             messages=[
                 {"role": "system", "content": "당신은 사회정책 연구 전문가입니다."},
                 {"role": "user", "content": prompt},
             ],
             max_tokens=400,
         )
-        recommendation = response.choices[0].message.content.strip()
     except Exception as e:
         print(f"[RAG Recommend] ChatGPT 호출 실패: {e}")
         recommendation = "정책 제안 생성 실패"
@@ -196,14 +260,14 @@ def generate_rag_insight(region_name: str, topic: str, db: Session):
         f"{region_name} 시민들의 '{topic}' 관련 주요 의견을 다음 문장에서 요약하세요.\n\n"
         + "\n".join(top_opinions)
     )
-    citizen_summary = client.chat.completions.create(
-        model="gpt-4o-mini",
+    llm = get_llm_backend()
+    citizen_summary = llm.complete(
         messages=[
             {"role": "system", "content": "사회정책 전문가로서 시민 의견을 요약하세요."},
             {"role": "user", "content": citizen_prompt},
         ],
         max_tokens=300,
-    ).choices[0].message.content.strip()
+    )
 
     # 4️⃣ 유사 정책 검색
     policy_vectors = load_vectors("app/files/policy_vectors.json")
@@ -228,14 +292,13 @@ def generate_rag_insight(region_name: str, topic: str, db: Session):
         f"시민 불만 요약:\n{citizen_summary}\n\n"
         f"유사 정책 사례:\n" + "\n".join(top_policies)
     )
-    final_summary = client.chat.completions.create(
-        model="gpt-4o-mini",
+    final_summary = llm.complete(
         messages=[
             {"role": "system", "content": "정책분석가로서 개선 방향을 제시하세요."},
             {"role": "user", "content": final_prompt},
         ],
         max_tokens=400,
-    ).choices[0].message.content.strip()
+    )
 
     print(f"[RAG Insight] {region_name} / {topic} 결과 생성 완료")
 
@@ -0,0 +1,174 @@
+# app/services/reference_data.py
+
+import os
+import threading
+import itertools
+from datetime import datetime, timezone
+from types import MappingProxyType
+from collections import namedtuple
+import pandas as pd
+from app.services.vector_service import BASE_PATH, GAP_CSV_PATH
+from app.services.gap_engine import build_reference_gap_engine
+from app.services.concurrency import run_cpu
+from app.utils.data_version import add_version_listener
+
+"""
+reference_data.py
+참조 데이터셋(gap_score.csv, Welling_Master_dataset.csv, 정책/지역 벡터)의 불변 메모리 스냅샷입니다.
+- 서버 시작 시 한 번 로드, 요청 경로에서는 pd.read_csv·JSON 로드 없이 스냅샷만 조회
+- 지역·주제 단위 조회: gap_engine(지역 × 주제 행렬, 마스터 CSV 의 주제별 점수 포함), action_dataset(정책 액션 벡터)
+- 요청 경로에서 읽지 않는 데이터(Rag_Policy_dataset.csv 정책 문장 등)는 스냅샷에 싣지 않음
+- 재로드: 새 스냅샷을 CPU 스레드풀에서 끝까지 만든 뒤 참조 하나만 교체
+  → 요청은 항상 이전 또는 새 스냅샷 전체를 보며, 로드 실패 시 이전 스냅샷 유지
+- 다른 프로세스(스케줄러 사이드카 등)가 참조 파일을 교체하고 데이터 버전을 올리면,
+  버전 변경을 감지한 프로세스가 파일 mtime 을 스냅샷과 비교해 백그라운드에서 다시 로드
+"""
+
+MASTER_CSV_PATH = os.path.join(BASE_PATH, "Welling_Master_dataset.csv")
+POLICY_VECTORS_PATH = os.path.join(BASE_PATH, "policy_vectors.json")
+
+REFERENCE_FILES = {
+    "gap_score": GAP_CSV_PATH,
+    "master": MASTER_CSV_PATH,
+    "policy_vectors": POLICY_VECTORS_PATH,
+}
+
+ReferenceSnapshot = namedtuple(
+    "ReferenceSnapshot",
+    ["version", "loaded_at", "sources", "gap_engine", "action_dataset"],
+)
+
+_snapshot: ReferenceSnapshot | None = None
+_reload_lock = threading.Lock()
+_versions = itertools.count(1)
+_background = {"thread": None}
+_background_lock = threading.Lock()
+
+
+# =========================================================
+# 1. 스냅샷 생성 (CPU 작업)
+# =========================================================
+def _read_region_table(path: str, required: bool = False, **kwargs) -> pd.DataFrame | None:
+    if not os.path.exists(path):
+        if required:
+            raise FileNotFoundError(f"⚠️ {os.path.basename(path)} 파일이 없습니다: {path}")
+        print(f"[reference_data] ⚠️ {os.path.basename(path)} 파일이 없어 건너뜁니다.")
+        return None
+    df = pd.read_csv(path, **kwargs)
+    if "region" not in df.columns:
+        raise ValueError(f"⚠️ {os.path.basename(path)}에 'region' 컬럼이 없습니다.")
+    return df
+
+
+def _source_mtimes() -> dict:
+    return {
+        name: datetime.fromtimestamp(os.path.getmtime(path), timezone.utc).isoformat() if os.path.exists(path) else None
+        for name, path in REFERENCE_FILES.items()
+    }
+
+
+def build_reference_snapshot() -> ReferenceSnapshot:
+    """모든 참조 파일을 읽어 새 스냅샷 생성 (gap_score.csv 가 없거나 형식이 잘못되면 예외)"""
+    # 순환 import 방지 (policy_action_service 가 get_reference_snapshot 을 참조)
+    from app.services.policy_action_service import load_action_dataset
+
+    version = next(_versions)
+    sources = _source_mtimes()
+
+    gap_table = _read_region_table(GAP_CSV_PATH, required=True).drop_duplicates("region").set_index("region")
+    master = _read_region_table(MASTER_CSV_PATH)
+    if master is not None:
+        master = master.drop_duplicates("region").set_index("region")
+    gap_engine = build_reference_gap_engine(gap_table, master, version=version)
+
+    try:
+        action_dataset = load_action_dataset(gap_engine)
+        action_dataset.policy_matrix.setflags(write=False)
+    except Exception as e:
+        print(f"[reference_data] ⚠️ 정책 액션 벡터 로드 실패: {e}")
+        action_dataset = None
+
+    return ReferenceSnapshot(
+        version=version,
+        loaded_at=datetime.now(timezone.utc),
+        sources=MappingProxyType(sources),
+        gap_engine=gap_engine,
+        action_dataset=action_dataset,
+    )
+
+
+def load_reference_snapshot() -> ReferenceSnapshot:
+    """새 스냅샷 생성 후 교체 (동시 재로드는 직렬화, 실패하면 이전 스냅샷 유지)"""
+    global _snapshot
+    with _reload_lock:
+        snapshot = build_reference_snapshot()
+        _snapshot = snapshot
+    print(
+        f"[reference_data] ✅ 참조 데이터 스냅샷 v{snapshot.version} 적용 "
+        f"(지역 {len(snapshot.gap_engine.regions)}개)"
+    )
+    return snapshot
+
+
+async def reload_reference_snapshot() -> ReferenceSnapshot:
+    return await run_cpu(load_reference_snapshot)
+
+
+# =========================================================
+# 2. 조회 (요청 경로)
+# =========================================================
+def get_reference_snapshot() -> ReferenceSnapshot:
+    """현재 스냅샷 (서버 밖 스크립트처럼 아직 로드 전이면 여기서 한 번 로드)"""
+    snapshot = _snapshot
+    if snapshot is None:
+        snapshot = load_reference_snapshot()
+    return snapshot
+
+
+def get_reference_gap_engine():
+    return get_reference_snapshot().gap_engine
+
+
+def get_reference_status() -> dict:
+    snapshot = _snapshot
+    if snapshot is None:
+        return {"loaded": False}
+    return {
+        "loaded": True,
+        "version": snapshot.version,
+        "loaded_at": snapshot.loaded_at.isoformat(),
+        "sources": dict(snapshot.sources),
+        "regions": len(snapshot.gap_engine.regions),
+        "action_vectors": len(snapshot.action_dataset.topic_vectors) if snapshot.action_dataset else 0,
+    }
+
+
+# =========================================================
+# 3. 다른 프로세스의 파일 교체 감지
+# =========================================================
+def reference_sources_changed() -> bool:
+    """현재 스냅샷을 만든 뒤 참조 파일이 바뀌었는지 (mtime 비교)"""
+    snapshot = _snapshot
+    return snapshot is not None and dict(snapshot.sources) != _source_mtimes()
+
+
+def _reload_in_background():
+    try:
+        load_reference_snapshot()
+    except Exception as e:
+        print(f"[reference_data] ⚠️ 참조 데이터 자동 재로드 실패 (기존 스냅샷 유지): {e}")
+
+
+def _on_version_change(info, reason: str, external: bool):
+    # 이 프로세스의 쓰기는 제외 (직접 재로드한 경우 포함), 요청 스레드를 막지 않도록 별도 스레드에서 로드
+    if not external or not reference_sources_changed():
+        return
+    with _background_lock:
+        if _background["thread"] is not None and _background["thread"].is_alive():
+            return
+        print("[reference_data] 참조 파일 변경 감지 → 스냅샷 다시 로드")
+        _background["thread"] = threading.Thread(target=_reload_in_background, name="reference-reload", daemon=True)
+        _background["thread"].start()
+
+
+add_version_listener(_on_version_change)
@@ -0,0 +1,507 @@
+# app/services/scheduler.py
+
+import os
+import sys
+import time
+import random
+import socket
+import asyncio
+import subprocess
+import threading
+from collections import namedtuple, deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from sqlalchemy import select, update, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.utils.database import engine, SessionLocal
+from app.utils.models import SchedulerJobState
+from app.utils.fast_json import dumps
+from app.utils.data_version import bump_data_version
+
+"""
+scheduler.py
+운영자가 손으로 돌리던 주기 작업(지도 갱신, 벡터 재생성, 임베딩 백필, 분석 집계 반영)을 cron 식으로 실행하는 스케줄러입니다.
+- 서버 프로세스 안(SCHEDULER_ENABLED=true) 또는 별도 프로세스(python -m app.services.scheduler)로 실행
+- cron 식: "분 시 일 월 요일" 5필드 (*, */n, a-b, a-b/n, a,b / 요일 0·7 = 일요일), 시간대 SCHEDULER_TIMEZONE
+- 겹침 방지: 같은 작업은 프로세스 안에서 한 번만, 프로세스 간에는 scheduler_job_state 잠금(lease)으로 한 번만 실행
+  heavy 작업(벡터 재생성·임베딩 백필)은 서로 겹치지 않도록 순서대로 실행
+- 지터: 예정 시각에 0~SCHEDULER_JITTER_SECONDS 초 임의 지연 (여러 작업/인스턴스 동시 시작 분산)
+- 상태·지표: 마지막 실행 시각/결과/소요 시간·누적 횟수는 DB, 최근 실행 소요 시간은 메모리(get_scheduler_stats)
+"""
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+SCHEDULER_TIMEZONE = ZoneInfo(os.getenv("SCHEDULER_TIMEZONE", "Asia/Seoul"))
+SCHEDULER_JITTER_SECONDS = float(os.getenv("SCHEDULER_JITTER_SECONDS", "60"))
+SCHEDULER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "21600"))  # 실행 잠금 최대 유지 시간 (6시간)
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "2"))
+SCHEDULER_HISTORY_SIZE = int(os.getenv("SCHEDULER_HISTORY_SIZE", "20"))
+
+OWNER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+VECTOR_GENERATOR_PATH = os.path.join(PROJECT_ROOT, "scripts", "vector_generator.py")
+
+ScheduledJob = namedtuple("ScheduledJob", ["name", "cron", "spec", "func", "heavy", "description"])
+CronSpec = namedtuple("CronSpec", ["minute", "hour", "day", "month", "weekday", "day_any", "weekday_any"])
+
+JOBS: dict[str, ScheduledJob] = {}
+
+
+# =========================================================
+# 1. cron 식
+# =========================================================
+_CRON_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+
+def _parse_cron_field(value: str, low: int, high: int) -> frozenset:
+    values = set()
+    for part in value.split(","):
+        part, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if step < 1 or not (low <= start <= end <= high):
+            raise ValueError(f"cron 값 범위 오류: {value} ({low}~{high})")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+def parse_cron(expr: str) -> CronSpec:
+    """5필드 cron 식 파싱 (형식 오류는 ValueError)"""
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError(f"cron 식은 5개 필드여야 합니다: '{expr}'")
+    parsed = {name: _parse_cron_field(value, low, high) for value, (name, low, high) in zip(fields, _CRON_FIELDS)}
+    weekday = frozenset(d % 7 for d in parsed["weekday"])  # 7 → 0 (일요일)
+    return CronSpec(
+        minute=parsed["minute"],
+        hour=parsed["hour"],
+        day=parsed["day"],
+        month=parsed["month"],
+        weekday=weekday,
+        day_any=fields[2] == "*",
+        weekday_any=fields[4] == "*",
+    )
+
+
+def _day_matches(spec: CronSpec, t: datetime) -> bool:
+    day_ok = t.day in spec.day
+    weekday_ok = (t.weekday() + 1) % 7 in spec.weekday  # cron: 0 = 일요일
+    # 일/요일이 둘 다 지정되면 둘 중 하나만 맞아도 실행 (표준 cron 규칙)
+    if spec.day_any or spec.weekday_any:
+        return day_ok and weekday_ok
+    return day_ok or weekday_ok
+
+
+def cron_next(spec: CronSpec, after: datetime) -> datetime:
+    """after 이후(초과) 첫 실행 시각 (after 의 시간대 기준 벽시계)"""
+    t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limit = after + timedelta(days=366 * 5)
+    while t <= limit:
+        if t.month not in spec.month:
+            t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+        elif not _day_matches(spec, t):
+            t = t.replace(hour=0, minute=0) + timedelta(days=1)
+        elif t.hour not in spec.hour:
+            t = t.replace(minute=0) + timedelta(hours=1)
+        elif t.minute not in spec.minute:
+            t += timedelta(minutes=1)
+        else:
+            return t
+    raise ValueError("cron 식에 해당하는 실행 시각이 없습니다.")
+
+
+# =========================================================
+# 2. 작업 등록
+# =========================================================
+def register_job(name: str, default_cron: str, heavy: bool = False, description: str = ""):
+    """
+    주기 작업 등록 데코레이터
+    - SCHEDULER_CRON_<NAME> 환경변수로 cron 식 변경, "off" 면 자동 실행 안 함 (수동 실행은 가능)
+    """
+    def decorator(func):
+        cron = os.getenv(f"SCHEDULER_CRON_{name.upper()}", default_cron).strip()
+        spec = None if cron.lower() in ("", "off", "none") else parse_cron(cron)
+        JOBS[name] = ScheduledJob(name, cron if spec else None, spec, func, heavy, description)
+        return func
+    return decorator
+
+
+def _ensure_success(result: dict, step: str) -> dict:
+    """기존 서비스 함수의 {"status": "error"} 반환을 예외로 변환 (실패로 기록)"""
+    if isinstance(result, dict) and result.get("status") == "error":
+        raise RuntimeError(f"{step}: {result.get('message')}")
+    return result
+
+
+@register_job("analysis_refresh", "5 * * * *", description="실시간 여론 집계 → 지역 여론 점수 반영, 변경 지역 gap 재계산(이력 기록)")
+def _job_analysis_refresh():
+    from app.services.sentiment_aggregate_service import sync_region_sentiment
+    from app.services.gap_calculator import update_dirty_gap_scores
+
+    db = SessionLocal()
+    try:
+        synced = _ensure_success(sync_region_sentiment(db), "sync_region_sentiment")
+        gap = _ensure_success(update_dirty_gap_scores(db), "update_dirty_gap_scores")
+    finally:
+        db.close()
+    return {"synced_regions": synced.get("updated_regions", 0), "gap_updated_regions": gap.get("updated_regions", 0)}
+
+
+@register_job("map_refresh", "20 * * * *", description="변경 지역 gap 재계산 후 지도 GeoJSON 레이어 사전 생성")
+def _job_map_refresh():
+    from app.services.gap_calculator import update_dirty_gap_scores
+    from app.services.map_layer_service import refresh_map_layers
+
+    db = SessionLocal()
+    try:
+        gap = _ensure_success(update_dirty_gap_scores(db), "update_dirty_gap_scores")
+    finally:
+        db.close()
+    layers = refresh_map_layers()
+    return {"gap_updated_regions": gap.get("updated_regions", 0), "levels": sorted(layers)}
+
+
+@register_job("embedding_backfill", "30 3 * * *", heavy=True, description="rag_summary 임베딩 누락분 생성 (reindex-embeddings)")
+def _job_embedding_backfill():
+    from app.services.vector_store_service import reindex_all_embeddings
+
+    db = SessionLocal()
+    try:
+        updated = reindex_all_embeddings(db)
+    finally:
+        db.close()
+    return {"updated": updated}
+
+
+@register_job("vector_regeneration", "0 4 * * 0", heavy=True, description="정책/지역 벡터 재생성 → 정책 파일 DB 반영 → 참조 데이터 재로드")
+def _job_vector_regeneration():
+    from scripts import import_all_files
+    from app.services.reference_data import load_reference_snapshot
+
+    # SentenceTransformer 모델은 vector_generator import 시점에 로드되어 프로세스에 계속 남으므로
+    # API/스케줄러 프로세스가 아닌 별도 프로세스에서 실행 (종료와 함께 메모리 반환)
+    subprocess.run([sys.executable, VECTOR_GENERATOR_PATH], cwd=PROJECT_ROOT, check=True)
+    import_all_files.main()
+    snapshot = load_reference_snapshot()
+    # 다른 API 프로세스는 데이터 버전 변경(외부 쓰기)을 감지하면 참조 파일 mtime 을 비교해 스냅샷을 다시 로드
+    bump_data_version("reference_data")
+    return {"reference_version": snapshot.version}
+
+
+# =========================================================
+# 3. 실행 (겹침 방지 + 상태 기록)
+# =========================================================
+_state_table = SchedulerJobState.__table__
+_running: set = set()
+_running_lock = threading.Lock()
+_heavy_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_loop_state = {"task": None, "started_at": None}
+_pending: set = set()  # 스케줄 루프가 띄운 실행 태스크 (참조 유지용)
+_metrics: dict = {}
+
+
+def _job_metrics(name: str) -> dict:
+    return _metrics.setdefault(name, {
+        "runs": 0,
+        "failures": 0,
+        "skipped": 0,
+        "last_duration_ms": None,
+        "max_duration_ms": 0.0,
+        "total_duration_ms": 0.0,
+        "recent": deque(maxlen=SCHEDULER_HISTORY_SIZE),
+    })
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _acquire_lease(name: str, now: datetime) -> bool:
+    """scheduler_job_state 행의 잠금을 조건부 UPDATE 로 획득 (다른 프로세스가 실행 중이면 False)"""
+    with engine.begin() as conn:
+        conn.execute(sqlite_insert(_state_table).values(name=name).on_conflict_do_nothing(index_elements=["name"]))
+        result = conn.execute(
+            update(_state_table)
+            .where(
+                _state_table.c.name == name,
+                or_(_state_table.c.locked_until.is_(None), _state_table.c.locked_until < now),
+            )
+            .values(
+                locked_by=OWNER_ID,
+                locked_until=now + timedelta(seconds=SCHEDULER_LEASE_SECONDS),
+                last_started_at=now,
+                last_status="running",
+            )
+        )
+        return result.rowcount == 1
+
+
+def _release_lease(name: str, status: str, duration_ms: float, error: str | None, result) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            update(_state_table)
+            .where(_state_table.c.name == name, _state_table.c.locked_by == OWNER_ID)
+            .values(
+                locked_by=None,
+                locked_until=None,
+                last_finished_at=_utcnow(),
+                last_status=status,
+                last_duration_ms=duration_ms,
+                last_error=error,
+                last_result=None if result is None else dumps(result).decode("utf-8"),
+                run_count=_state_table.c.run_count + 1,
+                failure_count=_state_table.c.failure_count + int(status == "error"),
+                total_duration_ms=_state_table.c.total_duration_ms + duration_ms,
+            )
+        )
+
+
+def _record_next_run(name: str, next_run: datetime) -> None:
+    try:
+        with engine.begin() as conn:
+            conn.execute(sqlite_insert(_state_table).values(name=name, next_run_at=next_run).on_conflict_do_update(
+                index_elements=["name"], set_={"next_run_at": next_run},
+            ))
+    except Exception as e:
+        print(f"[scheduler] ⚠️ {name} 다음 실행 시각 기록 실패: {e}")
+
+
+def is_job_running(name: str) -> bool:
+    with _running_lock:
+        return name in _running
+
+
+def run_job(name: str, trigger: str = "manual") -> dict:
+    """
+    작업 1회 실행 (동기, 완료까지 대기)
+    반환: {"job", "status": success/error/skipped, "duration_ms", "result" | "error" | "reason"}
+    """
+    job = JOBS.get(name)
+    if job is None:
+        raise LookupError(f"등록되지 않은 작업입니다: {name} (가능: {', '.join(JOBS)})")
+    metrics = _job_metrics(name)
+
+    with _running_lock:
+        if name in _running:
+            metrics["skipped"] += 1
+            print(f"[scheduler] ⏭️ {name} 이미 실행 중 → 건너뜀 ({trigger})")
+            return {"job": name, "status": "skipped", "reason": "running"}
+        _running.add(name)
+
+    try:
+        if not _acquire_lease(name, _utcnow()):
+            metrics["skipped"] += 1
+            print(f"[scheduler] ⏭️ {name} 다른 프로세스에서 실행 중 → 건너뜀 ({trigger})")
+            return {"job": name, "status": "skipped", "reason": "locked"}
+
+        with _heavy_lock if job.heavy else nullcontext():
+            print(f"[scheduler] ▶️ {name} 시작 ({trigger})")
+            started_at = _utcnow()
+            started = time.perf_counter()
+            result, error, status = None, None, "success"
+            try:
+                result = job.func()
+            except Exception as e:
+                status, error = "error", f"{type(e).__name__}: {e}"
+            duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        try:
+            _release_lease(name, status, duration_ms, error, result)
+        except Exception as e:
+            print(f"[scheduler] ⚠️ {name} 실행 상태 기록 실패: {e}")
+
+        metrics["runs"] += 1
+        metrics["failures"] += int(status == "error")
+        metrics["last_duration_ms"] = duration_ms
+        metrics["max_duration_ms"] = max(metrics["max_duration_ms"], duration_ms)
+        metrics["total_duration_ms"] += duration_ms
+        metrics["recent"].append({
+            "started_at": started_at.isoformat(),
+            "trigger": trigger,
+            "status": status,
+            "duration_ms": duration_ms,
+        })
+
+        if status == "error":
+            print(f"[scheduler] ❌ {name} 실패 ({duration_ms}ms): {error}")
+            return {"job": name, "status": status, "duration_ms": duration_ms, "error": error}
+        print(f"[scheduler] ✅ {name} 완료 ({duration_ms}ms)")
+        return {"job": name, "status": status, "duration_ms": duration_ms, "result": result}
+    finally:
+        with _running_lock:
+            _running.discard(name)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=SCHEDULER_WORKERS, thread_name_prefix="scheduler")
+    return _executor
+
+
+async def run_job_async(name: str, trigger: str = "manual") -> dict:
+    """작업을 스케줄러 전용 스레드풀에서 실행하고 결과 대기 (요청 처리 스레드풀과 분리)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), run_job, name, trigger)
+
+
+def start_job(name: str, trigger: str = "manual") -> asyncio.Future:
+    """작업을 백그라운드로 시작하고 바로 반환 (이벤트 루프 안에서 호출)"""
+    task = asyncio.ensure_future(run_job_async(name, trigger))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+    return task
+
+
+# =========================================================
+# 4. 스케줄 루프
+# =========================================================
+def _next_fire(job: ScheduledJob, now: datetime) -> datetime:
+    jitter = random.uniform(0, SCHEDULER_JITTER_SECONDS) if SCHEDULER_JITTER_SECONDS > 0 else 0.0
+    return cron_next(job.spec, now) + timedelta(seconds=jitter)
+
+
+async def _scheduler_loop():
+    now = datetime.now(SCHEDULER_TIMEZONE)
+    next_runs = {name: _next_fire(job, now) for name, job in JOBS.items() if job.spec is not None}
+    for name, at in next_runs.items():
+        _record_next_run(name, at)
+    print(f"[scheduler] 🕒 스케줄러 시작 ({SCHEDULER_TIMEZONE.key}, 작업 {len(next_runs)}개, owner={OWNER_ID})")
+
+    while next_runs:
+        now = datetime.now(SCHEDULER_TIMEZONE)
+        for name, at in list(next_runs.items()):
+            if at > now:
+                continue
+            next_runs[name] = _next_fire(JOBS[name], now)
+            _record_next_run(name, next_runs[name])
+            if is_job_running(name):
+                _job_metrics(name)["skipped"] += 1
+                print(f"[scheduler] ⏭️ {name} 이전 실행이 끝나지 않아 이번 회차 건너뜀")
+                continue
+            start_job(name, "schedule")
+
+        wait = (min(next_runs.values()) - datetime.now(SCHEDULER_TIMEZONE)).total_seconds()
+        await asyncio.sleep(min(max(wait, 0.5), 60))
+
+
+def start_scheduler() -> bool:
+    """이벤트 루프 안에서 호출 (서버 startup), 이미 실행 중이면 무시"""
+    task = _loop_state["task"]
+    if task is not None and not task.done():
+        return False
+    _loop_state["task"] = asyncio.get_running_loop().create_task(_scheduler_loop())
+    _loop_state["started_at"] = _utcnow()
+    return True
+
+
+async def stop_scheduler():
+    global _executor
+    task = _loop_state["task"]
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        _loop_state["task"] = None
+    if _executor is not None:
+        # 실행 중인 작업은 끝까지 두고(잠금은 완료 시 해제), 대기 중인 작업만 취소
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+# =========================================================
+# 5. 상태 조회
+# =========================================================
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def get_job_states() -> list:
+    """작업 정의 + DB 에 저장된 마지막 실행 상태"""
+    with engine.connect() as conn:
+        rows = {row.name: row for row in conn.execute(select(_state_table)).all()}
+
+    jobs = []
+    for name, job in JOBS.items():
+        row = rows.get(name)
+        runs = row.run_count if row else 0
+        jobs.append({
+            "name": name,
+            "cron": job.cron,
+            "heavy": job.heavy,
+            "description": job.description,
+            "running": is_job_running(name) or bool(row and row.locked_by),
+            "locked_by": row.locked_by if row else None,
+            "next_run_at": _isoformat(row.next_run_at) if row else None,
+            "last_started_at": _isoformat(row.last_started_at) if row else None,
+            "last_finished_at": _isoformat(row.last_finished_at) if row else None,
+            "last_status": row.last_status if row else None,
+            "last_duration_ms": row.last_duration_ms if row else None,
+            "avg_duration_ms": round(row.total_duration_ms / runs, 1) if runs else None,
+            "last_error": row.last_error if row else None,
+            "run_count": runs,
+            "failure_count": row.failure_count if row else 0,
+        })
+    return jobs
+
+
+def get_scheduler_stats() -> dict:
+    """이 프로세스의 스케줄러 상태와 작업별 실행 지표 (health 용)"""
+    task = _loop_state["task"]
+    with _running_lock:
+        running = sorted(_running)
+    jobs = {}
+    for name in JOBS:
+        metrics = _job_metrics(name)
+        jobs[name] = {
+            "runs": metrics["runs"],
+            "failures": metrics["failures"],
+            "skipped": metrics["skipped"],
+            "last_duration_ms": metrics["last_duration_ms"],
+            "max_duration_ms": metrics["max_duration_ms"],
+            "avg_duration_ms": round(metrics["total_duration_ms"] / metrics["runs"], 1) if metrics["runs"] else None,
+            "recent": list(metrics["recent"]),
+        }
+    return {
+        "enabled": SCHEDULER_ENABLED,
+        "active": task is not None and not task.done(),
+        "started_at": _isoformat(_loop_state["started_at"]),
+        "owner": OWNER_ID,
+        "running": running,
+        "jobs": jobs,
+    }
+
+
+# =========================================================
+# 6. 별도 프로세스(sidecar) 실행
+#   python -m app.services.scheduler              → 스케줄 루프
+#   python -m app.services.scheduler run <작업>    → 작업 1회 실행
+#   python -m app.services.scheduler list         → 작업 목록·상태
+# =========================================================
+if __name__ == "__main__":
+    from app.utils.models import Base
+    from app.utils.migrations import run_migrations
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "serve"
+    if command == "run" and len(sys.argv) > 2:
+        outcome = run_job(sys.argv[2], trigger="cli")
+        print(dumps(outcome, pretty=True).decode("utf-8"))
+        sys.exit(1 if outcome["status"] == "error" else 0)
+    elif command == "list":
+        print(dumps(get_job_states(), pretty=True).decode("utf-8"))
+    else:
+        asyncio.run(_scheduler_loop())
@@ -0,0 +1,174 @@
+# app/services/search_service.py
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.fts import WORD_FTS_TABLES
+from app.utils.regions import normalize_region_key
+
+"""
+search_service.py
+FTS5 색인(sentiment_log_fts, rag_summary_fts)을 이용한 여론·정책 요약 전문 검색 서비스입니다.
+- bm25 순위 + snippet 하이라이트
+- 지역/주제 필터는 원본 테이블 JOIN 으로 적용
+- trigram 색인에서 3글자 미만 검색어는 색인을 쓸 수 없으므로
+  · 모두 짧은 검색어: 단어 색인(*_word_fts)에서 어절 접두어 검색
+  · 긴 검색어와 섞인 경우: 긴 검색어로 찾은 후보 행에만 짧은 검색어 LIKE 적용
+  (어느 경우에도 원본 테이블 전체 LIKE 스캔은 하지 않음)
+"""
+
+SNIPPET_OPEN, SNIPPET_CLOSE, SNIPPET_ELLIPSIS = "<b>", "</b>", "…"
+SNIPPET_TOKENS = 24
+
+# 검색 대상별 설정: FTS 테이블, 원본 테이블, snippet 컬럼 번호
+SEARCH_TARGETS = {
+    "sentiment": {"fts": "sentiment_log_fts", "snippet_col": 0},
+    "summary": {"fts": "rag_summary_fts", "snippet_col": 1},
+}
+
+_tokenizers: dict = {}
+
+
+async def _get_tokenizer(db: AsyncSession, fts_name: str) -> str:
+    if fts_name not in _tokenizers:
+        sql = (await db.execute(
+            text("SELECT sql FROM sqlite_master WHERE name = :name"), {"name": fts_name}
+        )).scalar()
+        if not sql:
+            raise RuntimeError(f"{fts_name} 색인이 없습니다. 서버 기동 시 마이그레이션을 확인하세요.")
+        _tokenizers[fts_name] = "trigram" if "trigram" in sql else "unicode61"
+    return _tokenizers[fts_name]
+
+
+def _split_terms(query: str) -> list:
+    return [t for t in query.split() if t]
+
+
+def build_match_query(terms: list, prefix: bool = False) -> str:
+    """
+    사용자 입력 → FTS5 MATCH 식 (각 검색어를 문자열 리터럴로 감싸 연산자 해석 방지, AND 결합)
+    - prefix=True: 접두어 검색 ("교통"*)
+    """
+    suffix = "*" if prefix else ""
+    return " ".join('"' + t.replace('"', '""') + '"' + suffix for t in terms)
+
+
+def plan_search(target: str, tokenizer: str, terms: list) -> tuple:
+    """검색어 → (mode, 사용할 FTS 테이블, MATCH 식, 후보 행에 적용할 LIKE 검색어)"""
+    fts_name = SEARCH_TARGETS[target]["fts"]
+    short_terms = [t for t in terms if len(t) < 3] if tokenizer == "trigram" else []
+    if not short_terms:
+        return "fts", fts_name, build_match_query(terms), []
+    long_terms = [t for t in terms if len(t) >= 3]
+    if long_terms:
+        return "fts_like", fts_name, build_match_query(long_terms), short_terms
+    return "word", WORD_FTS_TABLES[fts_name], build_match_query(terms, prefix=True), []
+
+
+def _like_snippet(content: str, terms: list, width: int = 40) -> str:
+    """snippet 이 비어 있을 때 대체 (첫 일치 위치 주변)"""
+    pos = min((content.find(t) for t in terms if t in content), default=0)
+    start = max(0, pos - width // 2)
+    snippet = content[start:start + width]
+    for t in terms:
+        snippet = snippet.replace(t, f"{SNIPPET_OPEN}{t}{SNIPPET_CLOSE}")
+    prefix = SNIPPET_ELLIPSIS if start > 0 else ""
+    suffix = SNIPPET_ELLIPSIS if start + width < len(content) else ""
+    return prefix + snippet + suffix
+
+
+# =========================================================
+# 1. 대상별 SQL
+# =========================================================
+def _snippet_sql(fts_name: str, column: int) -> str:
+    return (
+        f"snippet({fts_name}, {column}, '{SNIPPET_OPEN}', '{SNIPPET_CLOSE}', '{SNIPPET_ELLIPSIS}', {SNIPPET_TOKENS}) AS snippet, "
+        f"-bm25({fts_name}) AS score "
+    )
+
+
+def _sentiment_sql(fts_name: str, match: str, like_terms: list, region: str | None, topic: str | None, label: int | None):
+    params, where = {"match": match}, [f"{fts_name} MATCH :match"]
+    for i, t in enumerate(like_terms):
+        params[f"t{i}"] = f"%{t}%"
+        where.append(f"l.text LIKE :t{i}")
+    if region:
+        params["region_key"] = normalize_region_key(region)
+        where.append("l.region_key = :region_key")
+    if topic:
+        params["topic"] = topic
+        where.append("l.topic = :topic")
+    if label is not None:
+        params["label"] = label
+        where.append("l.label = :label")
+
+    select_sql = (
+        "SELECT l.id, l.region, l.topic, l.label, l.text AS content, "
+        + _snippet_sql(fts_name, 0)
+        + f"FROM {fts_name} JOIN sentiment_analysis_log l ON l.id = {fts_name}.rowid "
+    )
+    return select_sql + "WHERE " + " AND ".join(where) + f" ORDER BY bm25({fts_name})", params
+
+
+def _summary_sql(fts_name: str, match: str, like_terms: list, region: str | None, topic: str | None, label: int | None):
+    params, where = {"match": match}, [f"{fts_name} MATCH :match"]
+    for i, t in enumerate(like_terms):
+        params[f"t{i}"] = f"%{t}%"
+        where.append(f"(s.summary LIKE :t{i} OR s.topic LIKE :t{i})")
+    if region:
+        params["region_name"] = normalize_region_key(region)
+        where.append("r.region_name = :region_name")
+    if topic:
+        params["topic"] = topic
+        where.append("s.topic = :topic")
+
+    select_sql = (
+        "SELECT s.id, r.region_name AS region, s.topic, NULL AS label, s.summary AS content, "
+        + _snippet_sql(fts_name, 1)
+        + f"FROM {fts_name} JOIN rag_summary s ON s.id = {fts_name}.rowid "
+        "LEFT JOIN region_data r ON r.id = s.region_id "
+    )
+    return select_sql + "WHERE " + " AND ".join(where) + f" ORDER BY bm25({fts_name})", params
+
+
+_SQL_BUILDERS = {"sentiment": _sentiment_sql, "summary": _summary_sql}
+
+
+# =========================================================
+# 2. 검색 진입점
+# =========================================================
+async def search(
+    db: AsyncSession,
+    query: str,
+    target: str = "sentiment",
+    region: str | None = None,
+    topic: str | None = None,
+    label: int | None = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> dict:
+    """전문 검색 → {"mode": fts | fts_like | word, "count", "results": [...]}"""
+    if target not in SEARCH_TARGETS:
+        raise ValueError(f"지원하지 않는 검색 대상입니다: {target} (가능: {', '.join(SEARCH_TARGETS)})")
+    terms = _split_terms(query)
+    if not terms:
+        raise ValueError("검색어가 비어 있습니다.")
+
+    tokenizer = await _get_tokenizer(db, SEARCH_TARGETS[target]["fts"])
+    mode, fts_name, match, like_terms = plan_search(target, tokenizer, terms)
+
+    sql, params = _SQL_BUILDERS[target](fts_name, match, like_terms, region, topic, label)
+    params.update({"limit": limit, "offset": offset})
+    rows = (await db.execute(text(sql + " LIMIT :limit OFFSET :offset"), params)).mappings().all()
+
+    results = [
+        {
+            "id": row["id"],
+            "region": row["region"],
+            "topic": row["topic"],
+            "label": row["label"],
+            "snippet": row["snippet"] or _like_snippet(row["content"], terms),
+            "score": round(row["score"], 4),
+        }
+        for row in rows
+    ]
+    return {"mode": mode, "tokenizer": tokenizer, "count": len(results), "results": results}
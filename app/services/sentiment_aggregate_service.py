@@ -0,0 +1,303 @@
+# app/services/sentiment_aggregate_service.py
+
+import os
+import sys
+import time
+from contextlib import nullcontext
+import pandas as pd
+from datetime import datetime, timezone
+from sqlalchemy import select, delete, insert, update, or_, func, case, bindparam, literal, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.utils.database import engine
+from app.utils.models import (
+    RegionData,
+    SentimentAnalysisLog,
+    SentimentAggregate,
+    SentimentPartitionSummary,
+    TOPIC_COLUMNS,
+    SENTIMENT_ROLLING_ALPHA,
+    label_to_score,
+)
+
+"""
+sentiment_aggregate_service.py
+sentiment_aggregate 테이블((region_key, topic) 단위 여론 집계) 재구축·조회 로직입니다.
+- 평상시에는 SentimentAnalysisLog INSERT 이벤트가 집계를 증분 갱신 (models.py)
+- Core bulk INSERT/삭제 후에는 rebuild_sentiment_aggregates() 로 일괄 재구축
+- sync_region_sentiment() 로 실시간 여론 점수를 RegionData 여론 점수 → gap 계산에 반영
+- 보존 기간(SENTIMENT_RETENTION_MONTHS)이 지난 월 파티션은 sentiment_partition_summary 로 압축 후 원본 삭제
+  (집계는 압축 요약 + 남은 원본 로그로 재구축되므로 누적 건수/점수가 유지됨)
+"""
+
+# 개월 수는 현재 월을 포함해 유지할 파티션 수
+SENTIMENT_RETENTION_MONTHS = int(os.getenv("SENTIMENT_RETENTION_MONTHS", "12"))  # 0 이면 정리하지 않음
+SENTIMENT_RECENT_MONTHS = int(os.getenv("SENTIMENT_RECENT_MONTHS", "3"))
+
+
+def months_ago_partition(months: int, now: datetime | None = None) -> str:
+    """now 기준 months 개월 전 월의 파티션 키 (0 이면 현재 월)"""
+    now = now or datetime.now(timezone.utc)
+    index = now.year * 12 + (now.month - 1) - months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+# =========================================================
+# 1. 일괄 재구축
+# =========================================================
+def _rolling_scores(conn) -> list:
+    """
+    입력 순서(id)대로 지수이동평균 계산 — 증분 갱신 식과 동일 (adjust=False)
+    압축된 파티션이 있으면 그 누적 점수를 초기값으로 사용 (원본 순서 정보가 없으므로 근사)
+    """
+    summary = SentimentPartitionSummary
+    seeds = conn.execute(
+        select(summary.region_key, summary.topic, func.sum(summary.label_sum), func.sum(summary.total_count))
+        .group_by(summary.region_key, summary.topic)
+    ).all()
+    rows = conn.execute(
+        select(SentimentAnalysisLog.region_key, SentimentAnalysisLog.topic, SentimentAnalysisLog.label)
+        .order_by(SentimentAnalysisLog.id)
+    ).all()
+
+    df = pd.DataFrame(rows, columns=["region_key", "topic", "label"])
+    df["score"] = label_to_score(df["label"].astype(float))
+    if seeds:
+        seed_df = pd.DataFrame(
+            [(k, t, 50.0 + 50.0 * s / c) for k, t, s, c in seeds if c],
+            columns=["region_key", "topic", "score"],
+        )
+        df = pd.concat([seed_df, df[["region_key", "topic", "score"]]], ignore_index=True)
+    if df.empty:
+        return []
+
+    last = (
+        df.groupby(["region_key", "topic"], sort=False)["score"]
+        .agg(lambda s: s.ewm(alpha=SENTIMENT_ROLLING_ALPHA, adjust=False).mean().iloc[-1])
+        .reset_index()
+    )
+    return [
+        {"b_region_key": row.region_key, "b_topic": row.topic, "b_rolling": float(row.score)}
+        for row in last.itertuples(index=False)
+    ]
+
+
+def rebuild_sentiment_aggregates(bind=engine) -> int:
+    """
+    sentiment_analysis_log 전체로부터 집계 테이블을 한 트랜잭션으로 재구축
+    - bind 에 Connection 을 넘기면 호출 측 트랜잭션 안에서 실행 (마이그레이션용)
+    """
+    started = time.perf_counter()
+    log = SentimentAnalysisLog
+    agg = SentimentAggregate.__table__
+
+    with (nullcontext(bind) if isinstance(bind, Connection) else bind.begin()) as conn:
+        conn.execute(delete(agg))
+
+        # 건수/긍부정/점수는 (원본 로그 GROUP BY + 압축 파티션 요약) 합산 INSERT ... SELECT
+        summary = SentimentPartitionSummary
+        parts = union_all(
+            select(
+                log.region_key,
+                log.topic,
+                func.count().label("total_count"),
+                func.sum(case((log.label > 0, 1), else_=0)).label("positive_count"),
+                func.sum(case((log.label < 0, 1), else_=0)).label("negative_count"),
+                func.sum(log.label).label("label_sum"),
+            ).group_by(log.region_key, log.topic),
+            select(
+                summary.region_key, summary.topic, summary.total_count,
+                summary.positive_count, summary.negative_count, summary.label_sum,
+            ),
+        ).subquery()
+        grouped = select(
+            parts.c.region_key,
+            parts.c.topic,
+            func.sum(parts.c.total_count),
+            func.sum(parts.c.positive_count),
+            func.sum(parts.c.negative_count),
+            func.sum(parts.c.label_sum),
+            50.0 + 50.0 * func.sum(parts.c.label_sum) / func.sum(parts.c.total_count),
+            literal(50.0),
+            literal(datetime.now(timezone.utc)),
+        ).group_by(parts.c.region_key, parts.c.topic)
+        conn.execute(insert(agg).from_select(
+            ["region_key", "topic", "total_count", "positive_count", "negative_count",
+             "label_sum", "sentiment_score", "rolling_score", "updated_at"],
+            grouped,
+        ))
+
+        # 순서 의존적인 rolling_score 만 pandas 로 계산 후 executemany UPDATE
+        rolling = _rolling_scores(conn)
+        if rolling:
+            conn.execute(
+                update(agg)
+                .where(agg.c.region_key == bindparam("b_region_key"), agg.c.topic == bindparam("b_topic"))
+                .values(rolling_score=bindparam("b_rolling")),
+                rolling,
+            )
+
+    print(
+        f"[sentiment_aggregate] 집계 재구축 완료 ({len(rolling)}개 지역·주제, "
+        f"{time.perf_counter() - started:.2f}s)"
+    )
+    return len(rolling)
+
+
+# =========================================================
+# 2. 조회 (O(주제 수))
+# =========================================================
+def get_region_record_count(db: Session, region_key: str) -> int:
+    """지역의 전체 여론 건수"""
+    return db.scalar(
+        select(func.coalesce(func.sum(SentimentAggregate.total_count), 0))
+        .where(SentimentAggregate.region_key == region_key)
+    )
+
+
+def get_region_topic_sentiment(db: Session, region_key: str) -> list:
+    """지역의 주제별 집계 행 목록"""
+    return db.scalars(
+        select(SentimentAggregate).where(SentimentAggregate.region_key == region_key)
+    ).all()
+
+
+# =========================================================
+# 3. 실시간 여론 → RegionData 여론 점수 반영
+# =========================================================
+def sync_region_sentiment(db: Session, region_keys: list | None = None, use_rolling: bool = False):
+    """
+    집계 점수로 RegionData 의 여론 평균/주제별 여론 점수를 set 단위로 갱신하고 gap_dirty 표시
+    - 집계가 없는 주제는 기존 값 유지
+    - 이후 update_dirty_gap_scores() 로 해당 지역 gap 만 재계산
+    """
+    agg = SentimentAggregate
+    score_col = agg.rolling_score if use_rolling else agg.sentiment_score
+    same_region = agg.region_key == RegionData.region_name
+
+    scores = {
+        "sentiment_avg_score": func.coalesce(
+            select(func.round(50.0 + 50.0 * func.sum(agg.label_sum) / func.sum(agg.total_count), 2))
+            .where(same_region).scalar_subquery(),
+            RegionData.sentiment_avg_score,
+        ),
+    }
+    for cols in TOPIC_COLUMNS.values():
+        scores[cols["sentiment"]] = func.coalesce(
+            select(func.round(score_col, 2))
+            .where(same_region, agg.topic == cols["sentiment_topic"]).scalar_subquery(),
+            getattr(RegionData, cols["sentiment"]),
+        )
+
+    # 점수가 실제로 바뀐 지역만 갱신 (변화 없으면 gap_dirty/updated_at 그대로 → 데이터 버전·캐시 유지)
+    changed = or_(*(getattr(RegionData, col).is_distinct_from(expr) for col, expr in scores.items()))
+    stmt = (
+        update(RegionData)
+        .values(**scores, gap_dirty=True, updated_at=datetime.now(timezone.utc))
+        .where(select(agg.region_key).where(same_region).exists(), changed)
+    )
+    if region_keys:
+        stmt = stmt.where(RegionData.region_name.in_(region_keys))
+
+    try:
+        updated = db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+        db.commit()
+        print(f"[sentiment_aggregate] 실시간 여론 점수 반영 완료 ({updated}개 지역, rolling={use_rolling})")
+        return {"status": "success", "updated_regions": updated}
+    except Exception as e:
+        db.rollback()
+        print(f"[sentiment_aggregate] 여론 점수 반영 중 오류 발생: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+# =========================================================
+# 4. 월 파티션 압축 / 보존 기간 정리
+# =========================================================
+def compact_sentiment_partitions(
+    bind=engine,
+    retention_months: int = SENTIMENT_RETENTION_MONTHS,
+    now: datetime | None = None,
+) -> dict:
+    """
+    보존 기간보다 오래된 월 파티션을 (partition_key, region_key, topic) 요약으로 압축하고 원본 로그 삭제
+    - sentiment_aggregate 는 이미 해당 로그를 포함하고 있으므로 변경하지 않음
+    - 같은 파티션을 다시 압축하면 요약에 누적 (늦게 들어온 과거 로그 대비)
+    """
+    if retention_months <= 0:
+        print("[sentiment_aggregate] 보존 기간 미설정(0) → 파티션 정리 생략")
+        return {"status": "skipped", "compacted_rows": 0, "partitions": []}
+
+    cutoff = months_ago_partition(retention_months - 1, now)
+    log = SentimentAnalysisLog
+    summary = SentimentPartitionSummary.__table__
+    started = time.perf_counter()
+
+    with bind.begin() as conn:
+        partitions = conn.execute(
+            select(log.partition_key).where(log.partition_key < cutoff).distinct().order_by(log.partition_key)
+        ).scalars().all()
+        if not partitions:
+            print(f"[sentiment_aggregate] 정리할 파티션 없음 (기준: {cutoff} 이전)")
+            return {"status": "empty", "compacted_rows": 0, "partitions": [], "cutoff": cutoff}
+
+        grouped = select(
+            log.partition_key,
+            log.region_key,
+            log.topic,
+            func.count(),
+            func.sum(case((log.label > 0, 1), else_=0)),
+            func.sum(case((log.label < 0, 1), else_=0)),
+            func.sum(log.label),
+            literal(datetime.now(timezone.utc)),
+        ).where(log.partition_key < cutoff).group_by(log.partition_key, log.region_key, log.topic)
+        stmt = sqlite_insert(summary).from_select(
+            ["partition_key", "region_key", "topic", "total_count", "positive_count",
+             "negative_count", "label_sum", "compacted_at"],
+            grouped,
+        )
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=["partition_key", "region_key", "topic"],
+            set_={
+                "total_count": summary.c.total_count + stmt.excluded.total_count,
+                "positive_count": summary.c.positive_count + stmt.excluded.positive_count,
+                "negative_count": summary.c.negative_count + stmt.excluded.negative_count,
+                "label_sum": summary.c.label_sum + stmt.excluded.label_sum,
+                "compacted_at": stmt.excluded.compacted_at,
+            },
+        ))
+        deleted = conn.execute(delete(log.__table__).where(log.partition_key < cutoff)).rowcount
+
+    print(
+        f"[sentiment_aggregate] 파티션 {len(partitions)}개 압축, 원본 {deleted}건 정리 "
+        f"(기준: {cutoff} 이전, {time.perf_counter() - started:.2f}s)"
+    )
+    return {"status": "success", "compacted_rows": deleted, "partitions": partitions, "cutoff": cutoff}
+
+
+def clear_partition_summaries(region_keys: list | None = None, bind=engine) -> int:
+    """
+    압축 요약 삭제 (원본 로그를 다시 적재할 때 같은 월이 요약 + 원본으로 이중 집계되지 않도록)
+    - region_keys 미지정: 전체 삭제 (replace 재적재), 지정: 해당 지역만 (upsert 재적재)
+    """
+    stmt = delete(SentimentPartitionSummary.__table__)
+    if region_keys is not None:
+        stmt = stmt.where(SentimentPartitionSummary.region_key.in_(region_keys))
+    with bind.begin() as conn:
+        deleted = conn.execute(stmt).rowcount
+    if deleted:
+        print(f"[sentiment_aggregate] 압축 요약 {deleted}건 삭제 (재적재 원본으로 대체)")
+    return deleted
+
+
+def recent_partition_filter(months: int = SENTIMENT_RECENT_MONTHS, now: datetime | None = None):
+    """최근 months 개월 파티션만 조회하는 조건식 ((region_key, partition_key) 인덱스 범위 스캔)"""
+    return SentimentAnalysisLog.partition_key >= months_ago_partition(max(months, 1) - 1, now)
+
+
+if __name__ == "__main__":
+    # python -m app.services.sentiment_aggregate_service [rebuild|compact]
+    if (sys.argv[1:2] or ["rebuild"])[0] == "compact":
+        compact_sentiment_partitions()
+    else:
+        rebuild_sentiment_aggregates()
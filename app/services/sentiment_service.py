@@ -3,22 +3,40 @@
 from sqlalchemy.orm import Session
 from app.utils.models import RegionData, SentimentAnalysisLog
 from app.services.gap_calculator import calculate_gap
-from datetime import datetime
+from app.services.event_bus import publish_region_update
+from app.utils.regions import normalize_region_key
+from datetime import datetime, timezone
 
 """
 sentiment_service.py
 감정 분석 결과를 DB에 저장하고, 해당 지역의 sentiment_score 및 gap_score를 갱신합니다.
 """
 
+# 0~100 감정 점수 → 로그 라벨(+1/0/-1) 경계
+POSITIVE_THRESHOLD = 60.0
+NEGATIVE_THRESHOLD = 40.0
+
+
+def score_to_label(score: float) -> int:
+    """감정 점수(0~100)를 여론 로그 라벨로 변환"""
+    if score >= POSITIVE_THRESHOLD:
+        return 1
+    if score <= NEGATIVE_THRESHOLD:
+        return -1
+    return 0
+
 def save_sentiment_result(
     db: Session,
     region_name: str,
     text: str,
     score: float,
-    model: str = "unknown"
+    model: str = "unknown",
+    topic: str = "기타",
 ):
     """감정 분석 결과 저장 및 지역 점수 갱신"""
     try:
+        region_name = normalize_region_key(region_name)
+
         # 지역 데이터 조회 또는 신규 생성
         region = db.query(RegionData).filter(RegionData.region_name == region_name).first()
         if not region:
@@ -34,13 +52,13 @@ def save_sentiment_result(
             db.commit()
             db.refresh(region)
 
-        # 감정 분석 로그 추가
+        # 감정 분석 로그 추가 (created_at 기준 월 파티션에 기록, 집계 테이블은 INSERT 이벤트로 갱신)
         log = SentimentAnalysisLog(
-            region_id=region.id,
+            region=region_name,
+            topic=topic,
             text=text,
-            sentiment_avg_score=round(score, 2),
-            model=model,
-            created_at=datetime.utcnow()
+            label=score_to_label(score),
+            created_at=datetime.now(timezone.utc),
         )
         db.add(log)
 
@@ -51,7 +69,8 @@ def save_sentiment_result(
 
         # 커밋 및 로그 출력
         db.commit()
-        print(f"[sentiment_service] '{region_name}' 감정 점수({score})가 저장되었습니다.")
+        print(f"[sentiment_service] '{region_name}' 감정 점수({score}, model={model})가 저장되었습니다.")
+        publish_region_update([region_name], reason="sentiment")
         return {"status": "success", "region": region_name, "score": score}
 
     except Exception as e:
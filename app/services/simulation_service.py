@@ -0,0 +1,96 @@
+# app/services/simulation_service.py
+
+import os
+import numpy as np
+from app.utils.models import TOPIC_COLUMNS
+from app.services.gap_engine import GapEngine
+
+"""
+simulation_service.py
+"부산 의료 정책 점수가 10점 오르면 전체 지역의 gap·순위가 어떻게 바뀌는가" 같은 가정(what-if) 시나리오 계산 로직입니다.
+- DB gap 엔진 스냅샷의 지역 × 주제 행렬 복사본에 시나리오별 델타를 더해 한 번의 벡터 연산으로 재계산
+- DB(region_data)는 읽기·쓰기 모두 하지 않음 → 시나리오 수백 개를 한 요청에서 평가 가능
+- 기본 응답은 gap 또는 순위가 바뀐 지역만 포함 (changed_only=False 면 전체 지역)
+"""
+
+SIMULATION_MAX_SCENARIOS = int(os.getenv("SIMULATION_MAX_SCENARIOS", "1000"))
+SIMULATION_MAX_DELTAS = int(os.getenv("SIMULATION_MAX_DELTAS", "10000"))
+# 적용 후 점수 범위 (0~100 점수 체계), "none" 이면 자르지 않음
+_score_range = os.getenv("SIMULATION_SCORE_RANGE", "0,100")
+SIMULATION_SCORE_RANGE = None if _score_range.lower() == "none" else tuple(float(v) for v in _score_range.split(","))
+
+# 주제 키(healthcare) 또는 라벨(의료) 모두 허용
+_TOPIC_ALIASES = {key: key for key in TOPIC_COLUMNS}
+_TOPIC_ALIASES.update({cols["label"]: key for key, cols in TOPIC_COLUMNS.items()})
+
+
+def build_deltas(engine: GapEngine, scenarios: list) -> tuple[np.ndarray, np.ndarray]:
+    """
+    scenarios: [{"deltas": [{"region", "topic", "policy", "sentiment"}, ...]}, ...]
+    반환: (정책 델타, 여론 델타) — 시나리오 × 지역 × 주제, 같은 칸의 델타는 합산
+    알 수 없는 지역/주제, 개수 초과는 ValueError
+    """
+    if len(scenarios) > SIMULATION_MAX_SCENARIOS:
+        raise ValueError(f"시나리오는 최대 {SIMULATION_MAX_SCENARIOS}개까지 가능합니다.")
+    topic_index = {topic: t for t, topic in enumerate(engine.topics)}
+
+    cells, policy, sentiment = [], [], []
+    for s, scenario in enumerate(scenarios):
+        for delta in scenario["deltas"]:
+            r = engine.index.get(delta["region"])
+            if r is None:
+                raise ValueError(f"시나리오 {s}: 알 수 없는 지역 '{delta['region']}'")
+            t = topic_index.get(_TOPIC_ALIASES.get(delta["topic"]))
+            if t is None:
+                raise ValueError(f"시나리오 {s}: 알 수 없는 주제 '{delta['topic']}' (가능: {', '.join(engine.topics)})")
+            cells.append((s, r, t))
+            policy.append(delta.get("policy") or 0.0)
+            sentiment.append(delta.get("sentiment") or 0.0)
+    if len(cells) > SIMULATION_MAX_DELTAS:
+        raise ValueError(f"델타는 전체 {SIMULATION_MAX_DELTAS}개까지 가능합니다.")
+
+    shape = (len(scenarios), len(engine.regions), len(engine.topics))
+    policy_delta = np.zeros(shape)
+    sentiment_delta = np.zeros(shape)
+    if cells:
+        index = tuple(np.array(cells).T)
+        np.add.at(policy_delta, index, policy)
+        np.add.at(sentiment_delta, index, sentiment)
+    return policy_delta, sentiment_delta
+
+
+def simulate_scenarios(engine: GapEngine, scenarios: list, top_k: int = 3, changed_only: bool = True) -> list:
+    """
+    시나리오별 결과 목록
+    - gaps / ranks: 주제별 가정 gap 과 지역 순위 (1 = gap 최대)
+    - gap_changes / rank_changes: 현재 대비 변화 (rank_changes 양수 = 순위 상승, 즉 gap 이 상대적으로 커짐)
+    - top_topics: 가정 gap 기준 상위 K개 주제
+    """
+    policy_delta, sentiment_delta = build_deltas(engine, scenarios)
+    result = engine.simulate(policy_delta, sentiment_delta, score_range=SIMULATION_SCORE_RANGE)
+
+    gap_changes = np.round(result.gap - engine.gap, 2)
+    rank_changes = engine.region_rank - result.region_rank
+    changed = (gap_changes != 0).any(axis=2) | (rank_changes != 0).any(axis=2)
+    if not changed_only:
+        changed[:] = True
+
+    topics = engine.topics
+    output = []
+    for s, scenario in enumerate(scenarios):
+        regions = []
+        for r in np.flatnonzero(changed[s]).tolist():
+            gaps = result.gap[s, r].tolist()
+            regions.append({
+                "region_name": engine.regions[r],
+                "gaps": dict(zip(topics, gaps)),
+                "gap_changes": dict(zip(topics, gap_changes[s, r].tolist())),
+                "ranks": dict(zip(topics, result.region_rank[s, r].tolist())),
+                "rank_changes": dict(zip(topics, rank_changes[s, r].tolist())),
+                "top_topics": [
+                    {"topic": engine.labels[t], "topic_en": topics[t], "gap": gaps[t]}
+                    for t in result.order[s, r, :top_k].tolist()
+                ],
+            })
+        output.append({"name": scenario.get("name") or f"scenario_{s + 1}", "changed_regions": len(regions), "regions": regions})
+    return output
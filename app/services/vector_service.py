@@ -1,7 +1,6 @@
 import json
 import os
 import numpy as np
-import pandas as pd
 from collections import defaultdict
 
 BASE_PATH = "app/files"
@@ -84,44 +83,14 @@ def aggregate_topic_vectors(region_vectors):
 def find_top_gap_topics(region_vectors=None, region_name: str = None, top_k: int = 3):
     """
     ✅ app/files/gap_score.csv에서 지역별 gap 값을 불러와
-       표준 topic_map을 기준으로 상위 K개 주제 반환
+       표준 topic_map을 기준으로 상위 K개 주제 반환 (reference_data 스냅샷 사용)
     """
+    # 순환 import 방지 (reference_data → gap_engine 이 topic_map 을 참조)
+    from app.services.reference_data import get_reference_gap_engine
+
     if not region_name:
         raise ValueError("⚠️ region_name이 필요합니다.")
-    if not os.path.exists(GAP_CSV_PATH):
-        raise FileNotFoundError(f"⚠️ gap_score.csv 파일이 없습니다: {GAP_CSV_PATH}")
-
-    df = pd.read_csv(GAP_CSV_PATH)
-    if "region" not in df.columns:
-        raise ValueError("⚠️ gap_score.csv에 'region' 컬럼이 없습니다.")
-
-    # ✅ 지역 행 찾기
-    region_row = df[df["region"] == region_name]
-    if region_row.empty:
-        raise ValueError(f"⚠️ {region_name} 지역 데이터가 gap_score.csv에 없습니다.")
-    region_row = region_row.iloc[0]
-
-    # ✅ topic_map 기준으로 gap 데이터 구성
-    topic_info = []
-    for csv_col, (topic_kr, topic_en) in topic_map.items():
-        if csv_col not in df.columns:
-            print(f"⚠️ CSV에 {csv_col} 컬럼이 없습니다. 건너뜀.")
-            continue
-
-        gap_value = float(region_row[csv_col])
-        topic_info.append({
-            "topic": topic_kr,
-            "topic_en": topic_en,
-            "gap": round(gap_value, 2),
-            # 필요 시 확장 가능
-            "policy_score": None,
-            "sentiment_score": None
-        })
-
-    # ✅ gap 기준 정렬 및 상위 K개 반환
-    topic_info = sorted(topic_info, key=lambda x: x["gap"], reverse=True)[:top_k]
-
-    return topic_info
+    return get_reference_gap_engine().top_topics(region_name, top_k)
 
 
 # -------------------------------
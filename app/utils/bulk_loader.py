@@ -0,0 +1,104 @@
+# app/utils/bulk_loader.py
+
+import os
+import time
+from sqlalchemy import delete, insert, tuple_, UniqueConstraint, PrimaryKeyConstraint
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.utils.database import engine
+from app.utils.data_version import TRACKED_TABLES, bump_data_version
+
+"""
+bulk_loader.py
+init_* 데이터셋 로더가 공통으로 사용하는 대량 삽입 유틸입니다.
+- DataFrame → records 변환을 iterrows() 대신 벡터화(rename + to_dict)로 처리
+- ORM 객체 생성 없이 Core INSERT 를 executemany 로 chunk 단위 실행
+- mode
+  · replace : 테이블 전체 삭제 후 삽입 (기존 동작)
+  · append  : 삭제 없이 추가
+  · upsert  : key_cols 기준 갱신/삽입
+              key_cols 에 UNIQUE 제약이 있으면 INSERT ... ON CONFLICT DO UPDATE,
+              없으면 key_cols 값이 겹치는 기존 행만 삭제 후 삽입 (예: 파일에 포함된 지역만 교체)
+"""
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "5000"))
+BULK_MODES = ("replace", "append", "upsert")
+
+
+def dataframe_to_records(df, column_map: dict, defaults: dict | None = None) -> list:
+    """
+    CSV 컬럼명 → 모델 컬럼명 매핑 후 dict 레코드 리스트로 변환
+    - column_map: {"csv 컬럼": "모델 컬럼"}
+    - defaults: 모든 행에 공통으로 들어갈 값 (예: updated_at)
+    """
+    frame = df[list(column_map)].rename(columns=column_map)
+    for column, value in (defaults or {}).items():
+        frame[column] = value
+    return frame.to_dict("records")
+
+
+def _has_unique_key(table, key_cols) -> bool:
+    """key_cols 조합에 UNIQUE(또는 PK) 제약이 있는지 확인 (ON CONFLICT 사용 가능 여부)"""
+    keys = set(key_cols)
+    if len(keys) == 1 and table.c[key_cols[0]].unique:
+        return True
+    unique_sets = [
+        {c.name for c in constraint.columns}
+        for constraint in table.constraints
+        if isinstance(constraint, (UniqueConstraint, PrimaryKeyConstraint))
+    ]
+    unique_sets += [{c.name for c in index.columns} for index in table.indexes if index.unique]
+    return keys in unique_sets
+
+
+def _chunks(records: list, size: int):
+    for start in range(0, len(records), size):
+        yield records[start:start + size]
+
+
+def bulk_load(
+    model,
+    records: list,
+    mode: str = "replace",
+    key_cols: list | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    bind=engine,
+    log_prefix: str = "bulk_loader",
+) -> int:
+    """records 를 model 테이블에 한 트랜잭션으로 대량 삽입하고 삽입 건수를 반환"""
+    if mode not in BULK_MODES:
+        raise ValueError(f"지원하지 않는 mode 입니다: {mode} (가능: {', '.join(BULK_MODES)})")
+    if mode == "upsert" and not key_cols:
+        raise ValueError("upsert 모드에는 key_cols 가 필요합니다.")
+
+    table = model.__table__
+    started = time.perf_counter()
+
+    with bind.begin() as conn:
+        if mode == "replace":
+            conn.execute(delete(table))
+            stmt = insert(table)
+        elif mode == "upsert" and _has_unique_key(table, key_cols):
+            stmt = sqlite_insert(table)
+            update_cols = {
+                c: stmt.excluded[c] for c in (records[0] if records else {}) if c not in key_cols
+            }
+            stmt = stmt.on_conflict_do_update(index_elements=key_cols, set_=update_cols)
+        elif mode == "upsert":
+            keys = list({tuple(r[k] for k in key_cols) for r in records})
+            key_expr = tuple_(*[table.c[k] for k in key_cols]) if len(key_cols) > 1 else table.c[key_cols[0]]
+            for key_chunk in _chunks(keys, 500):
+                values = key_chunk if len(key_cols) > 1 else [k[0] for k in key_chunk]
+                conn.execute(delete(table).where(key_expr.in_(values)))
+            stmt = insert(table)
+        else:
+            stmt = insert(table)
+
+        for chunk in _chunks(records, chunk_size):
+            conn.execute(stmt, chunk)
+
+    if table.name in TRACKED_TABLES:
+        bump_data_version(f"{log_prefix}:{table.name}")
+
+    elapsed = time.perf_counter() - started
+    print(f"[{log_prefix}] {table.name}: {len(records)}건 {mode} 완료 ({elapsed:.2f}s, chunk={chunk_size})")
+    return len(records)
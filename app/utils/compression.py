@@ -0,0 +1,171 @@
+# app/utils/compression.py
+
+import os
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip 만 사용
+    brotli = None
+
+"""
+compression.py
+응답 압축 미들웨어 (Accept-Encoding 협상: br > gzip)
+- COMPRESS_MIN_SIZE 바이트 이상인 JSON/NDJSON/텍스트 응답만 압축
+- 스트리밍 응답은 청크마다 flush 하여 NDJSON 줄이 지연 없이 전달되도록 함
+- text/event-stream(SSE), 이미 Content-Encoding 이 있는 응답, 204/304 는 그대로 통과
+- 압축 시 ETag 는 약한 검증자(W/)로 바꿔 인코딩별 바이트 차이를 표시
+"""
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/geo+json", "text/")
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+# =========================================================
+# 1. 인코더
+# =========================================================
+class _GzipEncoder:
+    name = "gzip"
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31 = gzip 헤더
+
+    def encode(self, data: bytes, finish: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliEncoder:
+    name = "br"
+
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def encode(self, data: bytes, finish: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if finish else self._compressor.flush())
+
+
+_ENCODERS = {"gzip": _GzipEncoder}
+if brotli is not None:
+    _ENCODERS["br"] = _BrotliEncoder
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Accept-Encoding(q 값 포함)에서 지원 인코딩 중 가장 선호되는 것 선택 (동률이면 br 우선)"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    candidates = []
+    for name in ("br", "gzip"):
+        if name not in _ENCODERS:
+            continue
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > 0:
+            candidates.append((q, name == "br", name))
+    return max(candidates)[2] if candidates else None
+
+
+def _is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").lower()
+    if "content-encoding" in headers or content_type.startswith(EXCLUDED_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+# =========================================================
+# 2. 미들웨어
+# =========================================================
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.initial_message = None
+        self.passthrough = False
+        self.started = False
+        self.encoder = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message):
+        if message["type"] == "http.response.start":
+            # 헤더 수정 여부는 첫 body 를 본 뒤 결정
+            self.initial_message = message
+            self.passthrough = (
+                message["status"] in (204, 304)
+                or not _is_compressible(Headers(raw=message["headers"]))
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if self.passthrough or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            self.encoder = _ENCODERS[self.encoding]()
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+
+            message["body"] = self.encoder.encode(body, finish=not more_body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(message["body"]))
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if not self.passthrough:
+            message["body"] = self.encoder.encode(body, finish=not more_body)
+        await self.send(message)
@@ -0,0 +1,200 @@
+# app/utils/data_version.py
+
+import os
+import time
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime, event, select, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.orm import Session
+from app.utils.database import Base, engine, async_read_engine
+
+"""
+data_version.py
+지역 데이터(region_data, rag_summary)의 변경 버전을 관리합니다. 응답 캐시/ETag 의 기준 값입니다.
+- 쓰기 경로는 커밋 후 bump_data_version() 으로 data_version 테이블의 버전을 올림
+  · ORM 세션: 추적 테이블 변경이 포함된 커밋이면 자동 bump (세션 이벤트)
+  · Core 일괄 쓰기(bulk_loader, gap UPDATE 등): 명시적으로 호출
+- 읽기 경로는 DATA_VERSION_CHECK_INTERVAL 초마다 한 번만 DB 버전을 확인하고 그 사이에는 메모리 값 사용
+  (다른 프로세스의 쓰기나 버전을 올리지 않은 스크립트도 max(updated_at) 로 감지)
+- add_version_listener(): 버전 변경 알림 (이 프로세스의 bump 는 external=False, 외부 쓰기 감지는 external=True)
+"""
+
+DATA_VERSION_CHECK_INTERVAL = float(os.getenv("DATA_VERSION_CHECK_INTERVAL", "2"))
+TRACKED_TABLES = {"region_data", "rag_summary"}
+VERSION_NAME = "region"
+
+DataVersionInfo = namedtuple("DataVersionInfo", ["token", "last_modified"])
+
+
+class DataVersion(Base):
+    """이름별 데이터 버전 (쓰기 시 +1)"""
+    __tablename__ = "data_version"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+
+_lock = threading.Lock()
+_state = {"info": None, "checked_at": 0.0}
+_listeners = []
+
+
+def _utcnow() -> datetime:
+    # HTTP 날짜(Last-Modified)는 초 단위
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).replace(microsecond=0)
+
+
+def _make_info(version: int | None, version_at: datetime | None, max_updated_at: datetime | None) -> DataVersionInfo:
+    stamps = [t for t in (_as_utc(version_at), _as_utc(max_updated_at)) if t]
+    last_modified = max(stamps) if stamps else _utcnow()
+    return DataVersionInfo(f"{version or 0}.{int(last_modified.timestamp())}", last_modified)
+
+
+def _version_queries():
+    return (
+        select(DataVersion.version, DataVersion.updated_at).where(DataVersion.name == VERSION_NAME),
+        select(func.max(Base.metadata.tables["region_data"].c.updated_at)),
+    )
+
+
+def add_version_listener(listener):
+    """listener(info: DataVersionInfo, reason: str, external: bool) 등록 (쓰기 스레드·이벤트 루프 어느 쪽에서도 호출됨)"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _notify(info: DataVersionInfo, reason: str, external: bool):
+    for listener in list(_listeners):
+        try:
+            listener(info, reason, external)
+        except Exception as e:
+            print(f"[data_version] ⚠️ 버전 변경 알림 실패: {e}")
+
+
+# =========================================================
+# 1. 쓰기 경로: 버전 증가
+# =========================================================
+def bump_data_version(reason: str = "") -> int | None:
+    """데이터 버전 +1 (커밋 이후 호출), 실패해도 쓰기 작업 자체는 영향 없음"""
+    now = _utcnow()
+    table = DataVersion.__table__
+    try:
+        with engine.begin() as conn:
+            stmt = sqlite_insert(table).values(name=VERSION_NAME, version=1, updated_at=now)
+            conn.execute(stmt.on_conflict_do_update(
+                index_elements=["name"],
+                set_={"version": table.c.version + 1, "updated_at": now},
+            ))
+            version_stmt, updated_stmt = _version_queries()
+            version, version_at = conn.execute(version_stmt).one()
+            max_updated_at = conn.execute(updated_stmt).scalar()
+    except Exception as e:
+        print(f"[data_version] ⚠️ 버전 갱신 실패: {e}")
+        return None
+
+    info = _make_info(version, version_at, max_updated_at)
+    with _lock:
+        _state["info"] = info
+        _state["checked_at"] = time.monotonic()
+    print(f"[data_version] 데이터 버전 → {version} ({reason or 'write'})")
+    _notify(info, reason or "write", external=False)
+    return version
+
+
+def current_data_version() -> DataVersionInfo:
+    """마지막으로 확인한 버전 (쓰기 직후 동기 코드에서 사용, 아직 없으면 DB 조회)"""
+    with _lock:
+        info = _state["info"]
+    if info is not None:
+        return info
+    version_stmt, updated_stmt = _version_queries()
+    with engine.connect() as conn:
+        row = conn.execute(version_stmt).first()
+        max_updated_at = conn.execute(updated_stmt).scalar()
+    return _make_info(row.version if row else 0, row.updated_at if row else None, max_updated_at)
+
+
+# =========================================================
+# 2. 읽기 경로: 현재 버전 (주기적으로만 DB 확인)
+# =========================================================
+async def get_data_version() -> DataVersionInfo:
+    with _lock:
+        info, checked_at = _state["info"], _state["checked_at"]
+    if info is not None and time.monotonic() - checked_at < DATA_VERSION_CHECK_INTERVAL:
+        return info
+
+    version_stmt, updated_stmt = _version_queries()
+    async with async_read_engine.connect() as conn:
+        row = (await conn.execute(version_stmt)).first()
+        max_updated_at = (await conn.execute(updated_stmt)).scalar()
+    info = _make_info(row.version if row else 0, row.updated_at if row else None, max_updated_at)
+
+    with _lock:
+        previous = _state["info"]
+        _state["info"] = info
+        _state["checked_at"] = time.monotonic()
+    # 이 프로세스가 올린 버전이 아닌데 토큰이 바뀌었으면 다른 프로세스/스크립트의 쓰기
+    if previous is not None and previous.token != info.token:
+        _notify(info, "external", external=True)
+    return info
+
+
+# =========================================================
+# 3. ORM 세션 자동 추적
+# =========================================================
+def _mark_changed(session: Session):
+    session.info["data_version_changed"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if getattr(obj, "__tablename__", None) in TRACKED_TABLES:
+            _mark_changed(session)
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_orm_execute(orm_execute_state):
+    """session.execute(update(...)/delete(...)) 같은 ORM 일괄 쓰기 추적"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.local_table.name not in TRACKED_TABLES:
+        return
+    if orm_execute_state.is_insert:
+        _mark_changed(orm_execute_state.session)
+        return
+
+    # UPDATE/DELETE 는 실제로 바뀐 행이 있을 때만 (0행이면 버전 유지)
+    # RETURNING 결과는 rowcount 를 알 수 없으므로 고정(freeze)해서 반환 행 유무로 판단
+    result = orm_execute_state.invoke_statement()
+    if isinstance(result, CursorResult) and not result.returns_rows:
+        if result.rowcount != 0:
+            _mark_changed(orm_execute_state.session)
+        return result
+    frozen = result.freeze()
+    if frozen.data:
+        _mark_changed(orm_execute_state.session)
+    return frozen()
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session):
+    if session.info.pop("data_version_changed", False):
+        bump_data_version("commit")
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_after_rollback(session):
+    session.info.pop("data_version_changed", None)
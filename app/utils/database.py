@@ -1,6 +1,8 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 Base = declarative_base()
 
@@ -10,16 +12,137 @@ ROOT_DIR = os.path.dirname(BASE_DIR)  # welling_backend/
 DB_PATH = os.path.join(ROOT_DIR, "region_data.db")
 
 DATABASE_URL = f"sqlite:///{DB_PATH}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
 
 # ✅ 로그 출력
 print(f"[database.py] SQLite 연결 경로: {DB_PATH}")
 
+# ============================================================
+# ⚙️ SQLite 엔진 프로필
+# - default   : 기존 동작 (rollback journal, 기본 캐시, 단일 풀)
+# - production: WAL + synchronous=NORMAL + mmap/cache 튜닝, 읽기 전용 풀 분리
+# 각 값은 DB_* 환경변수로 개별 override 가능
+# ============================================================
+DB_PROFILE = os.getenv("DB_PROFILE", "default").strip().lower()
+
+SQLITE_PROFILES = {
+    "default": {
+        "journal_mode": None,
+        "synchronous": None,
+        "cache_size_kb": None,
+        "mmap_size": None,
+        "temp_store": None,
+        "busy_timeout_ms": 5000,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "read_pool_size": 0,  # 0이면 읽기 전용 풀 없이 쓰기 엔진 공유
+    },
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size_kb": 64 * 1024,      # 연결당 64MB 페이지 캐시
+        "mmap_size": 256 * 1024 * 1024,  # 256MB 메모리 맵 I/O
+        "temp_store": "MEMORY",
+        "busy_timeout_ms": 10000,
+        "pool_size": 5,
+        "max_overflow": 5,
+        "read_pool_size": 10,
+    },
+}
+
+if DB_PROFILE not in SQLITE_PROFILES:
+    raise ValueError(f"[database.py] 지원하지 않는 DB_PROFILE 입니다: {DB_PROFILE}")
+
+
+def _setting(name: str, cast=int):
+    value = os.getenv(f"DB_{name.upper()}")
+    return cast(value) if value not in (None, "") else SQLITE_PROFILES[DB_PROFILE][name]
+
+
+DB_JOURNAL_MODE = _setting("journal_mode", str)
+DB_SYNCHRONOUS = _setting("synchronous", str)
+DB_CACHE_SIZE_KB = _setting("cache_size_kb")
+DB_MMAP_SIZE = _setting("mmap_size")
+DB_TEMP_STORE = _setting("temp_store", str)
+DB_BUSY_TIMEOUT_MS = _setting("busy_timeout_ms")
+DB_POOL_SIZE = _setting("pool_size")
+DB_MAX_OVERFLOW = _setting("max_overflow")
+DB_READ_POOL_SIZE = _setting("read_pool_size")
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+
+def _apply_pragmas(dbapi_conn, read_only: bool = False):
+    """연결이 새로 열릴 때마다 PRAGMA 적용"""
+    cursor = dbapi_conn.cursor()
+    if DB_JOURNAL_MODE and not read_only:
+        cursor.execute(f"PRAGMA journal_mode={DB_JOURNAL_MODE}")
+    if DB_SYNCHRONOUS:
+        cursor.execute(f"PRAGMA synchronous={DB_SYNCHRONOUS}")
+    if DB_CACHE_SIZE_KB:
+        cursor.execute(f"PRAGMA cache_size=-{int(DB_CACHE_SIZE_KB)}")  # 음수 = KiB 단위
+    if DB_MMAP_SIZE:
+        cursor.execute(f"PRAGMA mmap_size={int(DB_MMAP_SIZE)}")
+    if DB_TEMP_STORE:
+        cursor.execute(f"PRAGMA temp_store={DB_TEMP_STORE}")
+    cursor.execute(f"PRAGMA busy_timeout={int(DB_BUSY_TIMEOUT_MS)}")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def _create_sqlite_engine(pool_size: int, max_overflow: int, read_only: bool = False, is_async: bool = False):
+    factory = create_async_engine if is_async else create_engine
+    connect_args = {"timeout": DB_BUSY_TIMEOUT_MS / 1000}
+    extra = {}
+    if is_async:
+        # aiosqlite 기본값은 NullPool(매 요청 연결)이므로 풀을 명시
+        extra["poolclass"] = AsyncAdaptedQueuePool
+    else:
+        connect_args["check_same_thread"] = False
+
+    sqlite_engine = factory(
+        ASYNC_DATABASE_URL if is_async else DATABASE_URL,
+        connect_args=connect_args,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=DB_POOL_TIMEOUT,
+        **extra,
+    )
+    # async 엔진은 내부 sync_engine 에 이벤트를 등록해야 PRAGMA가 적용됨
+    event.listen(
+        sqlite_engine.sync_engine if is_async else sqlite_engine, "connect",
+        lambda dbapi_conn, _record: _apply_pragmas(dbapi_conn, read_only=read_only),
+    )
+    return sqlite_engine
+
+
 # SQLAlchemy 세션/엔진 설정
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = _create_sqlite_engine(DB_POOL_SIZE, DB_MAX_OVERFLOW)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# ✅ GET 엔드포인트 전용 읽기 풀 (WAL 모드에서는 파이프라인 쓰기 중에도 대기 없이 읽기 가능)
+if DB_READ_POOL_SIZE > 0:
+    read_engine = _create_sqlite_engine(DB_READ_POOL_SIZE, DB_READ_POOL_SIZE, read_only=True)
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# ✅ async 엔진/세션 (aiosqlite) — 스레드풀을 점유하지 않는 async 엔드포인트용
+async_engine = _create_sqlite_engine(DB_POOL_SIZE, DB_MAX_OVERFLOW, is_async=True)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+if DB_READ_POOL_SIZE > 0:
+    async_read_engine = _create_sqlite_engine(DB_READ_POOL_SIZE, DB_READ_POOL_SIZE, read_only=True, is_async=True)
+else:
+    async_read_engine = async_engine
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+print(
+    f"[database.py] DB 프로필: {DB_PROFILE} "
+    f"(journal={DB_JOURNAL_MODE or 'default'}, pool={DB_POOL_SIZE}+{DB_MAX_OVERFLOW}, "
+    f"read_pool={DB_READ_POOL_SIZE or 'shared'})"
+)
+
 
 def get_db():
     """FastAPI 의존성 주입용 세션"""
@@ -30,6 +153,34 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """FastAPI 의존성 주입용 읽기 전용 세션 (GET 엔드포인트용)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """FastAPI 의존성 주입용 async 세션"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """FastAPI 의존성 주입용 async 읽기 전용 세션 (async GET 엔드포인트용)"""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engines():
+    """서버 종료 시 async 커넥션 풀 정리"""
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+
 def get_engine():
     """테이블 생성용 엔진 반환"""
     return engine
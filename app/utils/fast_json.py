@@ -0,0 +1,194 @@
+# app/utils/fast_json.py
+
+import os
+import json
+import hashlib
+import decimal
+import datetime
+from pathlib import Path
+import numpy as np
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 표준 json 으로 동작
+    orjson = None
+
+"""
+fast_json.py
+대용량 응답·결과 파일용 JSON 직렬화 유틸입니다.
+- dumps(): orjson 기반 bytes 직렬화 (한글 그대로, datetime·NumPy 배열/스칼라 지원, NaN → null)
+- FastJSONResponse: 앱 기본 응답 클래스 (FastAPI(default_response_class=...))
+- write_json_output(): output/ 결과 파일 저장과 응답 본문 생성을 한 번의 직렬화로 처리
+- load_jsonl_checkpoint() / append_jsonl(): 긴 작업의 항목별 결과를 JSONL 로 즉시 기록하고 재실행 시 이어서 처리
+  (checkpoint_run_id() 로 입력이 같은 실행의 결과만 재사용, 다른 실행의 결과는 보관 파일로 이동)
+- json_envelope(): 이미 직렬화된 data bytes 를 {"status":..., "data": ...} 형태로 감싸기 (재직렬화 없음)
+- ndjson_response(): async iterator 의 객체를 한 줄씩 스트리밍 (배치 API 용)
+"""
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+OUTPUT_JSON_PRETTY = os.getenv("OUTPUT_JSON_PRETTY", "false").strip().lower() in ("1", "true", "yes")
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    """orjson / json 이 기본 지원하지 않는 타입 변환"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        # pandas.Timestamp 등 datetime 하위 클래스 포함
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    raise TypeError(f"JSON 직렬화를 지원하지 않는 타입입니다: {type(obj).__name__}")
+
+
+def dumps(obj, pretty: bool = False) -> bytes:
+    """obj → UTF-8 JSON bytes (기본 compact)"""
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if pretty else _ORJSON_OPTIONS
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(
+        obj,
+        default=_default,
+        ensure_ascii=False,
+        indent=2 if pretty else None,
+        separators=None if pretty else (",", ":"),
+    ).encode("utf-8")
+
+
+def loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 기반 기본 응답 클래스"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def raw_json_response(body: bytes, status_code: int = 200, headers: dict | None = None) -> Response:
+    """이미 직렬화된 JSON bytes 를 그대로 응답 (jsonable_encoder·재직렬화 생략)"""
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
+
+
+def ndjson_response(items) -> StreamingResponse:
+    """items(async iterator) 의 각 객체를 JSON 한 줄로 직렬화해 도착하는 대로 전송"""
+    async def _lines():
+        async for item in items:
+            yield dumps(item) + b"\n"
+
+    return StreamingResponse(_lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def json_envelope(data_body: bytes, **meta) -> bytes:
+    """meta 필드 + "data": data_body 를 하나의 JSON 객체 bytes 로 결합"""
+    head = dumps(meta)[:-1]  # 마지막 '}' 제거
+    separator = b"," if meta else b""
+    return head + separator + b'"data":' + data_body + b"}"
+
+
+def write_json_output(path, payload, pretty: bool = OUTPUT_JSON_PRETTY) -> bytes:
+    """
+    payload 를 한 번 직렬화해 path 에 저장하고 compact bytes 를 반환
+    - 임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 반쯤 쓰인 파일을 보지 않음
+    - pretty=True (OUTPUT_JSON_PRETTY) 일 때만 파일용 들여쓰기 버전을 추가로 생성
+    """
+    body = dumps(payload)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(dumps(payload, pretty=True) if pretty else body)
+    os.replace(tmp_path, path)
+    return body
+
+
+def checkpoint_run_id(*parts) -> str:
+    """결과를 결정하는 입력(프롬프트 재료·모델 등)으로 체크포인트 실행 식별자 생성 → 입력이 바뀌면 다른 값"""
+    return hashlib.sha1(dumps(list(parts))).hexdigest()[:16]
+
+
+def file_digest(path) -> str | None:
+    """파일 내용 해시 (mtime 과 달리 같은 내용으로 다시 써도 그대로, 파일이 없으면 None)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def checkpoint_archive_path(path) -> Path:
+    """다른 실행의 체크포인트 줄을 옮겨 두는 보관 파일 (예: result.jsonl → result.archive.jsonl)"""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.archive{path.suffix}")
+
+
+def load_jsonl_checkpoint(path, key, run_id: str | None = None) -> tuple:
+    """
+    JSONL 체크포인트 로드 → ({key(item): item}, 보관 파일로 옮긴 줄 수)
+    - 마지막 줄이 기록 도중 끊긴 경우(개행 없음/깨진 JSON) 그 줄을 잘라내 이후 append 가 이어지도록 복구
+    - run_id 지정 시 같은 run_id 로 기록된 줄만 사용 (반환 항목에서는 run_id 제거)
+      다른 실행의 줄은 삭제하지 않고 보관 파일(checkpoint_archive_path)에 추가한 뒤 체크포인트에서만 뺌
+    - 파일이 없으면 빈 dict
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}, 0
+
+    data = path.read_bytes()
+    complete = data[:data.rfind(b"\n") + 1]
+    if len(complete) != len(data):
+        with open(path, "r+b") as f:
+            f.truncate(len(complete))
+        print(f"[fast_json] ⚠️ 체크포인트 마지막 줄이 불완전해 잘라냈습니다: {path}")
+
+    items, stale = {}, []
+    for line in complete.splitlines():
+        if not line.strip():
+            continue
+        try:
+            item = loads(line)
+        except ValueError:
+            print(f"[fast_json] ⚠️ 체크포인트의 잘못된 줄을 건너뜁니다: {path}")
+            continue
+        if run_id is not None and item.get("run_id") != run_id:
+            stale.append(line)
+            continue
+        item.pop("run_id", None)
+        items[key(item)] = item
+
+    if stale:
+        # 보관 파일에 먼저 기록(fsync)한 뒤 체크포인트를 다시 써서, 중간에 멈춰도 결과가 사라지지 않게 함
+        archive_path = checkpoint_archive_path(path)
+        with open(archive_path, "ab") as f:
+            f.write(b"\n".join(stale) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            for item in items.values():
+                f.write(dumps({**item, "run_id": run_id}) + b"\n")
+        os.replace(tmp_path, path)
+        print(f"[fast_json] ⚠️ 다른 실행의 체크포인트 {len(stale)}건을 보관 파일로 옮겼습니다: {archive_path}")
+    return items, len(stale)
+
+
+def append_jsonl(f, item) -> None:
+    """item 을 JSON 한 줄로 추가하고 디스크까지 flush (f: 바이너리 append 모드 파일)"""
+    f.write(dumps(item) + b"\n")
+    f.flush()
+    os.fsync(f.fileno())
@@ -0,0 +1,124 @@
+# app/utils/fts.py
+
+import os
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+"""
+fts.py
+SQLite FTS5 전문 검색 테이블(외부 콘텐츠 방식)과 동기화 트리거를 관리합니다.
+- sentiment_log_fts : sentiment_analysis_log.text
+- rag_summary_fts   : rag_summary.topic, rag_summary.summary
+원본 테이블의 INSERT/UPDATE/DELETE 트리거로 색인이 자동 동기화됩니다.
+
+토크나이저
+- trigram (기본): 띄어쓰기·조사와 무관하게 한국어 부분 문자열 검색 가능 (SQLite 3.34+)
+  단, 3글자 미만 검색어는 trigram 색인으로 찾을 수 없으므로 아래 단어 색인을 함께 둡니다.
+- unicode61: trigram 을 지원하지 않는 SQLite 에서 자동 대체 (어절 단위 검색)
+FTS_TOKENIZER 환경변수로 강제 지정할 수 있습니다.
+
+짧은 검색어용 단어 색인 (*_word_fts)
+- unicode61 + prefix='1 2' 색인으로 1~2글자 검색어를 어절 접두어("교통" → 교통이/교통은 …)로 조회
+"""
+
+FTS_TOKENIZER = os.getenv("FTS_TOKENIZER", "trigram").strip().lower()
+
+TOKENIZER_OPTIONS = {
+    "trigram": "trigram case_sensitive 0",
+    "unicode61": "unicode61 remove_diacritics 2",
+}
+
+# ✅ FTS 테이블 정의: (원본 테이블, 색인 컬럼)
+FTS_TABLES = {
+    "sentiment_log_fts": ("sentiment_analysis_log", ["text"]),
+    "rag_summary_fts": ("rag_summary", ["topic", "summary"]),
+}
+
+# ✅ 짧은 검색어용 단어 색인: 본 색인 이름 → 단어 색인 이름 (원본/컬럼은 본 색인과 동일)
+WORD_FTS_TABLES = {
+    "sentiment_log_fts": "sentiment_log_word_fts",
+    "rag_summary_fts": "rag_summary_word_fts",
+}
+WORD_FTS_OPTIONS = f"tokenize='{TOKENIZER_OPTIONS['unicode61']}', prefix='1 2'"
+
+
+def _table_exists(conn, name: str) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": name}
+    ).first() is not None
+
+
+def _create_virtual_table(conn, fts_name: str, source: str, columns: list, options: str):
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE {fts_name} USING fts5("
+        f"{', '.join(columns)}, content='{source}', content_rowid='id', {options})"
+    ))
+
+
+def _create_fts_table(conn, fts_name: str, source: str, columns: list):
+    """토크나이저 우선순위대로 생성 시도 후 실제 사용한 토크나이저 반환"""
+    candidates = [FTS_TOKENIZER] + [t for t in TOKENIZER_OPTIONS if t != FTS_TOKENIZER]
+    for tokenizer in candidates:
+        try:
+            _create_virtual_table(conn, fts_name, source, columns, f"tokenize='{TOKENIZER_OPTIONS[tokenizer]}'")
+            return tokenizer
+        except OperationalError as e:
+            print(f"[fts] ⚠️ {tokenizer} 토크나이저 사용 불가 → 대체 시도 ({e})")
+    raise RuntimeError(f"[fts] {fts_name} 생성 실패: 사용 가능한 FTS5 토크나이저가 없습니다.")
+
+
+def _create_triggers(conn, fts_name: str, source: str, columns: list):
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts_name}_ai AFTER INSERT ON {source} BEGIN "
+        f"INSERT INTO {fts_name}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts_name}_ad AFTER DELETE ON {source} BEGIN "
+        f"INSERT INTO {fts_name}({fts_name}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts_name}_au AFTER UPDATE OF {cols} ON {source} BEGIN "
+        f"INSERT INTO {fts_name}({fts_name}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts_name}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+    ))
+
+
+def ensure_fts(conn) -> list:
+    """FTS 테이블/트리거가 없으면 생성하고 기존 데이터로 색인 구축 (여러 번 실행해도 안전)"""
+    created = []
+    for fts_name, (source, columns) in FTS_TABLES.items():
+        if not _table_exists(conn, source):
+            continue
+        if not _table_exists(conn, fts_name):
+            tokenizer = _create_fts_table(conn, fts_name, source, columns)
+            conn.execute(text(f"INSERT INTO {fts_name}({fts_name}) VALUES ('rebuild')"))
+            created.append(fts_name)
+            print(f"[fts] {fts_name} 생성 및 색인 구축 완료 (tokenizer={tokenizer})")
+        _create_triggers(conn, fts_name, source, columns)
+
+        word_name = WORD_FTS_TABLES.get(fts_name)
+        if word_name and not _table_exists(conn, word_name):
+            _create_virtual_table(conn, word_name, source, columns, WORD_FTS_OPTIONS)
+            conn.execute(text(f"INSERT INTO {word_name}({word_name}) VALUES ('rebuild')"))
+            created.append(word_name)
+            print(f"[fts] {word_name} 생성 및 색인 구축 완료 (짧은 검색어용 단어 색인)")
+        if word_name:
+            _create_triggers(conn, word_name, source, columns)
+    return created
+
+
+def rebuild_fts(conn, fts_name: str | None = None):
+    """원본 테이블 기준 색인 재구축 (트리거 밖에서 대량 변경한 경우)"""
+    for name in [fts_name] if fts_name else [*FTS_TABLES, *WORD_FTS_TABLES.values()]:
+        conn.execute(text(f"INSERT INTO {name}({name}) VALUES ('rebuild')"))
+
+
+def get_fts_tokenizer(conn, fts_name: str) -> str:
+    """생성된 FTS 테이블의 토크나이저 이름 (trigram | unicode61)"""
+    sql = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE name = :name"), {"name": fts_name}
+    ).scalar() or ""
+    return "trigram" if "trigram" in sql else "unicode61"
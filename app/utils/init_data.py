@@ -1,8 +1,32 @@
 import os
+import sys
 import pandas as pd
 from datetime import datetime, timezone
 from app.utils.database import SessionLocal, get_engine
 from app.utils.models import Base, RegionData
+from app.utils.bulk_loader import dataframe_to_records, bulk_load
+from app.services.gap_calculator import update_dirty_gap_scores
+
+# CSV 컬럼 → RegionData 컬럼 매핑
+REGION_COLUMN_MAP = {
+    "region": "region_name",
+
+    "policy_avg_score": "policy_avg_score",
+    "transport_infra_policy_score": "transport_infra_policy_score",
+    "labor_economy_policy_score": "labor_economy_policy_score",
+    "healthcare_policy_score": "healthcare_policy_score",
+    "policy_efficiency_score": "policy_efficiency_score",
+    "housing_environment_policy_score": "housing_environment_policy_score",
+
+    "sentiment_avg_score": "sentiment_avg_score",
+    "sentiment_transport_infra_score": "sentiment_transport_infra_score",
+    "sentiment_labor_economy_score": "sentiment_labor_economy_score",
+    "sentiment_healthcare_score": "sentiment_healthcare_score",
+    "sentiment_policy_efficiency_score": "sentiment_policy_efficiency_score",
+    "sentiment_housing_environment_score": "sentiment_housing_environment_score",
+
+    "gap_score": "gap_score",
+}
 
 
 def create_tables_if_not_exist():
@@ -12,10 +36,13 @@ def create_tables_if_not_exist():
     print("[init_data] 테이블 확인/생성 완료")
 
 
-def insert_real_dataset():
-    db = SessionLocal()
+def insert_real_dataset(mode: str = "replace"):
+    """
+    마스터 데이터셋을 region_data 테이블에 bulk 삽입
+    - mode: replace(전체 교체) | append | upsert(region_name 기준 갱신)
+    """
     try:
-        print("[init_data] 실제 데이터셋 삽입을 시작합니다...")
+        print(f"[init_data] 실제 데이터셋 삽입을 시작합니다... (mode={mode})")
 
         base_dir = os.path.dirname(os.path.abspath(__file__))
         csv_path = os.path.normpath(os.path.join(base_dir, "../files/Welling_Master_dataset.csv"))
@@ -29,45 +56,28 @@ def insert_real_dataset():
 
         # NaN 값 0.0으로 대체
         df = df.fillna(0.0)
-
-        db.query(RegionData).delete()
-
-        for _, row in df.iterrows():
-            new_region = RegionData(
-                region_name=row["region"],
-
-                policy_avg_score=float(row["policy_avg_score"]),
-                transport_infra_policy_score=float(row["transport_infra_policy_score"]),
-                labor_economy_policy_score=float(row["labor_economy_policy_score"]),
-                healthcare_policy_score=float(row["healthcare_policy_score"]),
-                policy_efficiency_score=float(row["policy_efficiency_score"]),
-                housing_environment_policy_score=float(row["housing_environment_policy_score"]),
-
-                sentiment_avg_score=float(row["sentiment_avg_score"]),
-                sentiment_transport_infra_score=float(row["sentiment_transport_infra_score"]),
-                sentiment_labor_economy_score=float(row["sentiment_labor_economy_score"]),
-                sentiment_healthcare_score=float(row["sentiment_healthcare_score"]),
-                sentiment_policy_efficiency_score=float(row["sentiment_policy_efficiency_score"]),
-                sentiment_housing_environment_score=float(row["sentiment_housing_environment_score"]),
-
-                gap_score=float(row["gap_score"]),
-                updated_at=datetime.now(timezone.utc),
-            )
-            db.add(new_region)
-
-        db.commit()
-        print(f"[init_data] ✅ {len(df)}개 지역 데이터 삽입 완료")
+        score_cols = [c for c in REGION_COLUMN_MAP if c != "region"]
+        df[score_cols] = df[score_cols].astype(float)
+
+        records = dataframe_to_records(
+            df, REGION_COLUMN_MAP, defaults={"updated_at": datetime.now(timezone.utc), "gap_dirty": True}
+        )
+        inserted = bulk_load(RegionData, records, mode=mode, key_cols=["region_name"], log_prefix="init_data")
+        print(f"[init_data] ✅ {inserted}개 지역 데이터 삽입 완료")
+
+        # 주제별 gap 은 CSV 에 없으므로 삽입/갱신된 지역만 바로 계산
+        db = SessionLocal()
+        try:
+            update_dirty_gap_scores(db)
+        finally:
+            db.close()
 
     except Exception as e:
-        db.rollback()
         print(f"[init_data] ❌ 오류 발생: {e}")
-    finally:
-        db.close()
-        print("[init_data] DB 세션이 종료되었습니다.")
 
 
 if __name__ == "__main__":
     print("[init_data.py] Welling 실제 데이터셋 초기화를 시작합니다...")
     create_tables_if_not_exist()
-    insert_real_dataset()
+    insert_real_dataset(*sys.argv[1:2])
     print("[init_data.py] 작업 완료 ✅")
@@ -1,47 +1,44 @@
 import pandas as pd
 import os
-from app.utils.database import SessionLocal
+import sys
 from app.utils.models import RagPolicy
+from app.utils.bulk_loader import dataframe_to_records, bulk_load
 
+RAG_POLICY_COLUMN_MAP = {
+    "region": "region",
+    "policy": "policy",
+}
 
-def insert_rag_policy_data():
-    db = SessionLocal()
-    print("[init_rag_policy] RAG 정책 데이터 삽입을 시작합니다...")
+
+def insert_rag_policy_data(mode: str = "replace"):
+    """
+    RAG 정책 데이터셋을 rag_policy 테이블에 bulk 삽입
+    - mode: replace(전체 교체) | append | upsert(CSV에 포함된 지역의 정책만 교체)
+    """
+    print(f"[init_rag_policy] RAG 정책 데이터 삽입을 시작합니다... (mode={mode})")
 
     try:
-        # ✅ CSV 경로
+        # ✅ CSV 경로 (저장소 파일명: Rag_Policy_dataset.csv)
         base_dir = os.path.dirname(os.path.abspath(__file__))
-        csv_path = os.path.join(base_dir, "../files/rag_policy_dataset.csv")
+        csv_path = os.path.join(base_dir, "../files/Rag_Policy_dataset.csv")
         csv_path = os.path.normpath(csv_path)
 
         if not os.path.exists(csv_path):
             print(f"[init_rag_policy] ❌ CSV 파일이 존재하지 않습니다: {csv_path}")
             return
 
-        # ✅ CSV 로드
-        df = pd.read_csv(csv_path)
+        # ✅ CSV 로드 (trailing comma 로 생기는 빈 컬럼 제외)
+        df = pd.read_csv(csv_path, usecols=list(RAG_POLICY_COLUMN_MAP))
+        df = df.dropna(subset=["region", "policy"])
         print(f"[init_rag_policy] CSV 로드 완료: {len(df)}개 행")
 
-        # ✅ 기존 데이터 초기화
-        db.query(RagPolicy).delete()
-
         # ✅ 데이터 삽입
-        for _, row in df.iterrows():
-            record = RagPolicy(
-                region=row["region"],
-                policy=row["policy"]
-            )
-            db.add(record)
-
-        db.commit()
-        print(f"[init_rag_policy] ✅ {len(df)}개 행 삽입 완료")
+        records = dataframe_to_records(df, RAG_POLICY_COLUMN_MAP)
+        inserted = bulk_load(RagPolicy, records, mode=mode, key_cols=["region"], log_prefix="init_rag_policy")
+        print(f"[init_rag_policy] ✅ {inserted}개 행 삽입 완료")
     except Exception as e:
-        db.rollback()
         print(f"[init_rag_policy] ❌ 오류 발생: {e}")
-    finally:
-        db.close()
-        print("[init_rag_policy] DB 세션이 종료되었습니다.")
 
 
 if __name__ == "__main__":
-    insert_rag_policy_data()
+    insert_rag_policy_data(*sys.argv[1:2])
@@ -1,14 +1,29 @@
 import pandas as pd
-from datetime import datetime
-from app.utils.database import SessionLocal
+import sys
+from datetime import datetime, timezone
 from app.utils.models import SentimentAnalysisLog
+from app.utils.regions import normalize_region_key
+from app.utils.bulk_loader import dataframe_to_records, bulk_load
+from app.services.sentiment_aggregate_service import rebuild_sentiment_aggregates, clear_partition_summaries
 import os
 
+SENTIMENT_COLUMN_MAP = {
+    "region": "region",
+    "region_key": "region_key",
+    "topic": "topic",
+    "text": "text",
+    "label": "label",
+    "created_at": "created_at",
+    "partition_key": "partition_key",
+}
 
-def insert_sentiment_dataset():
-    """여론 데이터셋(senti_dataset.csv)을 sentiment_analysis_log 테이블에 삽입"""
-    db = SessionLocal()
-    print("[init_sentiment_data] Welling 여론 데이터셋 초기화를 시작합니다...")
+
+def insert_sentiment_dataset(mode: str = "replace"):
+    """
+    여론 데이터셋(senti_dataset.csv)을 sentiment_analysis_log 테이블에 bulk 삽입
+    - mode: replace(전체 교체) | append | upsert(CSV에 포함된 지역의 기존 로그만 교체)
+    """
+    print(f"[init_sentiment_data] Welling 여론 데이터셋 초기화를 시작합니다... (mode={mode})")
 
     try:
         # ✅ CSV 경로 지정
@@ -22,38 +37,45 @@ def insert_sentiment_dataset():
             print("[init_sentiment_data] ❌ CSV 파일을 찾을 수 없습니다.")
             return
 
-        # ✅ CSV 로드
-        df = pd.read_csv(csv_path)
+        # ✅ CSV 로드 (필요한 컬럼만)
+        df = pd.read_csv(csv_path, usecols=lambda c: c in {"region", "topic", "text", "label", "created_at"})
         print(f"[init_sentiment_data] CSV 로드 완료: {len(df)}개 행")
 
-        # ✅ 기존 데이터 초기화
-        db.query(SentimentAnalysisLog).delete()
-        print("[init_sentiment_data] 기존 데이터 초기화 완료")
+        # ✅ 벡터화 전처리 — region_key 는 고유 지역명 단위로 한 번만 정규화
+        df["label"] = df["label"].astype(int)
+        region_keys = {name: normalize_region_key(name) for name in df["region"].unique()}
+        df["region_key"] = df["region"].map(region_keys)
+
+        # ✅ 수집 시각 컬럼이 없으면 적재 시각 기준 현재 월 파티션으로 삽입
+        if "created_at" in df.columns:
+            df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
+        else:
+            df["created_at"] = datetime.now(timezone.utc)
+        df["partition_key"] = df["created_at"].dt.strftime("%Y-%m")
 
         # ✅ 데이터 삽입
-        inserted = 0
-        for _, row in df.iterrows():
-            entry = SentimentAnalysisLog(
-                region=row["region"],
-                topic=row["topic"],
-                text=row["text"],
-                label=int(row["label"]),
-            )
-            db.add(entry)
-            inserted += 1
-
-        db.commit()
+        records = dataframe_to_records(df, SENTIMENT_COLUMN_MAP)
+        inserted = bulk_load(
+            SentimentAnalysisLog, records, mode=mode, key_cols=["region"], log_prefix="init_sentiment_data"
+        )
+
         print(f"[init_sentiment_data] ✅ {inserted}개 행이 성공적으로 삽입되었습니다.")
+
+        # ✅ 교체된 원본 로그의 압축 요약도 제거 (남겨두면 같은 월이 이중 집계됨)
+        if mode == "replace":
+            clear_partition_summaries()
+        elif mode == "upsert":
+            clear_partition_summaries(list(set(region_keys.values())))
+
+        # ✅ Core bulk INSERT 는 ORM 이벤트를 거치지 않으므로 집계 테이블 일괄 재구축
+        rebuild_sentiment_aggregates()
         print(f"[init_sentiment_data] 완료 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
     except Exception as e:
-        db.rollback()
         print(f"[init_sentiment_data] ❌ 오류 발생: {e}")
     finally:
-        db.close()
-        print("[init_sentiment_data] DB 세션이 종료되었습니다.")
         print("[init_sentiment_data.py] 작업 완료 ✅")
 
 
 if __name__ == "__main__":
-    insert_sentiment_dataset()
+    insert_sentiment_dataset(*sys.argv[1:2])
@@ -0,0 +1,161 @@
+# app/utils/migrations.py
+
+from sqlalchemy import inspect, text
+from app.utils.database import engine
+from app.utils.models import Base, TOPIC_COLUMNS, partition_key_for
+from app.utils.regions import normalize_region_key
+from app.utils.fts import ensure_fts
+
+"""
+migrations.py
+기존 region_data.db 에 스키마 변경분을 반영하는 경량 마이그레이션입니다.
+Base.metadata.create_all() 은 새 테이블만 만들고 기존 테이블의 컬럼/인덱스는 건드리지 않으므로,
+서버 기동 시 create_all 이후 run_migrations() 를 호출해 누락된 컬럼과 인덱스를 보완합니다.
+(모든 단계는 여러 번 실행해도 안전합니다)
+"""
+
+
+def _column_names(conn, table: str) -> set:
+    return {c["name"] for c in inspect(conn).get_columns(table)}
+
+
+# =========================================================
+# 1. sentiment_analysis_log.region_key 추가 및 백필
+# =========================================================
+def _migrate_sentiment_region_key(conn):
+    if "region_key" in _column_names(conn, "sentiment_analysis_log"):
+        return False
+
+    print("[migrations] sentiment_analysis_log.region_key 컬럼 추가 중...")
+    conn.execute(text(
+        "ALTER TABLE sentiment_analysis_log ADD COLUMN region_key VARCHAR NOT NULL DEFAULT ''"
+    ))
+
+    # 지역명 종류는 수십 개뿐이므로 DISTINCT 값마다 UPDATE 한 번씩 수행
+    regions = conn.execute(text("SELECT DISTINCT region FROM sentiment_analysis_log")).scalars().all()
+    for region in regions:
+        conn.execute(
+            text("UPDATE sentiment_analysis_log SET region_key = :key WHERE region = :region"),
+            {"key": normalize_region_key(region), "region": region},
+        )
+    print(f"[migrations] region_key 백필 완료 ({len(regions)}개 지역)")
+    return True
+
+
+# =========================================================
+# 2. region_data 주제별 gap 컬럼 / gap_dirty 추가 및 백필
+# =========================================================
+def _migrate_region_topic_gaps(conn):
+    existing = _column_names(conn, "region_data")
+    new_columns = {cols["gap"]: "FLOAT NOT NULL DEFAULT 0.0" for cols in TOPIC_COLUMNS.values()}
+    new_columns["gap_dirty"] = "BOOLEAN NOT NULL DEFAULT 1"
+
+    missing = [name for name in new_columns if name not in existing]
+    if not missing:
+        return False
+
+    for name in missing:
+        print(f"[migrations] region_data.{name} 컬럼 추가 중...")
+        conn.execute(text(f"ALTER TABLE region_data ADD COLUMN {name} {new_columns[name]}"))
+
+    # 기존 행 주제별 gap 을 UPDATE 한 번으로 채움 (순환 import 방지를 위해 지연 import)
+    from app.services.gap_calculator import build_gap_update
+    updated = len(conn.execute(build_gap_update()).all())
+    print(f"[migrations] 주제별 gap 백필 완료 ({updated}개 지역)")
+    return True
+
+
+# =========================================================
+# 3. sentiment_analysis_log.created_at / partition_key 추가 및 백필
+# =========================================================
+def _migrate_sentiment_partition(conn):
+    """
+    created_at 은 모델(nullable=False)과 달리 NULL 허용 컬럼으로 추가됨 (의도된 차이)
+    - SQLite ALTER TABLE ADD COLUMN 은 상수가 아닌 기본값(CURRENT_TIMESTAMP)으로 NOT NULL 을 걸 수 없음
+    - 기존 행은 바로 백필하고, 이후 INSERT 는 모델 default 로 항상 채워지므로 NULL 이 남지 않음
+    """
+    existing = _column_names(conn, "sentiment_analysis_log")
+    if {"created_at", "partition_key"} <= existing:
+        return False
+
+    # 기존 행은 수집 시각 정보가 없으므로 마이그레이션 시각(현재 월 파티션)으로 간주
+    if "created_at" not in existing:
+        print("[migrations] sentiment_analysis_log.created_at 컬럼 추가 중...")
+        conn.execute(text("ALTER TABLE sentiment_analysis_log ADD COLUMN created_at DATETIME"))
+        conn.execute(text("UPDATE sentiment_analysis_log SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL"))
+    if "partition_key" not in existing:
+        print("[migrations] sentiment_analysis_log.partition_key 컬럼 추가 중...")
+        conn.execute(text(
+            "ALTER TABLE sentiment_analysis_log ADD COLUMN partition_key VARCHAR(7) NOT NULL DEFAULT ''"
+        ))
+        conn.execute(text(
+            "UPDATE sentiment_analysis_log SET partition_key = COALESCE(strftime('%Y-%m', created_at), :current)"
+        ), {"current": partition_key_for()})
+    print("[migrations] 여론 로그 파티션 키 백필 완료")
+    return True
+
+
+# =========================================================
+# 4. sentiment_aggregate 초기 채우기 (집계 테이블이 새로 생긴 경우)
+# =========================================================
+def _backfill_sentiment_aggregate(conn):
+    has_aggregate = conn.execute(text("SELECT 1 FROM sentiment_aggregate LIMIT 1")).first()
+    has_logs = conn.execute(text("SELECT 1 FROM sentiment_analysis_log LIMIT 1")).first()
+    if has_aggregate or not has_logs:
+        return False
+
+    print("[migrations] sentiment_aggregate 초기 집계 생성 중...")
+    from app.services.sentiment_aggregate_service import rebuild_sentiment_aggregates
+    rebuild_sentiment_aggregates(bind=conn)
+    return True
+
+
+# =========================================================
+# 5. 모델에 선언된 인덱스 중 누락된 것 생성
+# =========================================================
+def _ensure_indexes(conn):
+    created = 0
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {idx["name"] for idx in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn)
+                created += 1
+                print(f"[migrations] 인덱스 생성: {index.name}")
+    return created
+
+
+# =========================================================
+# 6. gap_snapshot 기준 이력 생성 (이력 테이블이 새로 생긴 경우 현재 점수 1회 기록)
+# =========================================================
+def _seed_gap_snapshot(conn):
+    has_snapshot = conn.execute(text("SELECT 1 FROM gap_snapshot LIMIT 1")).first()
+    has_regions = conn.execute(text("SELECT 1 FROM region_data LIMIT 1")).first()
+    if has_snapshot or not has_regions:
+        return 0
+
+    from app.services.gap_history_service import record_gap_snapshot
+    recorded = record_gap_snapshot(conn)
+    print(f"[migrations] gap_snapshot 기준 이력 기록: {recorded}행")
+    return recorded
+
+
+def run_migrations(bind=engine):
+    """누락된 컬럼/인덱스를 한 트랜잭션으로 반영"""
+    with bind.begin() as conn:
+        _migrate_sentiment_region_key(conn)
+        _migrate_region_topic_gaps(conn)
+        _migrate_sentiment_partition(conn)
+        _backfill_sentiment_aggregate(conn)
+        _seed_gap_snapshot(conn)
+        _ensure_indexes(conn)
+        ensure_fts(conn)
+    print("[migrations] ✅ 스키마 마이그레이션 확인 완료")
+
+
+if __name__ == "__main__":
+    Base.metadata.create_all(bind=engine)
+    run_migrations()
@@ -1,11 +1,80 @@
 # app/utils/models.py
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+import os
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index, Boolean, event, inspect
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import relationship
 from app.utils.database import Base
+from app.utils.regions import normalize_region_key
+
+
+# ✅ 주제별 컬럼 레지스트리 (정책 점수 / 여론 점수 / 주제별 gap 컬럼)
+TOPIC_COLUMNS = {
+    "transport_infra": {
+        "label": "교통인프라",
+        "policy": "transport_infra_policy_score",
+        "sentiment": "sentiment_transport_infra_score",
+        "gap": "transport_infra_gap_score",
+        "sentiment_topic": "교통인프라",  # sentiment_analysis_log.topic 값
+    },
+    "labor_economy": {
+        "label": "노동경제",
+        "policy": "labor_economy_policy_score",
+        "sentiment": "sentiment_labor_economy_score",
+        "gap": "labor_economy_gap_score",
+        "sentiment_topic": "노동경제",  # sentiment_analysis_log.topic 값
+    },
+    "healthcare": {
+        "label": "의료",
+        "policy": "healthcare_policy_score",
+        "sentiment": "sentiment_healthcare_score",
+        "gap": "healthcare_gap_score",
+        "sentiment_topic": "의료보건",  # sentiment_analysis_log.topic 값
+    },
+    "policy_efficiency": {
+        "label": "정책효율성",
+        "policy": "policy_efficiency_score",
+        "sentiment": "sentiment_policy_efficiency_score",
+        "gap": "policy_efficiency_gap_score",
+        "sentiment_topic": "정책효능감",  # sentiment_analysis_log.topic 값
+    },
+    "housing_environment": {
+        "label": "주거환경",
+        "policy": "housing_environment_policy_score",
+        "sentiment": "sentiment_housing_environment_score",
+        "gap": "housing_environment_gap_score",
+        "sentiment_topic": "주거환경",  # sentiment_analysis_log.topic 값
+    },
+}
+
+# gap 재계산이 필요한 원본 점수 컬럼 (변경 시 gap_dirty 플래그)
+GAP_SOURCE_COLUMNS = ("policy_avg_score", "sentiment_avg_score") + tuple(
+    cols[kind] for cols in TOPIC_COLUMNS.values() for kind in ("policy", "sentiment")
+)
+
+
+def _region_key_default(context):
+    """INSERT 시 region 값으로부터 정규화된 region_key 자동 생성 (ORM/Core 공통)"""
+    return normalize_region_key(context.get_current_parameters().get("region"))
+
+
+def partition_key_for(dt: datetime | None = None) -> str:
+    """월 단위 논리 파티션 키 ("YYYY-MM")"""
+    return (dt or datetime.now(timezone.utc)).strftime("%Y-%m")
+
+
+def _partition_key_default(context):
+    """INSERT 시 created_at 기준 파티션 키 자동 생성 (created_at 미지정이면 현재 시각)"""
+    return partition_key_for(context.get_current_parameters().get("created_at"))
+
 
 class RegionData(Base):
     __tablename__ = "region_data"
+    __table_args__ = (
+        # 전체/주제별 gap 순위 조회 (ORDER BY gap DESC LIMIT N) 용 정렬 인덱스
+        Index("ix_region_data_gap_score", "gap_score"),
+        *(Index(f"ix_region_data_{cols['gap']}", cols["gap"]) for cols in TOPIC_COLUMNS.values()),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     region_name = Column(String, unique=True, nullable=False)  # CSV: region
@@ -29,22 +98,139 @@ class RegionData(Base):
     # 괴리 점수
     gap_score = Column(Float, nullable=False, default=0.0)
 
+    # 주제별 괴리 점수 (|정책 - 여론|, gap_calculator 에서 set 단위로 갱신)
+    transport_infra_gap_score = Column(Float, nullable=False, default=0.0)
+    labor_economy_gap_score = Column(Float, nullable=False, default=0.0)
+    healthcare_gap_score = Column(Float, nullable=False, default=0.0)
+    policy_efficiency_gap_score = Column(Float, nullable=False, default=0.0)
+    housing_environment_gap_score = Column(Float, nullable=False, default=0.0)
+
+    # 점수 변경 후 gap 재계산 대기 여부 (신규 행은 재계산 대상)
+    gap_dirty = Column(Boolean, nullable=False, default=True)
+
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
 
     # 아래는 기존과 동일하게 두세요. 예시로 RagSummary 관계가 있다면 유지.
     summaries = relationship("RagSummary", backref="region", primaryjoin="RegionData.id==RagSummary.region_id")
 
 
+# gap_snapshot.topic 코드 (0 = 전체 gap_score, 1~ = TOPIC_COLUMNS 순서)
+GAP_SNAPSHOT_TOPICS = ("overall",) + tuple(TOPIC_COLUMNS)
+
+
+class GapSnapshot(Base):
+    """gap 재계산 시점별 지역·주제 점수 이력 (append-only, (지역, 주제, 시각) 당 1행)"""
+    __tablename__ = "gap_snapshot"
+    # PK 가 곧 (지역, 주제, 시간) 범위 조회 순서 → rowid 없이 클러스터드 저장
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    region_id = Column(Integer, primary_key=True)
+    topic = Column(Integer, primary_key=True)       # GAP_SNAPSHOT_TOPICS 인덱스
+    ts = Column(Integer, primary_key=True)          # UTC epoch 초
+    policy_score = Column(Float, nullable=False)
+    sentiment_score = Column(Float, nullable=False)
+    gap_score = Column(Float, nullable=False)
+
+
+@event.listens_for(RegionData, "before_update")
+def _flag_gap_dirty(mapper, connection, target):
+    """ORM 으로 점수 컬럼이 바뀌면 gap_dirty 플래그 설정 (증분 gap 재계산 대상)"""
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in GAP_SOURCE_COLUMNS):
+        target.gap_dirty = True
+
+
 class SentimentAnalysisLog(Base):
     __tablename__ = "sentiment_analysis_log"
+    __table_args__ = (
+        Index("ix_sentiment_region_key_topic", "region_key", "topic"),
+        # 월 단위 논리 파티션: 최근 여론 조회/오래된 파티션 정리는 partition_key 범위만 스캔
+        Index("ix_sentiment_region_key_partition", "region_key", "partition_key"),
+        Index("ix_sentiment_partition_key", "partition_key"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     region = Column(String, nullable=False)      # 지역명 ("서울", "강원" 등)
+    region_key = Column(String, nullable=False, default=_region_key_default)  # 정규화된 지역 키 (조회용)
     topic = Column(String, nullable=False)       # 주제 ("주거환경", "노동경제" 등)
     text = Column(Text, nullable=False)          # 시민 의견
     label = Column(Integer, nullable=False)      # +1: 긍정, -1: 부정
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    partition_key = Column(String(7), nullable=False, default=_partition_key_default)  # "YYYY-MM"
+
+
+# 지수이동평균(rolling_score) 가중치 — 새 의견 1건이 차지하는 비중
+SENTIMENT_ROLLING_ALPHA = float(os.getenv("SENTIMENT_ROLLING_ALPHA", "0.05"))
+
+
+def label_to_score(label) -> float:
+    """라벨(-1/0/+1) → 0~100 점수 (중립 50)"""
+    return 50.0 + 50.0 * label
+
+
+class SentimentAggregate(Base):
+    """(region_key, topic) 단위 여론 집계 — SentimentAnalysisLog INSERT 시 증분 갱신"""
+    __tablename__ = "sentiment_aggregate"
+
+    region_key = Column(String, primary_key=True)
+    topic = Column(String, primary_key=True)
+    total_count = Column(Integer, nullable=False, default=0)
+    positive_count = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+    label_sum = Column(Integer, nullable=False, default=0)
+    sentiment_score = Column(Float, nullable=False, default=50.0)  # 50 + 50 * 평균 라벨 (0~100)
+    rolling_score = Column(Float, nullable=False, default=50.0)    # 입력 순서 기준 지수이동평균
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+class SentimentPartitionSummary(Base):
+    """보존 기간이 지나 원본 로그가 정리된 월 파티션의 (region_key, topic) 집계"""
+    __tablename__ = "sentiment_partition_summary"
+
+    partition_key = Column(String(7), primary_key=True)
+    region_key = Column(String, primary_key=True)
+    topic = Column(String, primary_key=True)
+    total_count = Column(Integer, nullable=False, default=0)
+    positive_count = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+    label_sum = Column(Integer, nullable=False, default=0)
+    compacted_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+@event.listens_for(SentimentAnalysisLog, "after_insert")
+def _update_sentiment_aggregate(mapper, connection, target):
+    """여론 로그 1건 INSERT → 해당 (region_key, topic) 집계를 UPSERT 한 번으로 갱신"""
+    label = int(target.label)
+    score = label_to_score(label)
+    table = SentimentAggregate.__table__
+    stmt = sqlite_insert(table).values(
+        region_key=target.region_key or normalize_region_key(target.region),
+        topic=target.topic,
+        total_count=1,
+        positive_count=int(label > 0),
+        negative_count=int(label < 0),
+        label_sum=label,
+        sentiment_score=score,
+        rolling_score=score,
+        updated_at=datetime.now(timezone.utc),
+    )
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=["region_key", "topic"],
+        set_={
+            "total_count": table.c.total_count + 1,
+            "positive_count": table.c.positive_count + int(label > 0),
+            "negative_count": table.c.negative_count + int(label < 0),
+            "label_sum": table.c.label_sum + label,
+            "sentiment_score": 50.0 + 50.0 * (table.c.label_sum + label) / (table.c.total_count + 1.0),
+            "rolling_score": table.c.rolling_score * (1 - SENTIMENT_ROLLING_ALPHA) + SENTIMENT_ROLLING_ALPHA * score,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ))
 
 class RagSummary(Base):
     __tablename__ = "rag_summary"
+    __table_args__ = (
+        Index("ix_rag_summary_region_topic", "region_id", "topic"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     region_id = Column(Integer, ForeignKey("region_data.id"), nullable=True)
     topic = Column(String, nullable=False)
@@ -59,4 +245,25 @@ class RagPolicy(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     region = Column(String, nullable=False)
-    policy = Column(String, nullable=False)
\ No newline at end of file
+    policy = Column(String, nullable=False)
+
+class SchedulerJobState(Base):
+    """주기 작업별 마지막 실행 상태 + 실행 잠금(lease, 여러 프로세스의 중복 실행 방지)"""
+    __tablename__ = "scheduler_job_state"
+
+    name = Column(String, primary_key=True)
+    locked_by = Column(String, nullable=True)          # 실행 중인 프로세스 ("host:pid")
+    locked_until = Column(DateTime, nullable=True)     # 프로세스가 죽어도 이 시각 이후 잠금 해제
+    next_run_at = Column(DateTime, nullable=True)
+    last_started_at = Column(DateTime, nullable=True)
+    last_finished_at = Column(DateTime, nullable=True)
+    last_status = Column(String, nullable=True)        # running / success / error
+    last_duration_ms = Column(Float, nullable=True)
+    last_error = Column(Text, nullable=True)
+    last_result = Column(Text, nullable=True)          # 작업 반환값 (JSON)
+    run_count = Column(Integer, nullable=False, default=0)
+    failure_count = Column(Integer, nullable=False, default=0)
+    total_duration_ms = Column(Float, nullable=False, default=0.0)
+
+# ✅ data_version 테이블 및 세션 변경 추적 이벤트 등록 (응답 캐시/ETag 기준)
+from app.utils import data_version  # noqa: E402,F401
@@ -0,0 +1,86 @@
+# app/utils/pagination.py
+
+import os
+import base64
+from fastapi import HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+"""
+pagination.py
+목록 API 공통 keyset(커서) 페이지네이션 및 fields= 컬럼 projection 유틸입니다.
+- OFFSET 대신 "id > 마지막 id" 조건 + LIMIT 으로 페이지 깊이와 무관하게 일정한 비용
+- fields 로 요청한 컬럼만 SELECT 절에 포함 (ORM 객체 로드 없음)
+- 다음 페이지 커서는 응답 헤더(X-Next-Cursor 등)로 전달해 응답 본문 형식은 기존과 동일하게 유지
+"""
+
+DEFAULT_PAGE_LIMIT = int(os.getenv("PAGE_DEFAULT_LIMIT", "100"))
+MAX_PAGE_LIMIT = int(os.getenv("PAGE_MAX_LIMIT", "1000"))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    """커서 문자열 → 마지막 id (잘못된 커서는 400)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+
+
+def select_columns(model, fields: str | None, allowed) -> list:
+    """
+    fields="a,b,c" → 모델 컬럼 리스트 (id 는 커서 계산용으로 항상 포함)
+    allowed 에 없는 필드는 400
+    """
+    allowed = list(allowed)
+    if not fields:
+        names = allowed
+    else:
+        names = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in names if f not in allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"지원하지 않는 필드입니다: {', '.join(unknown)} (가능: {', '.join(allowed)})",
+            )
+        if "id" not in names:
+            names = ["id"] + names
+    return [getattr(model, name) for name in dict.fromkeys(names)]
+
+
+async def fetch_keyset_page(
+    db: AsyncSession,
+    model,
+    columns: list,
+    *filters,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+):
+    """id 오름차순 keyset 페이지 조회 → (dict 행 리스트, 다음 커서 또는 None)"""
+    after = decode_cursor(cursor)
+    if limit <= 0:
+        return [], None
+    stmt = select(*columns).where(*filters)
+    if after is not None:
+        stmt = stmt.where(model.id > after)
+    # 다음 페이지 존재 여부 확인용으로 1건 더 조회
+    stmt = stmt.order_by(model.id).limit(limit + 1)
+
+    rows = [dict(row) for row in (await db.execute(stmt)).mappings()]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1]["id"])
+    return rows, None
+
+
+def set_cursor_header(response: Response, next_cursor: str | None, header: str = NEXT_CURSOR_HEADER):
+    if next_cursor:
+        response.headers[header] = next_cursor
@@ -0,0 +1,118 @@
+# app/utils/policy_import.py
+
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, UTC
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.utils.models import RegionData, RagSummary
+from app.utils.bulk_loader import bulk_load
+
+"""
+policy_import.py
+정책 원문(policy_corpus.txt)·정책 벡터(policy_vectors.json) → rag_summary 적재 공통 로직입니다.
+scripts/import_all_files.py, scripts/import_policy_corpus.py 가 함께 사용합니다.
+- 지역명 → id 맵, 기존 (region_id, topic) 키 집합을 각각 쿼리 1회로 미리 로드
+- 중복 제거는 메모리 set 으로 처리하고, 파일당 bulk INSERT 1회
+"""
+
+
+@contextmanager
+def timed_phase(label: str, log_prefix: str = "policy_import"):
+    """단계별 소요 시간 출력"""
+    started = time.perf_counter()
+    yield
+    print(f"[{log_prefix}] ⏱️ {label}: {time.perf_counter() - started:.3f}s")
+
+
+def load_region_ids(db: Session) -> dict:
+    """region_name → id 맵 (쿼리 1회)"""
+    return {name: region_id for region_id, name in db.execute(select(RegionData.id, RegionData.region_name))}
+
+
+def load_existing_keys(db: Session) -> set:
+    """이미 저장된 (region_id, topic) 키 집합 (쿼리 1회)"""
+    return set(db.execute(select(RagSummary.region_id, RagSummary.topic)).tuples())
+
+
+def parse_corpus_line(line: str):
+    """'서울-역세권 청년안심주택: 설명...' → (region_name, topic, summary), 형식이 아니면 None"""
+    line = line.strip()
+    if not line or "-" not in line:
+        return None
+    region_name, rest = line.split("-", 1)
+    topic, summary = rest.split(":", 1) if ":" in rest else (rest, "")
+    return region_name.strip(), topic.strip(), summary.strip()
+
+
+def build_new_rows(entries, region_ids: dict, existing_keys: set, log_prefix: str = "policy_import"):
+    """
+    entries: (region_name, topic, summary, embedding) 반복자
+    지역이 없거나 이미 존재하는 키는 스킵하고 (rows, skipped) 반환
+    existing_keys 는 파일 내 중복까지 걸러내도록 제자리에서 갱신
+    """
+    now = datetime.now(UTC)
+    rows, skipped, missing_regions = [], 0, set()
+
+    for region_name, topic, summary, embedding in entries:
+        region_id = region_ids.get(region_name)
+        if region_id is None:
+            missing_regions.add(region_name)
+            skipped += 1
+            continue
+        if (region_id, topic) in existing_keys:
+            skipped += 1
+            continue
+        existing_keys.add((region_id, topic))
+        rows.append({
+            "region_id": region_id,
+            "topic": topic,
+            "summary": summary,
+            "embedding": embedding,
+            "created_at": now,
+        })
+
+    for name in sorted(missing_regions):
+        print(f"[{log_prefix}] ⚠️ 지역 '{name}' 없음 → 건너뜀")
+    return rows, skipped
+
+
+def import_corpus_file(db: Session, path: str, region_ids: dict, existing_keys: set,
+                       log_prefix: str = "policy_import"):
+    """정책 원문 파일 적재 → (added, skipped)"""
+    with timed_phase("원문 파싱/중복 제거", log_prefix):
+        with open(path, "r", encoding="utf-8") as f:
+            parsed = [p for p in map(parse_corpus_line, f) if p]
+        rows, skipped = build_new_rows(
+            ((region, topic, summary, None) for region, topic, summary in parsed),
+            region_ids, existing_keys, log_prefix,
+        )
+
+    with timed_phase("원문 bulk INSERT", log_prefix):
+        if rows:
+            bulk_load(RagSummary, rows, mode="append", bind=db.get_bind(), log_prefix=log_prefix)
+    return len(rows), skipped
+
+
+def import_vector_items(db: Session, items: list, region_ids: dict, existing_keys: set,
+                        log_prefix: str = "policy_import"):
+    """정책 벡터 리스트 적재 → (added, skipped)"""
+    with timed_phase("벡터 중복 제거", log_prefix):
+        rows, skipped = build_new_rows(
+            (
+                (
+                    item.get("region_name", "서울").strip(),
+                    item.get("policy_name", "").strip(),
+                    item.get("description", "").strip(),
+                    json.dumps(item.get("vector", [])),
+                )
+                for item in items
+            ),
+            region_ids, existing_keys, log_prefix,
+        )
+
+    with timed_phase("벡터 bulk INSERT", log_prefix):
+        if rows:
+            bulk_load(RagSummary, rows, mode="append", bind=db.get_bind(), log_prefix=log_prefix)
+    return len(rows), skipped
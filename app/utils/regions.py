@@ -0,0 +1,48 @@
+# app/utils/regions.py
+
+"""
+regions.py
+지역명 표기를 통일하기 위한 유틸입니다.
+"서울특별시", "서울 ", "충청북도"처럼 표기가 달라도 같은 지역 키("서울", "충북")로 정규화하여
+LIKE '%지역%' 부분 일치 대신 인덱스를 타는 동등 비교로 조회할 수 있게 합니다.
+"""
+
+# ✅ 광역 지자체 정식 명칭 → 데이터셋 표준 약칭
+REGION_ALIASES = {
+    "서울특별시": "서울",
+    "서울시": "서울",
+    "부산광역시": "부산",
+    "부산시": "부산",
+    "대구광역시": "대구",
+    "대구시": "대구",
+    "인천광역시": "인천",
+    "인천시": "인천",
+    "광주광역시": "광주",
+    "광주시": "광주",
+    "대전광역시": "대전",
+    "대전시": "대전",
+    "울산광역시": "울산",
+    "울산시": "울산",
+    "세종특별자치시": "세종",
+    "세종시": "세종",
+    "경기도": "경기",
+    "강원도": "강원",
+    "강원특별자치도": "강원",
+    "충청북도": "충북",
+    "충청남도": "충남",
+    "전라북도": "전북",
+    "전북특별자치도": "전북",
+    "전라남도": "전남",
+    "경상북도": "경북",
+    "경상남도": "경남",
+    "제주도": "제주",
+    "제주특별자치도": "제주",
+}
+
+
+def normalize_region_key(region_name) -> str:
+    """지역명을 공백 제거 + 약칭으로 정규화 (None/빈 값은 빈 문자열)"""
+    if region_name is None:
+        return ""
+    key = "".join(str(region_name).split())
+    return REGION_ALIASES.get(key, key)
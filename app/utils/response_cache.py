@@ -0,0 +1,103 @@
+# app/utils/response_cache.py
+
+import os
+import zlib
+import threading
+from collections import OrderedDict, namedtuple
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from app.utils.data_version import get_data_version
+
+"""
+response_cache.py
+지도 프론트엔드가 주기적으로 폴링하는 조회 API용 응답 캐시입니다.
+- 캐시 키: 경로 + 쿼리스트링, 유효성: data_version 토큰
+- 값: 직렬화가 끝난 JSON bytes (+ 커서 등 추가 헤더) → 재요청 시 DB 조회·Pydantic 직렬화 없음
+- ETag / Last-Modified 헤더 제공, If-None-Match / If-Modified-Since 일치 시 304 응답
+"""
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+CACHE_CONTROL = os.getenv("RESPONSE_CACHE_CONTROL", "no-cache")  # 매번 재검증(304)하도록 지시
+
+CacheEntry = namedtuple("CacheEntry", ["version", "etag", "last_modified", "body", "headers"])
+
+_entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "not_modified": 0}
+
+
+def _cache_key(request: Request) -> str:
+    query = request.url.query
+    return f"{request.url.path}?{query}" if query else request.url.path
+
+
+def is_not_modified(request: Request, entry) -> bool:
+    """If-None-Match / If-Modified-Since 검사 (entry: etag·last_modified 속성을 가진 객체)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {t.strip() for t in if_none_match.split(",")}
+        return "*" in tags or entry.etag in tags or f"W/{entry.etag}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return entry.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def validator_headers(entry) -> dict:
+    return {
+        "ETag": entry.etag,
+        "Last-Modified": format_datetime(entry.last_modified, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+    }
+
+
+async def cached_json_response(request: Request, build) -> Response:
+    """
+    build: async () -> (body_bytes, extra_headers) — 캐시 미스일 때만 호출 (DB 조회 + 직렬화)
+    예외(404 등)는 그대로 전파되며 캐시하지 않음
+    """
+    info = await get_data_version()
+    key = _cache_key(request)
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry.version == info.token:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+        else:
+            entry = None
+
+    if entry is None:
+        body, extra_headers = await build()
+        etag = f'"{info.token}-{zlib.crc32(body):08x}"'
+        entry = CacheEntry(info.token, etag, info.last_modified, body, dict(extra_headers or {}))
+        with _lock:
+            _stats["misses"] += 1
+            _entries[key] = entry
+            _entries.move_to_end(key)
+            while len(_entries) > RESPONSE_CACHE_MAX_ENTRIES:
+                _entries.popitem(last=False)
+
+    if is_not_modified(request, entry):
+        with _lock:
+            _stats["not_modified"] += 1
+        return Response(status_code=304, headers=validator_headers(entry))
+
+    return Response(
+        content=entry.body,
+        media_type="application/json",
+        headers={**entry.headers, **validator_headers(entry)},
+    )
+
+
+def clear_response_cache():
+    with _lock:
+        _entries.clear()
+
+
+def get_cache_stats() -> dict:
+    with _lock:
+        return {**_stats, "entries": len(_entries), "max_entries": RESPONSE_CACHE_MAX_ENTRIES}
@@ -1,6 +1,6 @@
 # app/utils/schemas.py
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, create_model
 from typing import Optional, List
 
 class ConfiguredBaseModel(BaseModel):
@@ -37,3 +37,49 @@ class RegionResponse(ConfiguredBaseModel):
 
 class RegionDetailResponse(RegionResponse):
     summaries: Optional[List[RagSummaryResponse]] = []
+
+class SentimentLogResponse(ConfiguredBaseModel):
+    id: int
+    region: str
+    region_key: str
+    topic: str
+    text: str
+    label: int
+    created_at: datetime
+    partition_key: str
+
+
+def _partial(model: type[BaseModel], name: str) -> type[BaseModel]:
+    """fields= projection 응답용: 모든 필드를 Optional 로 바꾼 스키마 (response_model_exclude_unset 와 함께 사용)"""
+    return create_model(
+        name,
+        __base__=ConfiguredBaseModel,
+        **{field: (Optional[info.annotation], None) for field, info in model.model_fields.items()},
+    )
+
+
+RegionPartialResponse = _partial(RegionResponse, "RegionPartialResponse")
+RagSummaryPartialResponse = _partial(RagSummaryResponse, "RagSummaryPartialResponse")
+SentimentLogPartialResponse = _partial(SentimentLogResponse, "SentimentLogPartialResponse")
+
+class RegionDetailPartialResponse(RegionPartialResponse):
+    summaries: Optional[List[RagSummaryPartialResponse]] = None
+
+class RegionBatchRequest(BaseModel):
+    # 비어 있으면 전체 지역을 대상으로 처리
+    regions: List[str] = []
+
+class ScoreDelta(BaseModel):
+    region: str
+    topic: str                 # 주제 키(healthcare) 또는 라벨(의료)
+    policy: float = 0.0        # 정책 점수 변화량
+    sentiment: float = 0.0     # 여론 점수 변화량
+
+class Scenario(BaseModel):
+    name: Optional[str] = None
+    deltas: List[ScoreDelta] = []
+
+class SimulationRequest(BaseModel):
+    scenarios: List[Scenario] = Field(..., min_length=1)
+    top_k: int = Field(3, ge=1, le=10)
+    changed_only: bool = True  # false 면 변화 없는 지역도 포함
@@ -5,9 +5,12 @@ load_dotenv()
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
-from app.utils.database import engine, SessionLocal
+from app.utils.database import engine, SessionLocal, dispose_async_engines
 from app.utils import models
+from app.utils.migrations import run_migrations
 from app.utils.schemas import RegionResponse
+from app.utils.fast_json import FastJSONResponse
+from app.utils.compression import CompressionMiddleware, COMPRESS_MIN_SIZE
 from app.routers import (
     region_router,
     health_router,
@@ -18,10 +21,20 @@ from app.routers import (
     rag_pipeline_router,
     analysis_diagnosis_router,
     rag_action_router,
+    sentiment_router,
+    search_router,
+    map_router,
+    events_router,
+    scheduler_router,
 )
 from app.services.sentiment_service import save_sentiment_result
 from app.services.rag_service import save_rag_summary
 from app.services.gap_calculator import update_all_gap_scores
+from app.services.http_client import close_http_clients
+from app.services.llm_backend import close_llm_backend
+from app.services.concurrency import configure_threadpool, shutdown_executors
+from app.services.reference_data import reload_reference_snapshot
+from app.services.scheduler import SCHEDULER_ENABLED, start_scheduler, stop_scheduler
 
 # ============================================================
 # 🚀 FastAPI 애플리케이션 설정
@@ -34,6 +47,7 @@ app = FastAPI(
         "- ✅ `/api/analysis/diagnosis/{region}` : 지역 여론 기반 문제 진단\n"
         "- ✅ `/api/rag/action/{region}` : 지역별 정책 개선 방향 제안 (RAG 기반)"
     ),
+    default_response_class=FastJSONResponse,  # orjson 직렬화 (datetime·NumPy 지원)
 )
 
 # ============================================================
@@ -45,19 +59,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # 모든 HTTP 메서드 허용
     allow_headers=["*"],  # 모든 헤더 허용
+    # 페이지네이션 커서 + 조건부 GET 헤더 노출
+    expose_headers=["X-Next-Cursor", "X-Next-Summary-Cursor", "ETag", "Last-Modified"],
 )
 print("[main.py] ✅ CORS 설정이 적용되었습니다.")
 
+# ============================================================
+# 🗜️ 응답 압축 (Accept-Encoding 협상: br > gzip)
+# ============================================================
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESS_MIN_SIZE)
+
 # ============================================================
 # 🧱 데이터베이스 테이블 생성
 # ============================================================
 models.Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 print("[main.py] ✅ 데이터베이스 테이블이 생성되었습니다.")
 
 # ============================================================
 # 🔗 라우터 등록
 # ============================================================
 app.include_router(region_router.router, prefix="/api", tags=["Region"])
+app.include_router(sentiment_router.router, prefix="/api", tags=["Sentiment"])
+app.include_router(search_router.router, prefix="/api", tags=["Search"])
 app.include_router(health_router.router, prefix="/api", tags=["Health"])
 app.include_router(analysis_router.router, prefix="/api", tags=["Analysis"])
 app.include_router(analytics_router.router, prefix="/api", tags=["Analytics"])
@@ -69,6 +93,15 @@ app.include_router(rag_pipeline_router.router, prefix="/api", tags=["RAG Pipelin
 app.include_router(analysis_diagnosis_router.router, prefix="/api", tags=["Analysis - Diagnosis"])
 app.include_router(rag_action_router.router, prefix="/api", tags=["RAG - Policy Action"])
 
+# 🗺️ 지도 레이어 (GeoJSON)
+app.include_router(map_router.router, prefix="/api", tags=["Map"])
+
+# 📡 지역 변경 이벤트 (SSE / WebSocket)
+app.include_router(events_router.router, prefix="/api", tags=["Events"])
+
+# ⏰ 주기 작업 스케줄러 (상태 조회 / 수동 실행)
+app.include_router(scheduler_router.router, prefix="/api", tags=["Scheduler"])
+
 # ============================================================
 # 🔍 라우터 등록 로그 출력
 # ============================================================
@@ -77,6 +110,42 @@ for route in app.routes:
     if hasattr(route, "path"):
         print(f"  → {route.path}")
 
+# ============================================================
+# 🔌 종료 시 외부 AI 서버 / async DB 커넥션 풀 정리
+# ============================================================
+@app.on_event("startup")
+async def configure_concurrency():
+    configure_threadpool()
+
+
+@app.on_event("startup")
+async def load_reference_data():
+    # 참조 CSV·벡터 스냅샷을 미리 로드 (실패해도 서버는 기동, 첫 사용 시 다시 시도)
+    try:
+        await reload_reference_snapshot()
+    except Exception as e:
+        print(f"[main.py] ⚠️ 참조 데이터 로드 실패: {e}")
+
+
+@app.on_event("startup")
+async def start_job_scheduler():
+    # 주기 작업 스케줄러 (SCHEDULER_ENABLED=true 인 프로세스에서만, 별도 프로세스로 돌릴 때는 끄기)
+    if SCHEDULER_ENABLED:
+        start_scheduler()
+
+
+@app.on_event("shutdown")
+async def shutdown_scheduler():
+    await stop_scheduler()
+
+
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    await close_http_clients()
+    await close_llm_backend()
+    await dispose_async_engines()
+    shutdown_executors()
+
 # ============================================================
 # 🌱 기본 루트 엔드포인트
 # ============================================================
@@ -89,6 +158,8 @@ async def root():
             "/api/analysis/diagnosis/{region_name}",
             "/api/rag/action/{region_name}",
             "/api/regions/",
+            "/api/map/layer/",
+            "/api/events/regions/",
         ],
     }
 
@@ -1,27 +1,198 @@
 # mock_ai_server.py
 
+import os
+import re
+import math
+import json
+import random
+import asyncio
+import hashlib
+from typing import List, Optional
 from fastapi import FastAPI
 from pydantic import BaseModel
 
+"""
+mock_ai_server.py
+OpenAI 없이 전체 요청 경로를 부하 테스트하기 위한 테스트용 AI 서버입니다.
+- /api/generate_summary       : model_connector 요약 API
+- /api/generate_summary_batch : model_connector 배치 요약 API (items 순서대로 summaries 반환)
+- /api/chat                   : llm_backend LocalBackend 용 Chat API (task별 JSON 스키마 응답)
+
+응답 내용은 요청 본문 해시로 결정되므로 같은 요청에는 항상 같은 결과를 반환합니다.
+
+지연 시간 설정 (환경변수)
+- MOCK_LATENCY_DIST      : none | fixed | uniform | normal | lognormal | exponential (기본 none)
+- MOCK_LATENCY_MS        : 평균 지연(ms)
+- MOCK_LATENCY_JITTER_MS : 분산 폭(ms) — uniform은 ±폭, normal/lognormal은 표준편차
+- MOCK_LATENCY_SEED      : 지연 난수 시드 (재현 가능한 벤치마크용)
+"""
+
+MOCK_LATENCY_DIST = os.getenv("MOCK_LATENCY_DIST", "none").lower()
+MOCK_LATENCY_MS = float(os.getenv("MOCK_LATENCY_MS", "0"))
+MOCK_LATENCY_JITTER_MS = float(os.getenv("MOCK_LATENCY_JITTER_MS", "0"))
+MOCK_LATENCY_SEED = os.getenv("MOCK_LATENCY_SEED")
+
+_latency_rng = random.Random(int(MOCK_LATENCY_SEED)) if MOCK_LATENCY_SEED else random.Random()
+
 app = FastAPI(title="Mock AI Summary Server")
 
+
 class SummaryRequest(BaseModel):
     region_name: str
     topic: str
     text: str
 
+
+class SummaryBatchRequest(BaseModel):
+    items: List[SummaryRequest]
+
+
+class ChatMessage(BaseModel):
+    role: str
+    content: str
+
+
+class ChatRequest(BaseModel):
+    task: str = "text"
+    model: Optional[str] = None
+    messages: List[ChatMessage]
+    json_mode: bool = False
+    max_tokens: Optional[int] = None
+
+
+# =========================================================
+# 1. 지연 시간 시뮬레이션
+# =========================================================
+def sample_latency_seconds() -> float:
+    """설정된 분포에서 지연 시간(초) 샘플링"""
+    mean, jitter = MOCK_LATENCY_MS, MOCK_LATENCY_JITTER_MS
+    if MOCK_LATENCY_DIST == "fixed":
+        ms = mean
+    elif MOCK_LATENCY_DIST == "uniform":
+        ms = _latency_rng.uniform(mean - jitter, mean + jitter)
+    elif MOCK_LATENCY_DIST == "normal":
+        ms = _latency_rng.gauss(mean, jitter)
+    elif MOCK_LATENCY_DIST == "lognormal":
+        # 평균/표준편차(ms)를 로그정규 분포 파라미터로 변환 (LLM 응답 시간의 긴 꼬리 재현)
+        if mean <= 0:
+            return 0.0
+        sigma2 = math.log(1 + (jitter / mean) ** 2)
+        mu = math.log(mean) - sigma2 / 2
+        ms = _latency_rng.lognormvariate(mu, sigma2 ** 0.5)
+    elif MOCK_LATENCY_DIST == "exponential":
+        ms = _latency_rng.expovariate(1 / mean) if mean > 0 else 0.0
+    else:
+        ms = 0.0
+    return max(ms, 0.0) / 1000
+
+
+async def simulate_latency():
+    delay = sample_latency_seconds()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+# =========================================================
+# 2. 결정적(deterministic) 응답 생성
+# =========================================================
+def _seeded_rng(*parts) -> random.Random:
+    digest = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def _extract(pattern: str, text: str, default: str = "") -> str:
+    match = re.search(pattern, text)
+    return match.group(1).strip() if match else default
+
+
+def build_fake_summary(request: SummaryRequest) -> str:
+    """가짜 요약 생성"""
+    return f"{request.region_name} 지역의 {request.topic} 관련 정책은 전반적으로 긍정적이며, 복지 효율성이 높게 평가됨."
+
+
+def build_chat_content(request: ChatRequest) -> str:
+    """task별 스키마에 맞는 응답 본문 생성"""
+    prompt = "\n".join(m.content for m in request.messages)
+    rng = _seeded_rng(request.task, prompt)
+
+    region = _extract(r"\[지역(?:명)?:\s*([^\]]+)\]", prompt) or _extract(r"지역 '([^']+)'", prompt, "해당 지역")
+    topic = _extract(r"\[(?:핵심 )?주제(?:\(Main Topic\))?:\s*([^\]]+)\]", prompt) or _extract(r"'([^']+)' 주제", prompt, "생활 전반")
+    tone = rng.choice(["구조적 공급 부족", "정보 접근성 격차", "예산 집행의 비효율", "세대 간 체감 격차"])
+    emotion = rng.choice(["피로감", "실망", "분노", "조심스러운 기대"])
+
+    if request.task == "diagnosis":
+        return json.dumps({
+            "problem_summary": f"{region} 지역은 {topic} 분야에서 {tone}로 인해 주민 불만이 누적되고 있으며, "
+                               f"이는 정책 체감도 저하와 인구 유출로 이어지고 있다.",
+            "scarcity_insight": f"여론 전반에 {emotion}이 두드러지며, 정책 개선 요구가 구체적인 생활 문제 중심으로 제기되고 있다.",
+        }, ensure_ascii=False)
+
+    if request.task == "action":
+        regions = re.findall(r"-\s*(\S+) 지역 \(유사도", prompt)[:3]
+        policies = re.findall(r"\[참고 정책 \d+\]\s*(.+)", prompt)[:3]
+        return json.dumps({
+            "rag_action_card": f"{region}은(는) {topic} 분야에서 {', '.join(regions) or '타 지역'} 사례를 참고해 "
+                               f"{tone} 해소를 위한 단계적 지원 사업을 추진해야 한다.",
+            "reference_regions": regions,
+            "reference_policies": [p.strip() for p in policies],
+        }, ensure_ascii=False)
+
+    if request.task == "proposal":
+        return json.dumps({
+            "problem_summary": f"{region} 지역 {topic} 분야의 {tone} 문제",
+            "policy_suggestion": f"{topic} 관련 맞춤형 지원 확대 및 성과 모니터링 체계 구축",
+        }, ensure_ascii=False)
+
+    if request.task == "summary":
+        return (
+            f"1. Summary: {region} 지역의 {topic} 정책은 {tone} 해소가 핵심 과제로 평가됨.\n"
+            f"2. Proposals: 대상자 맞춤 지원 확대, 예산 집행 모니터링 강화, 주민 참여형 평가 도입"
+        )
+
+    return f"{region} 지역의 {topic} 관련 여론은 {tone}에 대한 {emotion}이 중심이며, 단계적 정책 보완이 필요하다."
+
+
+# =========================================================
+# 3. API
+# =========================================================
 @app.post("/api/generate_summary")
-def generate_summary(request: SummaryRequest):
+async def generate_summary(request: SummaryRequest):
     """
     AI 모델 없이 테스트용으로 동작하는 요약 응답 API
     """
     # 요청 로그 출력
     print(f"[Mock AI] 요청 수신 → 지역: {request.region_name}, 주제: {request.topic}")
+    await simulate_latency()
+
+    return {"summary": build_fake_summary(request)}
+
 
-    # 가짜 요약 생성
-    fake_summary = f"{request.region_name} 지역의 {request.topic} 관련 정책은 전반적으로 긍정적이며, 복지 효율성이 높게 평가됨."
+@app.post("/api/generate_summary_batch")
+async def generate_summary_batch(request: SummaryBatchRequest):
+    """
+    배치 요약 API
+    - 요청 items 와 같은 순서로 summaries 를 반환 (지연은 배치당 1회)
+    """
+    print(f"[Mock AI] 배치 요청 수신 → {len(request.items)}건")
+    await simulate_latency()
 
-    return {"summary": fake_summary}
+    return {
+        "summaries": [
+            {"region_name": item.region_name, "topic": item.topic, "summary": build_fake_summary(item)}
+            for item in request.items
+        ]
+    }
+
+
+@app.post("/api/chat")
+async def chat(request: ChatRequest):
+    """
+    llm_backend.LocalBackend 용 Chat API
+    - task에 따라 diagnosis / action / proposal / summary / text 형식으로 응답
+    """
+    await simulate_latency()
+    content = build_chat_content(request)
+    return {"model": request.model or "mock-llm", "task": request.task, "content": content}
 
 
 if __name__ == "__main__":
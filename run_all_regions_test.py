@@ -11,16 +11,14 @@ import os
 import json
 from dotenv import load_dotenv
 from app.services.vector_service import find_top_gap_topics, load_region_vectors
-from openai import OpenAI
 from datetime import datetime
 from urllib.parse import unquote
 from difflib import get_close_matches
 
-# ✅ .env 파일 로드
+# ✅ .env 파일 로드 (LLM_BACKEND=local 이면 mock_ai_server.py 로 오프라인 실행)
 load_dotenv()
 
-# ✅ OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from app.services.llm_backend import get_llm_backend, TASK_PROPOSAL
 
 # ✅ 테스트할 지역 리스트
 regions = [
@@ -94,17 +92,17 @@ def run_for_region(region_name: str):
         }}
         """
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        content = get_llm_backend().complete(
             messages=[
                 {"role": "system", "content": "너는 정책 분석 및 행정 전문가이다."},
                 {"role": "user", "content": prompt},
             ],
+            task=TASK_PROPOSAL,
             temperature=0.6,
-            response_format={"type": "json_object"},
+            json_mode=True,
         )
 
-        result = json.loads(response.choices[0].message.content)
+        result = json.loads(content)
         print(f"[RAG] ✅ 정책 제안 생성 완료")
         print(json.dumps(result, ensure_ascii=False, indent=2))
 
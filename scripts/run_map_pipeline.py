@@ -8,8 +8,8 @@ run_map_pipeline.py
 from app.utils.database import SessionLocal, engine
 from app.utils import models
 from app.services.gap_calculator import update_all_gap_scores
+from app.utils.fast_json import write_json_output
 from datetime import datetime
-import json
 import os
 
 # 실행 로그용
@@ -34,8 +34,8 @@ if existing_regions == 0:
     for s in sample_data:
         region = models.RegionData(
             region_name=s["region_name"],
-            policy_score=s["policy_score"],
-            sentiment_score=s["sentiment_score"],
+            policy_avg_score=s["policy_score"],
+            sentiment_avg_score=s["sentiment_score"],
             gap_score=abs(s["policy_score"] - s["sentiment_score"]),
             updated_at=datetime.utcnow(),
         )
@@ -55,25 +55,22 @@ summary = []
 for r in regions:
     summary.append({
         "region_name": r.region_name,
-        "policy_score": r.policy_score,
-        "sentiment_score": r.sentiment_score,
+        "policy_score": r.policy_avg_score,
+        "sentiment_score": r.sentiment_avg_score,
         "gap_score": r.gap_score,
-        "infra_sentiment": getattr(r, "infra_sentiment", None),
-        "housing_sentiment": getattr(r, "housing_sentiment", None),
-        "health_sentiment": getattr(r, "health_sentiment", None),
-        "economy_sentiment": getattr(r, "economy_sentiment", None),
-        "policy_efficiency": getattr(r, "policy_efficiency", None),
+        "infra_sentiment": r.sentiment_transport_infra_score,
+        "housing_sentiment": r.sentiment_housing_environment_score,
+        "health_sentiment": r.sentiment_healthcare_score,
+        "economy_sentiment": r.sentiment_labor_economy_score,
+        "policy_efficiency": r.sentiment_policy_efficiency_score,
         "updated_at": r.updated_at.isoformat() if r.updated_at else None
     })
 
 db.close()
 
 # 5️⃣ 결과 JSON 파일로 저장
-os.makedirs("output", exist_ok=True)
 output_path = os.path.join("output", "map_pipeline_result.json")
-
-with open(output_path, "w", encoding="utf-8") as f:
-    json.dump(summary, f, ensure_ascii=False, indent=4)
+write_json_output(output_path, summary)
 
 print(f"[4/4] 결과 파일 저장 완료 → {output_path}")
 print("✅ 지도 파이프라인 실행 완료.")
@@ -1,14 +1,22 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from datetime import datetime
-from openai import OpenAI
 import json, os, numpy as np
 import pathlib
 from app.utils.database import get_db
 from app.utils.models import RegionData, RagSummary
+from app.services.llm_backend import get_llm_backend, DEFAULT_MODEL
+from app.utils.fast_json import (
+    write_json_output,
+    json_envelope,
+    raw_json_response,
+    checkpoint_run_id,
+    file_digest,
+    load_jsonl_checkpoint,
+    append_jsonl,
+)
 
 router = APIRouter(prefix="/api/rag", tags=["RAG Pipeline"])
-client = OpenAI()
 
 
 # 🔹 코사인 유사도 계산
@@ -24,7 +32,7 @@ def load_json(path):
 
 
 @router.post("/run-pipeline/")
-def run_rag_pipeline(db: Session = Depends(get_db)):
+def run_rag_pipeline(resume: bool = True, db: Session = Depends(get_db)):
     """
     RAG 파이프라인 전체 자동 실행
     1️⃣ 괴리 큰 지역 탐색
@@ -32,6 +40,9 @@ def run_rag_pipeline(db: Session = Depends(get_db)):
     3️⃣ 정책 벡터 → 유사 정책 검색
     4️⃣ LLM 종합 요약 생성
     5️⃣ JSON 파일 저장 및 응답
+    - (지역, 주제) 결과는 완료 즉시 output/rag_pipeline_result.jsonl 에 추가, 재실행 시 완료 항목 재사용 (resume=false 면 처음부터)
+    - 같은 입력(벡터 파일 내용, LLM 모델)의 체크포인트만 재사용, 다른 실행의 결과는 .archive.jsonl 로 옮겨 보관 (archived)
+    - 최종 rag_pipeline_result.json 은 전체 성공 시에만 생성
     """
     try:
         print("[RAG Pipeline] 시작")
@@ -55,82 +66,110 @@ def run_rag_pipeline(db: Session = Depends(get_db)):
         sentiment_vectors = load_json(sentiment_path) if os.path.exists(sentiment_path) else {}
         policy_vectors = load_json(policy_path) if os.path.exists(policy_path) else []
 
+        llm = get_llm_backend()
         results = []
 
-        for region in regions:
-            print(f"[RAG Pipeline] ▶ {region.region_name} 지역 분석 시작")
-
-            # 주제별 순회
-            for topic in ["주거/환경", "인프라/교통", "의료/보건", "정책효능감", "노동/경제"]:
-                region_vec = sentiment_vectors.get(region.region_name, {}).get(topic)
-                if region_vec is None:
-                    continue
-
-                # 시민 불만 요약 요청
-                prompt_opinion = (
-                    f"지역 '{region.region_name}'의 '{topic}' 주제 관련 시민 여론을 분석하여, "
-                    f"주요 불만 사항을 2~3문장으로 요약하세요."
-                )
-                citizen_summary = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "당신은 사회정책 분석 전문가입니다."},
-                        {"role": "user", "content": prompt_opinion},
-                    ],
-                    max_tokens=250,
-                ).choices[0].message.content.strip()
-
-                # 정책 벡터 유사도 계산
-                scored = []
-                for p in policy_vectors:
-                    try:
-                        sim = cosine_similarity(region_vec, p["vector"])
-                        scored.append((p["policy_name"], sim, p["description"]))
-                    except Exception:
+        # 완료 항목은 체크포인트 JSONL 에 바로 추가 → 중간 실패 시에도 보존, 재실행 시 이어서 처리
+        output_path = os.path.join("output", "rag_pipeline_result.json")
+        checkpoint_path = pathlib.Path(output_path).with_suffix(".jsonl")
+        if not resume and checkpoint_path.exists():
+            checkpoint_path.unlink()
+        # 실행 식별자: 프롬프트 재료(벡터 파일 내용)와 LLM 모델이 같을 때만 이전 결과 재사용
+        # (지역·주제는 항목 키, gap 값·실행 날짜는 프롬프트에 영향이 없으므로 제외)
+        run_id = checkpoint_run_id(
+            [file_digest(p) for p in (sentiment_path, policy_path)],
+            llm.name,
+            DEFAULT_MODEL,
+        )
+        completed, archived = load_jsonl_checkpoint(
+            checkpoint_path, key=lambda item: (item["region"], item["topic"]), run_id=run_id
+        )
+        if completed:
+            print(f"[RAG Pipeline] ▶ 체크포인트 {len(completed)}건 발견 → 완료된 항목은 건너뜀")
+        reused = 0
+
+        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(checkpoint_path, "ab") as checkpoint:
+            for region in regions:
+                print(f"[RAG Pipeline] ▶ {region.region_name} 지역 분석 시작")
+
+                # 주제별 순회
+                for topic in ["주거/환경", "인프라/교통", "의료/보건", "정책효능감", "노동/경제"]:
+                    region_vec = sentiment_vectors.get(region.region_name, {}).get(topic)
+                    if region_vec is None:
                         continue
 
-                # 상위 3개 정책 선택
-                top_policies = sorted(scored, key=lambda x: x[1], reverse=True)[:3]
-
-                # 최종 정책 제안 생성
-                prompt_final = (
-                    f"'{region.region_name}'의 '{topic}' 관련 시민 불만:\n{citizen_summary}\n\n"
-                    f"유사 정책 사례:\n"
-                    + "\n".join([f"• {p[0]}: {p[2]}" for p in top_policies])
-                    + "\n\n이를 기반으로 정책 개선 방향을 제안하세요."
-                )
-                final_summary = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "사회정책 전문가로서 종합 제안을 작성하세요."},
-                        {"role": "user", "content": prompt_final},
-                    ],
-                    max_tokens=400,
-                ).choices[0].message.content.strip()
-
-                result_item = {
-                    "region": region.region_name,
-                    "topic": topic,
-                    "citizen_summary": citizen_summary,
-                    "policy_examples": [p[0] for p in top_policies],
-                    "final_summary": final_summary,
-                }
-                results.append(result_item)
-
-        # 결과 파일 저장
-        os.makedirs("output", exist_ok=True)
-        output_path = os.path.join("output", "rag_pipeline_result.json")
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=4)
+                    # 이전 실행에서 이미 완료된 (지역, 주제) 는 LLM 재호출 없이 체크포인트 결과 사용
+                    done = completed.get((region.region_name, topic))
+                    if done is not None:
+                        results.append(done)
+                        reused += 1
+                        continue
+
+                    # 시민 불만 요약 요청
+                    prompt_opinion = (
+                        f"지역 '{region.region_name}'의 '{topic}' 주제 관련 시민 여론을 분석하여, "
+                        f"주요 불만 사항을 2~3문장으로 요약하세요."
+                    )
+                    citizen_summary = llm.complete(
+                        messages=[
+                            {"role": "system", "content": "당신은 사회정책 분석 전문가입니다."},
+                            {"role": "user", "content": prompt_opinion},
+                        ],
+                        max_tokens=250,
+                    )
+
+                    # 정책 벡터 유사도 계산
+                    scored = []
+                    for p in policy_vectors:
+                        try:
+                            sim = cosine_similarity(region_vec, p["vector"])
+                            scored.append((p["policy_name"], sim, p["description"]))
+                        except Exception:
+                            continue
+
+                    # 상위 3개 정책 선택
+                    top_policies = sorted(scored, key=lambda x: x[1], reverse=True)[:3]
+
+                    # 최종 정책 제안 생성
+                    prompt_final = (
+                        f"'{region.region_name}'의 '{topic}' 관련 시민 불만:\n{citizen_summary}\n\n"
+                        f"유사 정책 사례:\n"
+                        + "\n".join([f"• {p[0]}: {p[2]}" for p in top_policies])
+                        + "\n\n이를 기반으로 정책 개선 방향을 제안하세요."
+                    )
+                    final_summary = llm.complete(
+                        messages=[
+                            {"role": "system", "content": "사회정책 전문가로서 종합 제안을 작성하세요."},
+                            {"role": "user", "content": prompt_final},
+                        ],
+                        max_tokens=400,
+                    )
+
+                    result_item = {
+                        "region": region.region_name,
+                        "topic": topic,
+                        "citizen_summary": citizen_summary,
+                        "policy_examples": [p[0] for p in top_policies],
+                        "final_summary": final_summary,
+                    }
+                    append_jsonl(checkpoint, {**result_item, "run_id": run_id})
+                    results.append(result_item)
+
+        # 전체 성공 시에만 최종 JSON 생성 후 체크포인트 정리
+        data_body = write_json_output(output_path, results)
+        checkpoint_path.unlink(missing_ok=True)
 
         print(f"[RAG Pipeline] 완료 → {output_path}")
-        return {
-            "status": "success",
-            "count": len(results),
-            "data": results,
-            "saved_to": output_path,
-            "updated_at": datetime.utcnow(),
-        }
+        return raw_json_response(json_envelope(
+            data_body,
+            status="success",
+            count=len(results),
+            reused=reused,
+            archived=archived,
+            saved_to=output_path,
+            updated_at=datetime.utcnow(),
+        ))
 
     except Exception as e:
         print(f"[RAG Pipeline] 오류 발생: {e}")